@@ -0,0 +1,117 @@
+import time
+import numpy as np
+
+from typing import Any, Dict, List, Optional
+
+from hcs.frame_source import FrameSource, RecordedLandmarksSource
+from hcs.hands_control_system import HandsControlSystem
+from hcs.models import Hand
+from hcs.mouse_controller import MouseController
+from hcs.mouse_controller.recording_mouse_controller import NullMouseController
+
+STAGES: List[str] = ["read", "detection", "classification", "control"]
+
+
+def summarize_timings(timings: List[float]) -> Dict[str, float]:
+    """
+    Summarize stage timings.
+
+    Args:
+        timings (List[float]): Stage timings in seconds.
+
+    Returns:
+        Dict[str, float]: Mean, p50, p95 and max of the timings in milliseconds.
+    """
+
+    if not timings:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+    values = np.asarray(timings) * 1000
+
+    return {
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "max_ms": float(values.max()),
+    }
+
+
+def run_benchmark(source: FrameSource, max_frames: Optional[int] = None,
+                  mouse_control: Optional[MouseController] = None,
+                  record_landmarks: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the sequential processing loop of HandsControlSystem on a frame source without a camera, a desktop or a
+    preview window, timing every stage of every frame. Landmark detection is skipped for RecordedLandmarksSource,
+    so classification and control can be measured on their own.
+
+    Args:
+        source (FrameSource): Source of frames.
+        max_frames (Optional[int]): Defaults to None. Maximum number of processed frames, all frames when None.
+        mouse_control (Optional[MouseController]): Defaults to None. Mouse backend, NullMouseController when None.
+        record_landmarks (Optional[str]): Defaults to None. Path to save the detected hands as a recording
+            replayable with RecordedLandmarksSource.
+
+    Returns:
+        Dict[str, Any]: Report with the number of frames and hands, elapsed time, throughput and per-stage timings.
+    """
+
+    mouse_control = mouse_control if mouse_control is not None else NullMouseController(asynchronous=False)
+    hcs = HandsControlSystem(headless=True, cap=source, mouse_control=mouse_control)
+
+    replay = isinstance(source, RecordedLandmarksSource)
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    recorded_hands: List[List[Hand]] = []
+    frames = 0
+    hands_number = 0
+
+    start_time = time.perf_counter()
+
+    while max_frames is None or frames < max_frames:
+        read_start = time.perf_counter()
+
+        if replay:
+            item = source.read_hands()
+            if item is None:
+                break
+            _, all_hands = item
+            detection_start = detection_end = time.perf_counter()
+        else:
+            frame = source.read_frame()
+            if frame is None:
+                break
+            detection_start = time.perf_counter()
+            all_hands = hcs.detector.find_hands(frame.image, draw=False)
+            detection_end = time.perf_counter()
+
+        classification_start = time.perf_counter()
+        gesture_results = hcs.classify_hands(all_hands)
+        control_start = time.perf_counter()
+        hcs.control(all_hands, gesture_results)
+        control_end = time.perf_counter()
+
+        timings["read"].append(detection_start - read_start)
+        timings["detection"].append(detection_end - detection_start)
+        timings["classification"].append(control_start - classification_start)
+        timings["control"].append(control_end - control_start)
+
+        if record_landmarks is not None:
+            recorded_hands.append(all_hands)
+
+        frames += 1
+        hands_number += len(all_hands)
+
+    elapsed = time.perf_counter() - start_time
+
+    source.release()
+    mouse_control.close()
+
+    if record_landmarks is not None:
+        RecordedLandmarksSource.save(record_landmarks, recorded_hands, source.cam_width, source.cam_height)
+
+    return {
+        "frames": frames,
+        "hands": hands_number,
+        "elapsed_s": elapsed,
+        "throughput_fps": frames / elapsed if elapsed > 0 else 0.0,
+        "stages": {stage: summarize_timings(stage_timings) for stage, stage_timings in timings.items()},
+    }
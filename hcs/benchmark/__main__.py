@@ -0,0 +1,42 @@
+import argparse
+import json
+
+from hcs.benchmark import run_benchmark
+from hcs.frame_source import VideoFileSource, ImageDirectorySource, RecordedLandmarksSource
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - benchmark on recorded input")
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument("--video", help="path to a video file")
+    source_group.add_argument("--images", help="directory with image files")
+    source_group.add_argument("--landmarks", help="landmark recording, landmark detection is skipped")
+    parser.add_argument("--max-frames", type=int, default=None, help="maximum number of processed frames")
+    parser.add_argument("--loop", action="store_true", help="start over at the end of the input")
+    parser.add_argument("--record-landmarks", default=None,
+                        help="save detected hands as a landmark recording (.npz)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    if args.video:
+        source = VideoFileSource(args.video, loop=args.loop)
+    elif args.images:
+        source = ImageDirectorySource(args.images, loop=args.loop)
+    else:
+        source = RecordedLandmarksSource(args.landmarks, loop=args.loop)
+
+    report = run_benchmark(source, max_frames=args.max_frames, record_landmarks=args.record_landmarks)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"frames: {report['frames']}, hands: {report['hands']}, elapsed: {report['elapsed_s']:.2f} s, "
+          f"throughput: {report['throughput_fps']:.1f} FPS")
+    for stage, summary in report["stages"].items():
+        print(f"{stage:>15}: mean {summary['mean_ms']:.2f} ms, p50 {summary['p50_ms']:.2f} ms, "
+              f"p95 {summary['p95_ms']:.2f} ms, max {summary['max_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import tempfile
+import argparse
+import numpy as np
+import multiprocessing as mp
+
+from typing import Any, Dict, List
+
+from hcs.benchmark import summarize_timings
+from hcs.event_publisher import Address, EventPublisher, RECORD_DTYPE, parse_address
+from hcs.models import Hand, HandType, GestureClassificationResult, GestureType
+from hcs.models.hand import BorderBox
+
+
+def synthetic_hands(count: int) -> List[Hand]:
+    """
+    Args:
+        count (int): Number of hands.
+
+    Returns:
+        List[Hand]: Hands with random landmarks.
+    """
+
+    hands = []
+
+    for index in range(count):
+        hand = Hand()
+        hand.landmarks = np.random.uniform(0, 640, (21, 3)).astype(np.float32)
+        hand.border_box = BorderBox(100, 100, 200, 200)
+        hand.center = (200, 200)
+        hand.score = 0.95
+        hand.type = HandType(index % 2)
+        hands.append(hand)
+
+    return hands
+
+
+def _subscribe(address: Address, duration: float, ready: Any, results: Any) -> None:
+    """
+    Subscriber process counting the received records and their latency.
+
+    Args:
+        address (Address): Publisher address.
+        duration (float): Time in seconds to receive after the first datagram.
+        ready (Any): Event set once subscribed.
+        results (Any): Queue for the report.
+    """
+
+    from hcs.event_publisher.subscriber import EventSubscriber
+
+    subscriber = EventSubscriber(address, heartbeat_interval=0.2)
+    ready.set()
+
+    latencies: List[float] = []
+    end_time = None
+
+    while end_time is None or time.perf_counter() < end_time:
+        records = subscriber.receive(timeout=1.0)
+
+        if records is None:
+            if end_time is not None:
+                break
+            continue
+
+        if end_time is None:
+            end_time = time.perf_counter() + duration + 0.5
+
+        # Samples the latency of one record per datagram
+        latencies.append(time.time() - float(records[-1]["timestamp"]))
+
+    results.put({"received_records": subscriber.received_records, "received_batches": subscriber.received_batches,
+                 "lost_batches": subscriber.lost_batches, "latency": summarize_timings(latencies)})
+    subscriber.close()
+
+
+def measure_throughput(address: Address, duration: float = 5.0, hands_per_frame: int = 2, rate: float = 0.0,
+                       subscribers: int = 1, max_batch_records: int = 64,
+                       max_batch_delay: float = 0.001) -> Dict[str, Any]:
+    """
+    Publish synthetic frames for a duration to subscriber processes and measure the cost of publish, the
+    throughput and the delivery latency.
+
+    Args:
+        address (Address): Publisher address.
+        duration (float): Defaults to 5.0. Publishing time in seconds.
+        hands_per_frame (int): Defaults to 2. Number of hands of every frame.
+        rate (float): Defaults to 0.0. Published frames per second, as fast as possible when 0.
+        subscribers (int): Defaults to 1. Number of subscriber processes.
+        max_batch_records (int): Defaults to 64. Maximum number of records of a datagram.
+        max_batch_delay (float): Defaults to 0.001. Maximum time in seconds a record waits for more records.
+
+    Returns:
+        Dict[str, Any]: Report of the publisher and of every subscriber.
+    """
+
+    context = mp.get_context("spawn")
+    results = context.Queue()
+    ready_events = [context.Event() for _ in range(subscribers)]
+
+    publisher = EventPublisher(address, max_batch_records=max_batch_records, max_batch_delay=max_batch_delay)
+    publisher.start()
+
+    processes = [context.Process(target=_subscribe, args=(address, duration, ready, results), daemon=True)
+                 for ready in ready_events]
+    for process in processes:
+        process.start()
+    for ready in ready_events:
+        ready.wait(30.0)
+
+    # Subscriptions are handled by the sender thread
+    while publisher.subscribers < subscribers:
+        time.sleep(0.01)
+
+    hands = synthetic_hands(hands_per_frame)
+    gesture_results = []
+    for index in range(hands_per_frame):
+        result = GestureClassificationResult()
+        result.gesture_type, result.score = GestureType(index % len(GestureType)), 0.9
+        gesture_results.append(result)
+
+    publish_times: List[float] = []
+    frame_id = 0
+    start_time = time.perf_counter()
+
+    while time.perf_counter() - start_time < duration:
+        call_start = time.perf_counter()
+        publisher.publish(frame_id, call_start, hands, gesture_results)
+        publish_times.append(time.perf_counter() - call_start)
+        frame_id += 1
+
+        if rate > 0:
+            delay = start_time + frame_id / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    elapsed = time.perf_counter() - start_time
+    publisher.stop()
+
+    reports = [results.get(timeout=30.0) for _ in processes]
+    for process in processes:
+        process.join()
+
+    return {
+        "frames": frame_id,
+        "frames_per_s": frame_id / elapsed,
+        "published_records": publisher.published_records,
+        "record_bytes": RECORD_DTYPE.itemsize,
+        "publish": summarize_timings(publish_times),
+        "sent_batches": publisher.sent_batches,
+        "dropped_records": publisher.dropped_records,
+        "dropped_batches": publisher.dropped_batches,
+        "subscribers": [{**report, "records_per_s": report["received_records"] / elapsed,
+                         "mb_per_s": report["received_records"] * RECORD_DTYPE.itemsize / elapsed / 1e6}
+                        for report in reports],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - event publisher throughput benchmark")
+    parser.add_argument("--address", default=os.path.join(tempfile.gettempdir(), "hcs-benchmark-events.sock"),
+                        help="publisher address, UDP host:port or Unix domain socket path")
+    parser.add_argument("--duration", type=float, default=5.0, help="publishing time in seconds")
+    parser.add_argument("--hands", type=int, default=2, help="hands per frame")
+    parser.add_argument("--rate", type=float, default=0.0, help="frames per second, as fast as possible when 0")
+    parser.add_argument("--subscribers", type=int, default=1, help="number of subscriber processes")
+    parser.add_argument("--max-batch-records", type=int, default=64, help="maximum number of records per datagram")
+    parser.add_argument("--max-batch-delay-ms", type=float, default=1.0,
+                        help="maximum time a record waits for more records")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = measure_throughput(parse_address(args.address), args.duration, args.hands, args.rate, args.subscribers,
+                                args.max_batch_records, args.max_batch_delay_ms / 1000)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    publish = report["publish"]
+    print(f"published {report['frames']} frames ({report['frames_per_s']:.0f}/s), "
+          f"{report['published_records']} records of {report['record_bytes']} bytes")
+    print(f"publish call: mean {publish['mean_ms'] * 1000:.1f} us, p50 {publish['p50_ms'] * 1000:.1f} us, "
+          f"p95 {publish['p95_ms'] * 1000:.1f} us, max {publish['max_ms'] * 1000:.0f} us")
+    print(f"sender: {report['sent_batches']} datagrams, {report['dropped_batches']} dropped at full sockets, "
+          f"{report['dropped_records']} records dropped at the full queue")
+
+    for index, subscriber in enumerate(report["subscribers"]):
+        latency = subscriber["latency"]
+        print(f"subscriber {index}: {subscriber['records_per_s']:.0f} records/s ({subscriber['mb_per_s']:.1f} MB/s), "
+              f"{subscriber['lost_batches']} datagrams lost, latency p50 {latency['p50_ms']:.2f} ms, "
+              f"p95 {latency['p95_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
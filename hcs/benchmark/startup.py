@@ -0,0 +1,103 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+from typing import Any, Dict, List, Optional
+
+# Runs in a fresh interpreter, so imports are measured cold
+_CHILD_SCRIPT = """
+import sys, json, time, threading
+launch_time, options = float(sys.argv[1]), json.loads(sys.argv[2])
+start_time = time.time()
+
+from hcs import HandsControlSystem
+import_time = time.time()
+heavy_modules = [name for name in ("pandas", "matplotlib", "sklearn", "mediapipe") if name in sys.modules]
+
+from hcs.mouse_controller.recording_mouse_controller import NullMouseController
+if options["video"]:
+    from hcs.frame_source import VideoFileSource
+    cap = VideoFileSource(options["video"], loop=True)
+elif options["images"]:
+    from hcs.frame_source import ImageDirectorySource
+    cap = ImageDirectorySource(options["images"], loop=True)
+else:
+    cap = None
+
+hcs = HandsControlSystem(headless=True, cap=cap, mouse_control=NullMouseController(),
+                         parallel_init=options["parallel_init"], warm_up=options["warm_up"])
+init_time, init_counter = time.time(), time.perf_counter()
+
+thread = threading.Thread(target=hcs.run, daemon=True)
+thread.start()
+while hcs.first_frame_time is None and thread.is_alive():
+    time.sleep(0.0005)
+first_frame_time = init_time + (hcs.first_frame_time or time.perf_counter()) - init_counter
+hcs.stop()
+thread.join()
+
+print(json.dumps({
+    "interpreter_s": start_time - launch_time,
+    "import_s": import_time - start_time,
+    "init_s": init_time - import_time,
+    "first_frame_s": first_frame_time - init_time,
+    "time_to_first_frame_s": first_frame_time - launch_time,
+    "heavy_modules_after_import": heavy_modules,
+}))
+"""
+
+TIMINGS: List[str] = ["interpreter_s", "import_s", "init_s", "first_frame_s", "time_to_first_frame_s"]
+
+
+def measure_startup(video: Optional[str] = None, images: Optional[str] = None, parallel_init: bool = True,
+                    warm_up: bool = True) -> Dict[str, Any]:
+    """
+    Start the system in a new interpreter and measure the time to the first processed frame, split into
+    interpreter start, imports, component initialization and the first frame.
+
+    Args:
+        video (Optional[str]): Defaults to None. Path to a video file used instead of the camera.
+        images (Optional[str]): Defaults to None. Directory with images used instead of the camera.
+        parallel_init (bool): Defaults to True. Flag to initialize the components concurrently.
+        warm_up (bool): Defaults to True. Flag to warm up the detection and classification.
+
+    Returns:
+        Dict[str, Any]: Timings in seconds and heavy modules loaded by importing the package.
+    """
+
+    options = {"video": video, "images": images, "parallel_init": parallel_init, "warm_up": warm_up}
+    output = subprocess.run([sys.executable, "-c", _CHILD_SCRIPT, repr(time.time()), json.dumps(options)],
+                            check=True, stdout=subprocess.PIPE, text=True).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - startup benchmark")
+    parser.add_argument("--video", default=None, help="path to a video file used instead of the camera")
+    parser.add_argument("--images", default=None, help="directory with images used instead of the camera")
+    parser.add_argument("--runs", type=int, default=3, help="number of measured starts")
+    parser.add_argument("--sequential-init", action="store_true", help="initialize the components one by one")
+    parser.add_argument("--no-warm-up", action="store_true", help="skip the warm-up inference")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    runs = [measure_startup(args.video, args.images, not args.sequential_init, not args.no_warm_up)
+            for _ in range(args.runs)]
+    report = {timing: float(np.median([run[timing] for run in runs])) for timing in TIMINGS}
+    report["heavy_modules_after_import"] = runs[-1]["heavy_modules_after_import"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for timing in TIMINGS:
+        print(f"{timing:>22}: {report[timing] * 1000:.0f} ms (median of {args.runs})")
+    print(f"{'heavy modules imported':>22}: {', '.join(report['heavy_modules_after_import']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,14 @@
+import time
+import threading
 import cv2
-from typing import Any, Tuple
+
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple, Union
+
+from hcs.models import Frame
+from hcs.camera_video_capture.capture_profile import AUTOTUNE, CaptureProfile, apply_capture_profile, \
+    create_capture_profile
+from hcs.camera_video_capture.shared_frame_ring import SharedFrameRing
 
 
 class CameraVideoCapture:
@@ -7,13 +16,36 @@ class CameraVideoCapture:
     Creating an instance of the VideoCapture class from the cv2 library.
     Configures and stores information about the webcam.
 
+    In threaded mode a background thread grabs frames as fast as the camera delivers them into a small ring buffer,
+    and the consumer always gets the newest frame. Frames the consumer never received are counted as dropped.
+
+    With shared memory slots set frames are decoded straight into a SharedFrameRing and the frame id is the ring
+    sequence number, so detector processes can read the frames zero-copy (see DetectionProcessPool). Returned images
+    are views of the ring, valid until their slot is reused.
+
+    The camera mode is requested with a CaptureProfile, e.g. MJPG instead of the raw YUYV many webcams default to,
+    or chosen by probing the device once (see autotune_capture). The camera size is the negotiated size.
+
     Attributes:
         cap (cv2.cv2.VideoCapture.VideoCapture): VideoCapture instance.
+        profile (CaptureProfile): Negotiated capture profile.
         cam_width (int): Camera width.
         cam_height (int): Camera height.
+        threaded (bool): Flag to grab frames on a background thread.
+        dropped_frames (int): Number of grabbed frames that were never returned to the consumer.
+        shared_ring (Optional[SharedFrameRing]): Shared memory ring the frames are captured into.
+        _buffer (Deque[Frame]): Ring buffer with the most recently grabbed frames.
+        _frame_counter (int): Number of frames grabbed so far, used as frame id.
+        _last_frame_id (int): Id of the last frame returned to the consumer.
+        _condition (threading.Condition): Condition signalling that a new frame is available.
+        _stop_event (threading.Event): Event stopping the capture thread.
+        _thread (Optional[threading.Thread]): Capture thread.
     """
 
-    def __init__(self, device_num: int = 0, cam_width: int = 1280, cam_height: int = 720):
+    def __init__(self, device_num: int = 0, cam_width: int = 1280, cam_height: int = 720, threaded: bool = False,
+                 buffer_size: int = 2, shared_memory_slots: int = 0,
+                 profile: Optional[Union[str, CaptureProfile]] = None,
+                 capture_factory: Callable[[int, int], Any] = cv2.VideoCapture):
         """
         Constructor.
 
@@ -21,14 +53,50 @@ class CameraVideoCapture:
             device_num (int): Defaults to 0. Device id number.
             cam_width (int): Defaults to 1280. Camera width.
             cam_height (int): Defaults to 720. Camera height.
+            threaded (bool): Defaults to False. Flag to grab frames on a background thread.
+            buffer_size (int): Defaults to 2. Size of the ring buffer used in threaded mode.
+            shared_memory_slots (int): Defaults to 0. Number of frames of the shared memory ring the frames are
+                captured into, disabled when 0.
+            profile (Optional[Union[str, CaptureProfile]]): Defaults to None. Capture profile or its name in
+                CAPTURE_PROFILES, AUTOTUNE to probe the device once and reuse the cached result, the driver defaults
+                when None.
+            capture_factory (Callable[[int, int], Any]): Defaults to cv2.VideoCapture. Opens the device from its id
+                number and backend, e.g. SimulatedCamera.
         """
 
-        self.cap: cv2.VideoCapture = cv2.VideoCapture(device_num)
-        self.cap.set(3, cam_width)
-        self.cap.set(4, cam_height)
+        if profile == AUTOTUNE:
+            from hcs.camera_video_capture.autotune import autotune_capture
+
+            profile = autotune_capture(device_num, cam_width, cam_height, capture_factory)
+        elif isinstance(profile, str):
+            profile = create_capture_profile(profile)
+        elif profile is None:
+            profile = CaptureProfile()
+
+        self.cap: cv2.VideoCapture = capture_factory(device_num, profile.api_preference)
+        self.profile: CaptureProfile = apply_capture_profile(self.cap, profile, cam_width, cam_height)
+
+        self.cam_width = self.profile.width
+        self.cam_height = self.profile.height
 
-        self.cam_width = cam_width
-        self.cam_height = cam_height
+        self.threaded: bool = threaded
+        self.dropped_frames: int = 0
+
+        self.shared_ring: Optional[SharedFrameRing] = None
+        if shared_memory_slots > 0:
+            # The ring holds frames of the size the camera actually delivers
+            self.shared_ring = SharedFrameRing.create(self.cam_width, self.cam_height, shared_memory_slots)
+
+        self._buffer: Deque[Frame] = deque(maxlen=max(1, buffer_size))
+        self._frame_counter: int = 0
+        self._last_frame_id: int = -1
+        self._condition: threading.Condition = threading.Condition()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if self.threaded:
+            self._thread = threading.Thread(target=self._capture_loop, name="CameraVideoCapture", daemon=True)
+            self._thread.start()
 
     def read(self, image: Any = None) -> Tuple[bool, Any]:
         """
@@ -42,15 +110,72 @@ class CameraVideoCapture:
             Tuple[bool, Any]: return value which is 'False' no frames has been grabbed, and grabbed frame
         """
 
-        return self.cap.read(image)
+        if not self.threaded:
+            return self.cap.read(image)
+
+        frame = self.read_frame()
+
+        if frame is None:
+            return False, image
+
+        return True, frame.image
+
+    def read_frame(self, timeout: float = 1.0) -> Optional[Frame]:
+        """
+        Returns the newest video frame with its id and capture timestamp.
+        In threaded mode waits until a frame newer than the previously returned one is available.
+
+        Args:
+            timeout (float): Defaults to 1.0. Maximum time in seconds to wait for a new frame in threaded mode.
+
+        Returns:
+            Optional[Frame]: The newest frame or None when no frame has been grabbed.
+        """
+
+        if not self.threaded:
+            frame = self._grab_frame()
+
+            if frame is not None:
+                self._last_frame_id = frame.frame_id
+
+            return frame
+
+        with self._condition:
+            self._condition.wait_for(self._has_new_frame, timeout)
+
+            if not self._buffer or self._buffer[-1].frame_id <= self._last_frame_id:
+                return None
+
+            frame = self._buffer[-1]
+
+            # Frames skipped in favour of the newest one are never going to be returned
+            self.dropped_frames += len(self._buffer) - 1
+            self._buffer.clear()
+            self._last_frame_id = frame.frame_id
+
+        return frame
 
     def release(self) -> None:
         """
          The method is automatically called by subsequent VideoCapture::open and by VideoCapture destructor.
+         In threaded mode the capture thread is stopped first.
         """
 
+        self._stop_event.set()
+
+        if self._thread is not None:
+            with self._condition:
+                self._condition.notify_all()
+
+            self._thread.join()
+            self._thread = None
+
         self.cap.release()
 
+        if self.shared_ring is not None:
+            self.shared_ring.close()
+            self.shared_ring = None
+
     def is_opened(self) -> bool:
         """
         The method check if the previous call to VideoCapture constructor or VideoCapture::open() succeeded
@@ -59,4 +184,69 @@ class CameraVideoCapture:
             bool: Returns true if video capturing has been initialized already.
         """
 
+        if self.threaded and self._stop_event.is_set():
+            return False
+
         return self.cap.isOpened()
+
+    def _has_new_frame(self) -> bool:
+        """
+        Check if the ring buffer holds a frame that was not returned yet or capturing has stopped.
+
+        Returns:
+            bool: True when the consumer does not need to wait any longer.
+        """
+
+        return self._stop_event.is_set() or (bool(self._buffer) and self._buffer[-1].frame_id > self._last_frame_id)
+
+    def _capture_loop(self) -> None:
+        """
+        Background thread grabbing frames into the ring buffer until capture is stopped or the camera fails.
+        """
+
+        while not self._stop_event.is_set():
+            frame = self._grab_frame()
+
+            if frame is None:
+                # Camera has been disconnected or the stream ended
+                self._stop_event.set()
+
+                with self._condition:
+                    self._condition.notify_all()
+
+                break
+
+            with self._condition:
+                # The oldest frame is evicted from the full ring buffer without being returned
+                if len(self._buffer) == self._buffer.maxlen:
+                    self.dropped_frames += 1
+
+                self._buffer.append(frame)
+                self._condition.notify_all()
+
+    def _grab_frame(self) -> Optional[Frame]:
+        """
+        Grab and decode the next frame, into the shared memory ring when it is enabled.
+
+        Returns:
+            Optional[Frame]: Grabbed frame or None when no frame has been grabbed.
+        """
+
+        if self.shared_ring is None:
+            success, image = self.cap.read()
+            frame_id = self._frame_counter
+        else:
+            frame_id, slot = self.shared_ring.begin_write()
+            success, image = self.cap.read(slot)
+
+        if not success:
+            return None
+
+        timestamp = time.perf_counter()
+
+        if self.shared_ring is not None:
+            image = self.shared_ring.commit(frame_id, timestamp, image)
+
+        self._frame_counter = frame_id + 1
+
+        return Frame(frame_id, timestamp, image)
@@ -0,0 +1,50 @@
+import argparse
+import cv2
+
+from hcs.camera_video_capture.autotune import candidate_profiles, default_cache_path, device_key, \
+    probe_capture_profiles, select_probe_result, store_cached_profile
+from hcs.camera_video_capture.simulated_camera import SimulatedCamera
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - probe and cache the camera capture profile")
+    parser.add_argument("--device", type=int, default=0, help="camera device id number")
+    parser.add_argument("--width", type=int, default=1280, help="camera width")
+    parser.add_argument("--height", type=int, default=720, help="camera height")
+    parser.add_argument("--api", type=int, action="append",
+                        help=f"OpenCV backend to probe, can be repeated, e.g. {cv2.CAP_V4L2} for V4L2, any when unset")
+    parser.add_argument("--cache", default=None, help=f"profile cache, {default_cache_path()} by default")
+    parser.add_argument("--simulated", action="store_true",
+                        help="probe a simulated USB webcam instead of the device, nothing is cached")
+    args = parser.parse_args()
+
+    candidates = candidate_profiles(args.api or [cv2.CAP_ANY])
+    capture_factory = SimulatedCamera if args.simulated else cv2.VideoCapture
+    results = probe_capture_profiles(args.device, args.width, args.height, candidates, capture_factory)
+
+    for result in results:
+        requested = result.requested
+        name = f"{requested.fourcc or 'default'} {requested.fps:.0f} fps, api {requested.api_preference}"
+
+        if result.error is not None:
+            print(f"{name}: rejected, {result.error}")
+            continue
+
+        print(f"{name}: {result.fps:.1f} fps delivered, read latency {result.read_latency_ms:.2f} ms "
+              f"({result.negotiated.fourcc} {result.negotiated.width}x{result.negotiated.height})")
+
+    selected = select_probe_result(results)
+    if selected is None:
+        print("no profile delivered frames")
+        return
+
+    print(f"selected {selected.requested.fourcc or 'default'} {selected.requested.fps:.0f} fps")
+
+    if not args.simulated:
+        cache_path = args.cache or default_cache_path()
+        store_cached_profile(cache_path, device_key(args.device, args.width, args.height), selected)
+        print(f"cached in {cache_path}")
+
+
+if __name__ == '__main__':
+    main()
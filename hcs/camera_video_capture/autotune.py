@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import tempfile
+import cv2
+import numpy as np
+
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from hcs.camera_video_capture.capture_profile import CaptureProfile, apply_capture_profile
+
+
+@dataclass
+class ProbeResult:
+    """
+    Measurement of a capture profile on a device. The read latency is the time to decode a grabbed frame, the wait
+    for the camera is part of the delivered frame rate.
+    """
+
+    requested: CaptureProfile
+    negotiated: CaptureProfile
+    fps: float = 0.0
+    read_latency_ms: float = 0.0
+    frames: int = 0
+    error: Optional[str] = None
+
+
+def default_cache_path() -> str:
+    """
+    Returns:
+        str: Path of the file caching the autotuned profile of every device.
+    """
+
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+    return os.path.join(cache_dir, "hcs", "capture_profiles.json")
+
+
+def device_key(device_num: int, cam_width: int, cam_height: int, device_name: Optional[str] = None) -> str:
+    """
+    Key of a device in the profile cache. Includes the device name where the platform reports it, so another camera
+    at the same index is probed again.
+
+    Args:
+        device_num (int): Device id number.
+        cam_width (int): Requested camera width.
+        cam_height (int): Requested camera height.
+        device_name (Optional[str]): Defaults to None. Device name, read from sysfs on Linux when None.
+
+    Returns:
+        str: Cache key.
+    """
+
+    if device_name is None:
+        try:
+            with open(f"/sys/class/video4linux/video{device_num}/name") as f:
+                device_name = f.read().strip()
+        except OSError:
+            device_name = ""
+
+    return f"{device_num}:{device_name}:{cam_width}x{cam_height}"
+
+
+def candidate_profiles(api_preferences: Sequence[int] = (cv2.CAP_ANY,)) -> List[CaptureProfile]:
+    """
+    Args:
+        api_preferences (Sequence[int]): Defaults to (cv2.CAP_ANY,). Backends to probe.
+
+    Returns:
+        List[CaptureProfile]: Profiles probed by autotune_capture, for every backend the driver defaults, probed
+            first while the device is in its default mode, and the compressed and raw pixel formats at 60 and 30 fps.
+    """
+
+    return [CaptureProfile(fourcc=fourcc, fps=fps, buffer_size=1 if fourcc else 0, api_preference=api_preference)
+            for api_preference in api_preferences
+            for fourcc, fps in ((None, 0.0), ("MJPG", 60.0), ("MJPG", 30.0), ("YUYV", 60.0), ("YUYV", 30.0))]
+
+
+def probe_capture_profiles(device_num: int, cam_width: int, cam_height: int,
+                           candidates: Optional[List[CaptureProfile]] = None,
+                           capture_factory: Callable[[int, int], Any] = cv2.VideoCapture, frames: int = 30,
+                           warm_up_frames: int = 5, max_probe_time: float = 1.0) -> List[ProbeResult]:
+    """
+    Measure the delivered frame rate and the read latency of every candidate with actual reads. Candidates the
+    device does not deliver at the requested size are rejected without reading.
+
+    Args:
+        device_num (int): Device id number.
+        cam_width (int): Requested camera width.
+        cam_height (int): Requested camera height.
+        candidates (Optional[List[CaptureProfile]]): Defaults to None. Profiles to probe, candidate_profiles() when
+            None.
+        capture_factory (Callable[[int, int], Any]): Defaults to cv2.VideoCapture. Opens a device from its id
+            number and backend, e.g. SimulatedCamera.
+        frames (int): Defaults to 30. Number of measured frames of a candidate.
+        warm_up_frames (int): Defaults to 5. Number of frames read before measuring, cameras need a few frames to
+            settle after a mode switch.
+        max_probe_time (float): Defaults to 1.0. Maximum measuring time in seconds of a candidate, slow modes are
+            measured on fewer frames.
+
+    Returns:
+        List[ProbeResult]: Result of every candidate.
+    """
+
+    candidates = candidates if candidates is not None else candidate_profiles()
+    results = []
+    captures: Dict[int, Any] = {}
+
+    try:
+        for profile in candidates:
+            # The backend is chosen when a device is opened, profiles of a backend share the opened device
+            capture = captures.get(profile.api_preference)
+            if capture is None:
+                capture = captures[profile.api_preference] = capture_factory(device_num, profile.api_preference)
+
+            if not capture.isOpened():
+                results.append(ProbeResult(profile, profile, error="device not opened"))
+                continue
+
+            negotiated = apply_capture_profile(capture, profile, cam_width, cam_height)
+            result = ProbeResult(profile, negotiated)
+            results.append(result)
+
+            if (negotiated.width, negotiated.height) != (cam_width, cam_height):
+                result.error = f"delivers {negotiated.width}x{negotiated.height}"
+                continue
+            if profile.fourcc and negotiated.fourcc != profile.fourcc:
+                result.error = f"delivers {negotiated.fourcc}"
+                continue
+
+            for _ in range(warm_up_frames):
+                capture.read()
+
+            read_latencies = []
+            start_time = time.perf_counter()
+
+            while len(read_latencies) < frames and time.perf_counter() - start_time < max_probe_time:
+                if not capture.grab():
+                    break
+
+                retrieve_start = time.perf_counter()
+                success, _ = capture.retrieve()
+                if not success:
+                    break
+
+                read_latencies.append(time.perf_counter() - retrieve_start)
+
+            elapsed = time.perf_counter() - start_time
+
+            if not read_latencies:
+                result.error = "no frames"
+                continue
+
+            result.frames = len(read_latencies)
+            result.fps = len(read_latencies) / elapsed
+            result.read_latency_ms = float(np.median(read_latencies)) * 1000
+    finally:
+        for capture in captures.values():
+            capture.release()
+
+    return results
+
+
+def select_probe_result(results: List[ProbeResult], fps_tolerance: float = 0.1) -> Optional[ProbeResult]:
+    """
+    Select the result with the lowest read latency among those delivering within fps_tolerance of the best frame
+    rate.
+
+    Args:
+        results (List[ProbeResult]): Probe results.
+        fps_tolerance (float): Defaults to 0.1. Fraction of the best frame rate considered equal, frame rates are
+            measured on a few frames.
+
+    Returns:
+        Optional[ProbeResult]: Selected result, None when no candidate delivered frames.
+    """
+
+    delivered = [result for result in results if result.error is None]
+
+    if not delivered:
+        return None
+
+    best_fps = max(result.fps for result in delivered)
+
+    return min((result for result in delivered if result.fps >= best_fps * (1.0 - fps_tolerance)),
+               key=lambda result: result.read_latency_ms)
+
+
+def load_profile_cache(cache_path: str) -> Dict[str, Any]:
+    """
+    Args:
+        cache_path (str): Path of the profile cache.
+
+    Returns:
+        Dict[str, Any]: Cache entries by device key, empty when the cache does not exist or is unreadable.
+    """
+
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return cache if isinstance(cache, dict) else {}
+
+
+def store_cached_profile(cache_path: str, key: str, result: ProbeResult) -> None:
+    """
+    Store the selected profile of a device, replacing the cache file atomically so concurrent startups never read
+    a partial file.
+
+    Args:
+        cache_path (str): Path of the profile cache.
+        key (str): Device key, see device_key.
+        result (ProbeResult): Selected probe result.
+    """
+
+    cache = load_profile_cache(cache_path)
+    cache[key] = {"profile": result.requested.to_dict(), "fps": result.fps,
+                  "read_latency_ms": result.read_latency_ms, "probed": time.time()}
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        os.unlink(temp_path)
+        raise
+
+
+def autotune_capture(device_num: int, cam_width: int, cam_height: int,
+                     capture_factory: Callable[[int, int], Any] = cv2.VideoCapture,
+                     cache_path: Optional[str] = None, refresh: bool = False, device_name: Optional[str] = None,
+                     candidates: Optional[List[CaptureProfile]] = None) -> CaptureProfile:
+    """
+    Get the capture profile of a device with the best delivered frame rate and the lowest read latency at the
+    requested size. The profile is probed once and cached per device, later calls return the cached profile without
+    opening the device. Profiles probed with another capture factory, e.g. SimulatedCamera, are not cached, they do
+    not describe the device.
+
+    Args:
+        device_num (int): Device id number.
+        cam_width (int): Requested camera width.
+        cam_height (int): Requested camera height.
+        capture_factory (Callable[[int, int], Any]): Defaults to cv2.VideoCapture. Opens a device from its id
+            number and backend, e.g. SimulatedCamera.
+        cache_path (Optional[str]): Defaults to None. Path of the profile cache, default_cache_path() when None.
+        refresh (bool): Defaults to False. Flag to probe even when the device is cached.
+        device_name (Optional[str]): Defaults to None. Device name of the cache key, see device_key.
+        candidates (Optional[List[CaptureProfile]]): Defaults to None. Profiles to probe, candidate_profiles() when
+            None.
+
+    Returns:
+        CaptureProfile: Selected profile with the requested size, the driver defaults when no candidate delivered
+            frames.
+    """
+
+    cache_path = cache_path or default_cache_path()
+    key = device_key(device_num, cam_width, cam_height, device_name)
+    cached = capture_factory is cv2.VideoCapture
+
+    if cached and not refresh:
+        entry = load_profile_cache(cache_path).get(key)
+        if entry is not None:
+            return CaptureProfile.from_dict(entry["profile"])
+
+    selected = select_probe_result(probe_capture_profiles(device_num, cam_width, cam_height, candidates,
+                                                          capture_factory))
+
+    # Not cached, a device that was busy or unplugged is probed again next time
+    if selected is None:
+        return CaptureProfile()
+
+    selected.requested = replace(selected.requested, width=cam_width, height=cam_height)
+
+    if not cached:
+        return selected.requested
+
+    try:
+        store_cached_profile(cache_path, key, selected)
+    except OSError:
+        # A read-only home directory only costs probing at every startup
+        pass
+
+    return selected.requested
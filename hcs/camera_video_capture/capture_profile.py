@@ -0,0 +1,129 @@
+import cv2
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CaptureProfile:
+    """
+    Capture mode requested from a camera. Zero and None fields are left to the driver, a zero size is taken from the
+    requested camera size.
+
+    Many UVC cameras deliver raw YUYV by default, which does not fit USB 2.0 bandwidth at 720p and drops to 5-10 fps,
+    while MJPG delivers 30 fps or more. A driver buffer of one frame keeps the camera from queueing stale frames.
+    """
+
+    width: int = 0
+    height: int = 0
+    fourcc: Optional[str] = None
+    fps: float = 0.0
+    buffer_size: int = 0
+    api_preference: int = cv2.CAP_ANY
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: JSON serializable fields.
+        """
+
+        return {"width": self.width, "height": self.height, "fourcc": self.fourcc, "fps": self.fps,
+                "buffer_size": self.buffer_size, "api_preference": self.api_preference}
+
+    @classmethod
+    def from_dict(cls, fields: Dict[str, Any]) -> "CaptureProfile":
+        """
+        Args:
+            fields (Dict[str, Any]): Fields written by to_dict.
+
+        Returns:
+            CaptureProfile: Capture profile.
+        """
+
+        return cls(int(fields.get("width", 0)), int(fields.get("height", 0)), fields.get("fourcc"),
+                   float(fields.get("fps", 0.0)), int(fields.get("buffer_size", 0)),
+                   int(fields.get("api_preference", cv2.CAP_ANY)))
+
+
+# Name of the profile chosen by probing the camera, see autotune_capture
+AUTOTUNE = "auto"
+
+CAPTURE_PROFILES: Dict[str, CaptureProfile] = {
+    "default": CaptureProfile(),
+    "mjpg": CaptureProfile(fourcc="MJPG", fps=30.0, buffer_size=1),
+    "mjpg_60": CaptureProfile(fourcc="MJPG", fps=60.0, buffer_size=1),
+    "yuyv": CaptureProfile(fourcc="YUYV", fps=30.0, buffer_size=1),
+}
+
+
+def create_capture_profile(name: str) -> CaptureProfile:
+    """
+    Get a capture profile by name.
+
+    Args:
+        name (str): Profile name, one of CAPTURE_PROFILES.
+
+    Returns:
+        CaptureProfile: Capture profile.
+    """
+
+    if name not in CAPTURE_PROFILES:
+        raise ValueError(f"Unknown capture profile: {name}")
+
+    return CAPTURE_PROFILES[name]
+
+
+def fourcc_to_str(code: float) -> Optional[str]:
+    """
+    Args:
+        code (float): Value of CAP_PROP_FOURCC.
+
+    Returns:
+        Optional[str]: Four character code, None when the backend does not report it.
+    """
+
+    code = int(code)
+
+    if code <= 0:
+        return None
+
+    return "".join(chr((code >> shift) & 0xFF) for shift in (0, 8, 16, 24))
+
+
+def apply_capture_profile(capture: Any, profile: CaptureProfile, cam_width: int, cam_height: int) -> CaptureProfile:
+    """
+    Request a capture profile from an opened capture and read back what the driver negotiated.
+
+    The pixel format is set before the size, V4L2 only offers the sizes of the current format.
+
+    Args:
+        capture (Any): Opened cv2.VideoCapture or SimulatedCamera.
+        profile (CaptureProfile): Requested profile.
+        cam_width (int): Width requested when the profile has none.
+        cam_height (int): Height requested when the profile has none.
+
+    Returns:
+        CaptureProfile: Negotiated profile, fields the backend does not report are the requested ones.
+    """
+
+    if profile.fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width or cam_width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height or cam_height)
+
+    if profile.fps > 0:
+        capture.set(cv2.CAP_PROP_FPS, profile.fps)
+    if profile.buffer_size > 0:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, profile.buffer_size)
+
+    # Backends report 0 or -1 for properties they do not support
+    def reported(prop: int) -> float:
+        return max(float(capture.get(prop)), 0.0)
+
+    return replace(profile,
+                   width=int(reported(cv2.CAP_PROP_FRAME_WIDTH)) or profile.width or cam_width,
+                   height=int(reported(cv2.CAP_PROP_FRAME_HEIGHT)) or profile.height or cam_height,
+                   fourcc=fourcc_to_str(reported(cv2.CAP_PROP_FOURCC)) or profile.fourcc,
+                   fps=reported(cv2.CAP_PROP_FPS) or profile.fps,
+                   buffer_size=int(reported(cv2.CAP_PROP_BUFFERSIZE)) or profile.buffer_size)
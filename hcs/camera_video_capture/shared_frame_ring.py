@@ -0,0 +1,262 @@
+import cv2
+import numpy as np
+
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+# Header alignment in bytes, frames start on a cache line
+_HEADER_ALIGNMENT = 64
+
+
+class SharedFrameRing:
+    """
+    Ring buffer of video frames in a multiprocessing.shared_memory block, written by one capture process and read
+    zero-copy as NumPy views by other processes. Readers only exchange frame sequence numbers.
+
+    Every slot stores the sequence number of its frame. The writer invalidates the slot before it overwrites it
+    and publishes the new sequence number when the frame is complete, so a reader checks is_valid after it is done
+    with a view: when the slot has been reused in the meantime the result has to be discarded. With enough slots
+    for the frames in flight this never happens.
+
+    Layout: sequence numbers of the slots (int64), capture timestamps of the slots (float64), latest sequence number
+    (int64), padding to 64 bytes, then the frames.
+
+    Attributes:
+        name (str): Name of the shared memory block, used by readers to attach.
+        width (int): Frame width.
+        height (int): Frame height.
+        slots (int): Number of frames in the ring.
+        _memory (shared_memory.SharedMemory): Shared memory block.
+        _owner (bool): Flag ring created by this process, which unlinks the block.
+        _sequences (numpy.ndarray): Sequence number of the frame in every slot, -1 while empty or being written.
+        _timestamps (numpy.ndarray): Capture timestamp of the frame in every slot.
+        _latest (numpy.ndarray): One element array with the sequence number of the newest frame.
+        _frames (numpy.ndarray): (slots, height, width, 3) frames.
+        _next_sequence (int): Sequence number of the next written frame.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, width: int, height: int, slots: int, owner: bool):
+        """
+        Constructor, use create or attach.
+
+        Args:
+            memory (shared_memory.SharedMemory): Shared memory block.
+            width (int): Frame width.
+            height (int): Frame height.
+            slots (int): Number of frames in the ring.
+            owner (bool): Flag ring created by this process.
+        """
+
+        self.name: str = memory.name
+        self.width: int = width
+        self.height: int = height
+        self.slots: int = slots
+
+        self._memory: shared_memory.SharedMemory = memory
+        self._owner: bool = owner
+
+        buffer = memory.buf
+        self._sequences: np.ndarray = np.ndarray((slots,), dtype=np.int64, buffer=buffer)
+        self._timestamps: np.ndarray = np.ndarray((slots,), dtype=np.float64, buffer=buffer, offset=8 * slots)
+        self._latest: np.ndarray = np.ndarray((1,), dtype=np.int64, buffer=buffer, offset=16 * slots)
+        self._frames: np.ndarray = np.ndarray((slots, height, width, 3), dtype=np.uint8, buffer=buffer,
+                                              offset=self._header_size(slots))
+
+        self._next_sequence: int = int(self._latest[0]) + 1
+
+    @classmethod
+    def create(cls, width: int, height: int, slots: int = 8, name: Optional[str] = None) -> "SharedFrameRing":
+        """
+        Create a ring, the creating process is its writer.
+
+        Args:
+            width (int): Frame width.
+            height (int): Frame height.
+            slots (int): Defaults to 8. Number of frames in the ring, at least the number of frames in flight plus
+                two.
+            name (Optional[str]): Defaults to None. Name of the shared memory block, a random one when None.
+
+        Returns:
+            SharedFrameRing: Empty ring.
+        """
+
+        size = cls._header_size(slots) + slots * height * width * 3
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        ring = cls(memory, width, height, slots, owner=True)
+        ring._sequences[:] = -1
+        ring._latest[0] = -1
+        ring._next_sequence = 0
+
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, width: int, height: int, slots: int) -> "SharedFrameRing":
+        """
+        Attach to a ring created by another process.
+
+        Args:
+            name (str): Name of the shared memory block.
+            width (int): Frame width.
+            height (int): Frame height.
+            slots (int): Number of frames in the ring.
+
+        Returns:
+            SharedFrameRing: Attached ring.
+        """
+
+        return cls(shared_memory.SharedMemory(name=name), width, height, slots, owner=False)
+
+    @property
+    def spec(self) -> Tuple[str, int, int, int]:
+        """
+        Returns:
+            Tuple[str, int, int, int]: Name, width, height and slots, the arguments of attach.
+        """
+
+        return self.name, self.width, self.height, self.slots
+
+    @property
+    def latest_sequence(self) -> int:
+        """
+        Returns:
+            int: Sequence number of the newest frame, -1 when no frame has been written.
+        """
+
+        return int(self._latest[0])
+
+    def begin_write(self) -> Tuple[int, np.ndarray]:
+        """
+        Reserve the slot of the next frame, e.g. for cv2.VideoCapture.read to decode into. The slot is invalid until
+        commit is called.
+
+        Returns:
+            Tuple[int, numpy.ndarray]: Sequence number of the frame and the view of its slot.
+        """
+
+        sequence = self._next_sequence
+        slot = sequence % self.slots
+
+        # Readers still holding the old frame of the slot see it as overwritten from now on
+        self._sequences[slot] = -1
+
+        return sequence, self._frames[slot]
+
+    def commit(self, sequence: int, timestamp: float, image: Optional[Any] = None) -> np.ndarray:
+        """
+        Publish a frame reserved by begin_write.
+
+        Args:
+            sequence (int): Sequence number returned by begin_write.
+            timestamp (float): Capture timestamp.
+            image (Optional[Any]): Defaults to None. Frame copied into the slot when it was not written in place,
+                resized when its size differs from the ring.
+
+        Returns:
+            numpy.ndarray: View of the slot.
+        """
+
+        slot = sequence % self.slots
+        view = self._frames[slot]
+
+        if image is not None and not np.shares_memory(image, view):
+            if image.shape == view.shape:
+                np.copyto(view, image)
+            else:
+                cv2.resize(image, (self.width, self.height), dst=view)
+
+        self._timestamps[slot] = timestamp
+        self._sequences[slot] = sequence
+        self._latest[0] = sequence
+        self._next_sequence = sequence + 1
+
+        return view
+
+    def write(self, image: Any, timestamp: float) -> int:
+        """
+        Copy a frame into the next slot.
+
+        Args:
+            image (Any): BGR frame.
+            timestamp (float): Capture timestamp.
+
+        Returns:
+            int: Sequence number of the frame.
+        """
+
+        sequence, _ = self.begin_write()
+        self.commit(sequence, timestamp, image)
+
+        return sequence
+
+    def view(self, sequence: int) -> Optional[np.ndarray]:
+        """
+        Zero-copy view of a frame. The view stays valid until the slot is reused, check is_valid after using it.
+
+        Args:
+            sequence (int): Sequence number of the frame.
+
+        Returns:
+            Optional[numpy.ndarray]: Frame view or None when the frame has already been overwritten.
+        """
+
+        if sequence < 0 or self._sequences[sequence % self.slots] != sequence:
+            return None
+
+        return self._frames[sequence % self.slots]
+
+    def is_valid(self, sequence: int) -> bool:
+        """
+        Args:
+            sequence (int): Sequence number of the frame.
+
+        Returns:
+            bool: True when the slot still holds the frame.
+        """
+
+        return sequence >= 0 and self._sequences[sequence % self.slots] == sequence
+
+    def timestamp(self, sequence: int) -> Optional[float]:
+        """
+        Args:
+            sequence (int): Sequence number of the frame.
+
+        Returns:
+            Optional[float]: Capture timestamp of the frame or None when it has been overwritten.
+        """
+
+        timestamp = float(self._timestamps[sequence % self.slots])
+
+        return timestamp if self.is_valid(sequence) else None
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory, the creating process also removes the block. Views must not be used
+        afterwards.
+        """
+
+        # NumPy views have to be released before the memory can be closed
+        self._sequences = self._timestamps = self._latest = self._frames = None
+
+        try:
+            self._memory.close()
+        except BufferError:
+            # Frames are still referenced elsewhere, the mapping is released with them
+            pass
+
+        if self._owner:
+            self._memory.unlink()
+
+    @staticmethod
+    def _header_size(slots: int) -> int:
+        """
+        Args:
+            slots (int): Number of frames in the ring.
+
+        Returns:
+            int: Size of the header in bytes, aligned to 64 bytes.
+        """
+
+        size = 16 * slots + 8
+
+        return (size + _HEADER_ALIGNMENT - 1) // _HEADER_ALIGNMENT * _HEADER_ALIGNMENT
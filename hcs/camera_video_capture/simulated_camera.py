@@ -0,0 +1,235 @@
+import time
+import cv2
+import numpy as np
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from hcs.camera_video_capture.capture_profile import fourcc_to_str
+
+# Modes of a typical USB 2.0 720p webcam: pixel format, width, height, maximum fps and decode time in seconds
+UVC_WEBCAM_MODES: List[Tuple[str, int, int, float, float]] = [
+    ("YUYV", 640, 480, 30.0, 0.0005),
+    ("YUYV", 1280, 720, 10.0, 0.001),
+    ("YUYV", 1920, 1080, 5.0, 0.002),
+    ("MJPG", 640, 480, 60.0, 0.001),
+    ("MJPG", 1280, 720, 60.0, 0.003),
+    ("MJPG", 1920, 1080, 30.0, 0.006),
+]
+
+
+class SimulatedCamera:
+    """
+    Stand-in for cv2.VideoCapture of a camera, for developing and checking the capture profiles and autotuning
+    without the hardware. Negotiates formats like V4L2 - the nearest size of the requested pixel format, the frame
+    rate capped by the mode - and delivers frames at the frame rate of the negotiated mode, paying its decode time in
+    retrieve.
+
+    Attributes:
+        device_num (int): Simulated device id number.
+        api_preference (int): Requested backend.
+        modes (List[Tuple[str, int, int, float, float]]): Pixel format, width, height, maximum fps and decode time
+            in seconds of every mode.
+        frames (int): Number of delivered frames.
+        _mode (Tuple[str, int, int, float, float]): Negotiated mode.
+        _requested (Dict[str, Any]): Requested pixel format, width, height and fps.
+        _fps (float): Negotiated frame rate.
+        _buffer_size (int): Driver buffer size.
+        _opened (bool): Flag device open.
+        _next_frame_time (float): Time the camera delivers the next frame.
+        _grabbed (bool): Flag a frame has been grabbed and not retrieved.
+        _image (Optional[numpy.ndarray]): Image of the negotiated size, copied into every frame.
+    """
+
+    def __init__(self, device_num: int = 0, api_preference: int = cv2.CAP_ANY,
+                 modes: Optional[List[Tuple[str, int, int, float, float]]] = None):
+        """
+        Constructor, same arguments as cv2.VideoCapture. Opens in the first mode.
+
+        Args:
+            device_num (int): Defaults to 0. Simulated device id number.
+            api_preference (int): Defaults to cv2.CAP_ANY. Requested backend, only reported.
+            modes (Optional[List[Tuple[str, int, int, float, float]]]): Defaults to None. Modes of the device,
+                UVC_WEBCAM_MODES when None.
+        """
+
+        self.device_num: int = device_num
+        self.api_preference: int = api_preference
+        self.modes: List[Tuple[str, int, int, float, float]] = modes if modes is not None else UVC_WEBCAM_MODES
+        self.frames: int = 0
+
+        self._mode: Tuple[str, int, int, float, float] = self.modes[0]
+        self._requested: Dict[str, Any] = {"fourcc": self._mode[0], "width": self._mode[1], "height": self._mode[2],
+                                           "fps": 0.0}
+        self._fps: float = self._mode[3]
+        self._buffer_size: int = 4
+        self._opened: bool = True
+        self._next_frame_time: float = time.perf_counter()
+        self._grabbed: bool = False
+        self._image: Optional[np.ndarray] = None
+
+    def isOpened(self) -> bool:
+        """
+        Returns:
+            bool: True until released.
+        """
+
+        return self._opened
+
+    def getBackendName(self) -> str:
+        """
+        Returns:
+            str: Backend name.
+        """
+
+        return "SIMULATED"
+
+    def set(self, prop: int, value: float) -> bool:
+        """
+        Request a property and renegotiate the mode.
+
+        Args:
+            prop (int): cv2.CAP_PROP_* id.
+            value (float): Requested value.
+
+        Returns:
+            bool: True when the property is supported.
+        """
+
+        if prop == cv2.CAP_PROP_FOURCC:
+            self._requested["fourcc"] = fourcc_to_str(value)
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self._requested["width"] = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self._requested["height"] = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            self._requested["fps"] = float(value)
+        elif prop == cv2.CAP_PROP_BUFFERSIZE:
+            self._buffer_size = max(1, int(value))
+            return True
+        else:
+            return False
+
+        self._negotiate()
+
+        return True
+
+    def get(self, prop: int) -> float:
+        """
+        Args:
+            prop (int): cv2.CAP_PROP_* id.
+
+        Returns:
+            float: Negotiated value, 0 for unsupported properties.
+        """
+
+        values = {
+            cv2.CAP_PROP_FOURCC: float(cv2.VideoWriter_fourcc(*self._mode[0])),
+            cv2.CAP_PROP_FRAME_WIDTH: float(self._mode[1]),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(self._mode[2]),
+            cv2.CAP_PROP_FPS: self._fps,
+            cv2.CAP_PROP_BUFFERSIZE: float(self._buffer_size),
+        }
+
+        return values.get(prop, 0.0)
+
+    def grab(self) -> bool:
+        """
+        Wait for the next frame of the camera.
+
+        Returns:
+            bool: False when released.
+        """
+
+        if not self._opened:
+            return False
+
+        now = time.perf_counter()
+
+        if now < self._next_frame_time:
+            time.sleep(self._next_frame_time - now)
+            self._next_frame_time += 1.0 / self._fps
+        else:
+            # A slow reader gets the frame delivered last, the camera does not wait for it
+            periods = int((now - self._next_frame_time) * self._fps) + 1
+            self._next_frame_time += periods / self._fps
+
+        self._grabbed = True
+        self.frames += 1
+
+        return True
+
+    def retrieve(self, image: Any = None) -> Tuple[bool, Any]:
+        """
+        Decode the grabbed frame.
+
+        Args:
+            image (Any): Defaults to None. Image the frame is decoded into.
+
+        Returns:
+            Tuple[bool, Any]: 'False' when no frame has been grabbed, and the frame.
+        """
+
+        if not self._grabbed:
+            return False, image
+
+        self._grabbed = False
+
+        # Decoding is native code and releases the GIL like the real backends
+        decode_end = time.perf_counter() + self._mode[4]
+
+        height, width = self._mode[2], self._mode[1]
+        if self._image is None or self._image.shape[:2] != (height, width):
+            self._image = np.zeros((height, width, 3), np.uint8)
+
+        if image is None or image.shape != self._image.shape:
+            image = self._image.copy()
+        else:
+            np.copyto(image, self._image)
+
+        cv2.putText(image, str(self.frames), (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+
+        remaining = decode_end - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+        return True, image
+
+    def read(self, image: Any = None) -> Tuple[bool, Any]:
+        """
+        Grab and decode the next frame.
+
+        Args:
+            image (Any): Defaults to None. Image the frame is decoded into.
+
+        Returns:
+            Tuple[bool, Any]: 'False' when released, and the frame.
+        """
+
+        if not self.grab():
+            return False, image
+
+        return self.retrieve(image)
+
+    def release(self) -> None:
+        """
+        Close the device.
+        """
+
+        self._opened = False
+
+    def _negotiate(self) -> None:
+        """
+        Select the mode of the requested pixel format nearest to the requested size, keeping the current pixel format
+        when the requested one is not offered, and cap the requested frame rate by the mode.
+        """
+
+        fourcc = self._requested["fourcc"]
+        if not any(mode[0] == fourcc for mode in self.modes):
+            fourcc = self._mode[0]
+
+        width, height = self._requested["width"], self._requested["height"]
+        self._mode = min((mode for mode in self.modes if mode[0] == fourcc),
+                         key=lambda mode: abs(mode[1] - width) + abs(mode[2] - height))
+
+        fps = self._requested["fps"]
+        self._fps = min(fps, self._mode[3]) if fps > 0 else self._mode[3]
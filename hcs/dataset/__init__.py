@@ -0,0 +1,284 @@
+import os
+import hashlib
+import cv2
+import numpy as np
+
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from hcs.models import GestureType, HandType
+import hcs.utils.hand_utils as hu
+
+IMAGE_EXTENSIONS: Tuple[str, ...] = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_EXTENSIONS: Tuple[str, ...] = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+# Landmark detector of the worker process and its hand type flag, set by the pool initializer
+_worker_detector = None
+_worker_flip_type = True
+
+
+class ExtractionUnit(NamedTuple):
+    """
+    Chunk of input files with the same labels, processed by one worker task and saved as one shard.
+    """
+
+    unit_id: str
+    gesture_type: int
+    hand_type: int
+    paths: Tuple[str, ...]
+
+
+def find_units(data_directory: str, chunk_size: int = 64) -> List[ExtractionUnit]:
+    """
+    Find labeled input files laid out as <data_directory>/<GESTURE>/<HAND>/<file>, e.g. data/CLICK/RIGHT/1.jpg.
+    Gesture and hand directories are named after GestureType and HandType members, case-insensitive. Files are
+    split into chunks in name order, so the units of an unchanged directory are the same on every run. The unit id
+    covers the labels and the relative path, size and modification time of every file, so a changed file gets a new
+    unit.
+
+    Args:
+        data_directory (str): Directory with labeled input files.
+        chunk_size (int): Defaults to 64. Maximum number of files in a unit, every video gets its own unit.
+
+    Returns:
+        List[ExtractionUnit]: Units to process.
+    """
+
+    units: List[ExtractionUnit] = []
+
+    for gesture_name in sorted(os.listdir(data_directory)):
+        gesture_directory = os.path.join(data_directory, gesture_name)
+        if not os.path.isdir(gesture_directory) or gesture_name.upper() not in GestureType.__members__:
+            continue
+
+        for hand_name in sorted(os.listdir(gesture_directory)):
+            hand_directory = os.path.join(gesture_directory, hand_name)
+            if not os.path.isdir(hand_directory) or hand_name.upper() not in HandType.__members__:
+                continue
+
+            gesture_type = GestureType[gesture_name.upper()].value
+            hand_type = HandType[hand_name.upper()].value
+            names = sorted(os.listdir(hand_directory))
+
+            images = [os.path.join(hand_directory, name) for name in names if name.lower().endswith(IMAGE_EXTENSIONS)]
+            videos = [os.path.join(hand_directory, name) for name in names if name.lower().endswith(VIDEO_EXTENSIONS)]
+
+            chunks = [tuple(images[i:i + chunk_size]) for i in range(0, len(images), chunk_size)]
+            chunks += [(video,) for video in videos]
+
+            for paths in chunks:
+                key = [str(gesture_type), str(hand_type)]
+                for path in paths:
+                    stat = os.stat(path)
+                    key.append(f"{os.path.relpath(path, data_directory)}:{stat.st_size}:{stat.st_mtime_ns}")
+
+                unit_id = hashlib.sha1("\n".join(key).encode()).hexdigest()
+                units.append(ExtractionUnit(unit_id, gesture_type, hand_type, paths))
+
+    return units
+
+
+def extract_dataset(data_directory: str, output_path: str, workers: Optional[int] = None, chunk_size: int = 64,
+                    frame_step: int = 1, min_detection_confidence: float = 0.5, flip_type: bool = True,
+                    restart: bool = False, progress: Optional[Callable[[int, int, int], None]] = None) -> int:
+    """
+    Extract normalized hand landmarks of labeled images and videos with a process pool, one static mode
+    HandDetector per worker. Only hands of the labeled hand type are kept.
+
+    Every finished unit is saved as a shard in <output_path>.parts, so an interrupted run continues where it
+    stopped. Shards are named after the unit id and the extraction parameters, a run with other parameters does
+    not reuse them. The shards are merged into the output file at the end. Sources are stored relative to
+    data_directory.
+
+    Args:
+        data_directory (str): Directory with labeled input files, see find_units.
+        output_path (str): Path to the dataset, compressed NumPy for .npz, Parquet for .parquet.
+        workers (Optional[int]): Defaults to None. Number of worker processes, the number of CPUs when None.
+        chunk_size (int): Defaults to 64. Maximum number of images in a unit.
+        frame_step (int): Defaults to 1. Every frame_step-th video frame is processed.
+        min_detection_confidence (float): Defaults to 0.5. Minimum Detection Confidence Threshold.
+        flip_type (bool): Defaults to True. Flag to flip hands type, like HandDetector.find_hands.
+        restart (bool): Defaults to False. Flag to drop shards of a previous run.
+        progress (Optional[Callable[[int, int, int], None]]): Defaults to None. Called after every unit with the
+            number of finished units, all units and extracted samples.
+
+    Returns:
+        int: Number of samples in the dataset.
+    """
+
+    units = find_units(data_directory, chunk_size)
+    options = f"{frame_step}\n{min_detection_confidence}\n{flip_type}"
+    parts_directory = f"{output_path}.parts"
+    os.makedirs(parts_directory, exist_ok=True)
+
+    if restart:
+        for name in os.listdir(parts_directory):
+            os.remove(os.path.join(parts_directory, name))
+
+    pending = [unit for unit in units if not os.path.exists(_shard_path(parts_directory, unit, options))]
+    finished = len(units) - len(pending)
+    samples = 0
+
+    if pending:
+        with Pool(workers, initializer=_init_worker, initargs=(min_detection_confidence, flip_type)) as pool:
+            tasks = ((unit, frame_step, data_directory) for unit in pending)
+
+            for unit, columns in pool.imap_unordered(_extract_unit, tasks):
+                _save_shard(_shard_path(parts_directory, unit, options), columns)
+
+                finished += 1
+                samples += len(columns["target"])
+                if progress is not None:
+                    progress(finished, len(units), samples)
+
+    # Shards are merged in unit order, so the dataset does not depend on the order the workers finished in
+    dataset = _merge_columns([_load_columns(_shard_path(parts_directory, unit, options)) for unit in units])
+    save_dataset(output_path, dataset)
+
+    return len(dataset["target"])
+
+
+def save_dataset(path: str, dataset: Dict[str, np.ndarray]) -> None:
+    """
+    Save dataset columns, as compressed NumPy arrays or, for .parquet paths, as a Parquet table.
+
+    Args:
+        path (str): Path to the dataset.
+        dataset (Dict[str, numpy.ndarray]): Columns: target, hand_type, landmarks (N, 21, 3), source, frame_index.
+    """
+
+    if path.endswith(".parquet"):
+        # Imported on use, Parquet needs pandas with pyarrow or fastparquet
+        import pandas as pd
+
+        table = pd.DataFrame({name: values for name, values in dataset.items() if name != "landmarks"})
+        coordinates = dataset["landmarks"].reshape(len(table), 63)
+        for index, axis in enumerate(["x", "y", "z"] * 21):
+            table[f"{axis}_{index // 3 + 1}"] = coordinates[:, index]
+
+        table.to_parquet(path, index=False)
+        return
+
+    np.savez_compressed(path, **dataset)
+
+
+def load_dataset(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a dataset as a feature matrix in the layout of HandGestureDetector.prepare_features and targets.
+    Reads datasets written by extract_dataset and CSV files of the notebook.
+
+    Args:
+        path (str): Path to a .npz, .parquet or .csv dataset.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: (N, 64) features - hand type and normalized landmarks - and targets.
+    """
+
+    if path.endswith(".npz"):
+        with np.load(path) as dataset:
+            hand_type, landmarks, target = dataset["hand_type"], dataset["landmarks"], dataset["target"]
+
+        features = np.column_stack((hand_type, landmarks.reshape(len(landmarks), 63))).astype(np.float64)
+        return features, target.astype(np.int64)
+
+    if path.endswith(".parquet"):
+        import pandas as pd
+
+        table = pd.read_parquet(path)
+        coordinates = [f"{axis}_{index}" for index in range(1, 22) for axis in "xyz"]
+        return table[["hand_type"] + coordinates].to_numpy(np.float64), table["target"].to_numpy(np.int64)
+
+    # Notebook CSV: target, hand_type, x_1, y_1, z_1, ...
+    table = np.loadtxt(path, delimiter=",", skiprows=1)
+    return table[:, 1:], table[:, 0].astype(np.int64)
+
+
+def _init_worker(min_detection_confidence: float, flip_type: bool) -> None:
+    global _worker_detector, _worker_flip_type
+
+    # Imported in the worker, the parent process does not need mediapipe
+    from hcs.hand_detector import HandDetector
+
+    cv2.setNumThreads(1)
+    _worker_detector = HandDetector(static_image_mode=True, max_num_hands=2,
+                                    min_detection_confidence=min_detection_confidence, reuse_buffers=True)
+    _worker_flip_type = flip_type
+
+
+def _extract_unit(task: Tuple[ExtractionUnit, int, str]) -> Tuple[ExtractionUnit, Dict[str, np.ndarray]]:
+    unit, frame_step, data_directory = task
+    landmarks: List[np.ndarray] = []
+    sources: List[str] = []
+    frame_indexes: List[int] = []
+
+    for path, frame_index, img in _read_images(unit.paths, frame_step):
+        for hand in _worker_detector.find_hands(img, draw=False, flip_type=_worker_flip_type):
+            if hand.type.value != unit.hand_type:
+                continue
+
+            landmarks.append(hu.prepare_hand_data(hand))
+            sources.append(os.path.relpath(path, data_directory))
+            frame_indexes.append(frame_index)
+
+    samples = len(landmarks)
+
+    return unit, {
+        "target": np.full(samples, unit.gesture_type, dtype=np.int8),
+        "hand_type": np.full(samples, unit.hand_type, dtype=np.int8),
+        "landmarks": np.array(landmarks, dtype=np.float32).reshape(samples, 21, 3),
+        "source": np.array(sources, dtype=str),
+        "frame_index": np.array(frame_indexes, dtype=np.int32),
+    }
+
+
+def _read_images(paths: Tuple[str, ...], frame_step: int) -> Iterator[Tuple[str, int, np.ndarray]]:
+    for path in paths:
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            img = cv2.imread(path)
+            if img is not None:
+                yield path, 0, img
+            continue
+
+        cap = cv2.VideoCapture(path)
+        frame_index = 0
+
+        while True:
+            success, img = cap.read()
+            if not success:
+                break
+
+            if frame_index % frame_step == 0:
+                yield path, frame_index, img
+            frame_index += 1
+
+        cap.release()
+
+
+def _shard_path(parts_directory: str, unit: ExtractionUnit, options: str) -> str:
+    shard_id = hashlib.sha1(f"{unit.unit_id}\n{options}".encode()).hexdigest()
+    return os.path.join(parts_directory, f"{shard_id}.npz")
+
+
+def _save_shard(path: str, columns: Dict[str, np.ndarray]) -> None:
+    # Written under a temporary name, a shard that exists is always complete
+    tmp_path = f"{path[:-len('.npz')]}.tmp.npz"
+    np.savez(tmp_path, **columns)
+    os.replace(tmp_path, path)
+
+
+def _load_columns(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as columns:
+        return {name: columns[name] for name in columns.files}
+
+
+def _merge_columns(shards: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    if not shards:
+        return {
+            "target": np.empty(0, dtype=np.int8),
+            "hand_type": np.empty(0, dtype=np.int8),
+            "landmarks": np.empty((0, 21, 3), dtype=np.float32),
+            "source": np.empty(0, dtype=str),
+            "frame_index": np.empty(0, dtype=np.int32),
+        }
+
+    return {name: np.concatenate([shard[name] for shard in shards]) for name in shards[0]}
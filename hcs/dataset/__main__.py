@@ -0,0 +1,34 @@
+import time
+import argparse
+
+from hcs.dataset import extract_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - extract a gesture dataset")
+    parser.add_argument("data_directory", help="directory with files laid out as <GESTURE>/<HAND>/<image or video>")
+    parser.add_argument("output", help="dataset path, compressed NumPy (.npz) or Parquet (.parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes, all CPUs by default")
+    parser.add_argument("--chunk-size", type=int, default=64, help="number of images processed by one task")
+    parser.add_argument("--frame-step", type=int, default=1, help="process every n-th video frame")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.5,
+                        help="minimum hand detection confidence")
+    parser.add_argument("--no-flip", action="store_true", help="do not flip hand types, for mirrored input")
+    parser.add_argument("--restart", action="store_true", help="ignore progress of a previous run")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+
+    def progress(finished: int, total: int, samples: int) -> None:
+        print(f"\r{finished}/{total} units, {samples} new samples, {time.perf_counter() - start_time:.1f} s",
+              end="", flush=True)
+
+    samples = extract_dataset(args.data_directory, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                              frame_step=args.frame_step, min_detection_confidence=args.min_detection_confidence,
+                              flip_type=not args.no_flip, restart=args.restart, progress=progress)
+
+    print(f"\nSaved {samples} samples to {args.output} in {time.perf_counter() - start_time:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
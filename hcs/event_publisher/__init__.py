@@ -0,0 +1,371 @@
+import os
+import time
+import socket
+import threading
+import numpy as np
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from hcs.models import Hand, GestureClassificationResult
+
+# Unix domain socket path or UDP (host, port)
+Address = Union[str, Tuple[str, int]]
+
+# Record of one hand of a frame, little endian without padding, 278 bytes
+RECORD_DTYPE = np.dtype([
+    ("frame_id", "<u8"),
+    ("timestamp", "<f8"),
+    ("hand_type", "i1"),
+    ("score", "<f4"),
+    ("landmarks", "<f4", (21, 3)),
+    ("gesture_id", "i1"),
+    ("confidence", "<f4"),
+])
+
+# Header of a datagram: magic, format version, number of records and batch sequence number, 12 bytes
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("count", "<u2"),
+    ("sequence", "<u4"),
+])
+
+MAGIC = b"HCSE"
+VERSION = 1
+
+# Control datagrams sent by subscribers to the publisher
+SUBSCRIBE = b"HCSS"
+UNSUBSCRIBE = b"HCSU"
+
+# Gesture id of a hand without classification result
+NO_GESTURE = -1
+
+# Records per datagram, well below the 64 KiB datagram limit of UDP
+MAX_BATCH_RECORDS = 200
+
+
+def address_family(address: Address) -> int:
+    """
+    Args:
+        address (Address): Unix domain socket path or UDP (host, port).
+
+    Returns:
+        int: Socket address family.
+    """
+
+    return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+
+def parse_address(value: str) -> Address:
+    """
+    Args:
+        value (str): UDP host:port or Unix domain socket path.
+
+    Returns:
+        Address: UDP (host, port) or socket path.
+    """
+
+    host, separator, port = value.rpartition(":")
+
+    return (host or "127.0.0.1", int(port)) if separator and port.isdigit() else value
+
+
+def pack_records(frame_id: int, timestamp: float, hands: List[Hand],
+                 gesture_results: List[Optional[GestureClassificationResult]]) -> np.ndarray:
+    """
+    Pack the hands of a frame into records.
+
+    Args:
+        frame_id (int): Frame id.
+        timestamp (float): Capture time of the frame, Unix time in seconds.
+        hands (List[Hand]): Hands of the frame.
+        gesture_results (List[Optional[GestureClassificationResult]]): Classification result of every hand.
+
+    Returns:
+        numpy.ndarray: Records of RECORD_DTYPE.
+    """
+
+    records = np.empty(len(hands), dtype=RECORD_DTYPE)
+    records["frame_id"] = frame_id
+    records["timestamp"] = timestamp
+    records["hand_type"] = [hand.type.value for hand in hands]
+    records["score"] = [hand.score for hand in hands]
+    records["landmarks"] = [hand.landmarks for hand in hands]
+    records["gesture_id"] = [result.gesture_type.value if result is not None else NO_GESTURE
+                             for result in gesture_results]
+    records["confidence"] = [result.score if result is not None else 0.0 for result in gesture_results]
+
+    return records
+
+
+class EventPublisher:
+    """
+    Publishes the hands of every frame with their classified gestures to subscribers in other processes on the
+    machine, as datagrams of fixed-layout binary records (see RECORD_DTYPE) over a Unix domain socket or UDP.
+
+    The publisher binds address. Subscribers (see EventSubscriber) register by sending SUBSCRIBE datagrams to it,
+    repeated as a heartbeat, and are forgotten after subscriber_timeout without one, on UNSUBSCRIBE or when their
+    socket is gone.
+
+    publish only packs the records and queues them, a sender thread batches the records of max_batch_delay into
+    one datagram per subscriber. The sockets are non-blocking: when a subscriber does not keep up, its datagrams
+    are dropped by the kernel or counted in dropped_batches, and when the sender does not keep up, the oldest
+    queued frames are dropped, so the vision loop is never blocked.
+
+    Attributes:
+        address (Address): Address the publisher is bound to.
+        max_batch_records (int): Maximum number of records of a datagram.
+        max_batch_delay (float): Maximum time in seconds a record waits for more records.
+        subscriber_timeout (float): Time in seconds after which a subscriber without heartbeat is forgotten.
+        published_records (int): Number of records queued by publish.
+        sent_batches (int): Number of datagrams sent, counted per subscriber.
+        dropped_records (int): Number of records dropped because the queue was full.
+        dropped_batches (int): Number of datagrams not sent because a subscriber socket was full.
+        _queue_size (int): Maximum number of queued records.
+        _clock_offset (float): Difference of Unix time and time.perf_counter.
+        _socket (socket.socket): Non-blocking datagram socket.
+        _subscribers (Dict[Address, float]): Time of the last heartbeat of every subscriber.
+        _pending (Deque[numpy.ndarray]): Queued records of frames.
+        _pending_records (int): Number of queued records.
+        _first_pending_time (float): Time the oldest queued record has been published.
+        _sequence (int): Sequence number of the next datagram.
+        _datagram (bytearray): Preallocated datagram.
+        _header (numpy.ndarray): Header view of the datagram.
+        _records (numpy.ndarray): Records view of the datagram.
+        _condition (threading.Condition): Condition signalling queued records.
+        _stop_event (threading.Event): Event stopping the sender thread.
+        _thread (Optional[threading.Thread]): Sender thread.
+    """
+
+    def __init__(self, address: Address, max_batch_records: int = 64, max_batch_delay: float = 0.001,
+                 queue_size: int = 1024, subscriber_timeout: float = 5.0, send_buffer_size: int = 1 << 20):
+        """
+        Constructor.
+
+        Args:
+            address (Address): Unix domain socket path or UDP (host, port) to bind, e.g. ("127.0.0.1", 5555).
+            max_batch_records (int): Defaults to 64. Maximum number of records of a datagram, at most
+                MAX_BATCH_RECORDS.
+            max_batch_delay (float): Defaults to 0.001. Maximum time in seconds a record waits for more records.
+            queue_size (int): Defaults to 1024. Maximum number of queued records.
+            subscriber_timeout (float): Defaults to 5.0. Time in seconds after which a subscriber without heartbeat
+                is forgotten.
+            send_buffer_size (int): Defaults to 1 MiB. Size of the socket send buffer in bytes.
+        """
+
+        self.address: Address = address
+        self.max_batch_records: int = max(1, min(max_batch_records, MAX_BATCH_RECORDS))
+        self.max_batch_delay: float = max_batch_delay
+        self.subscriber_timeout: float = subscriber_timeout
+        self.published_records: int = 0
+        self.sent_batches: int = 0
+        self.dropped_records: int = 0
+        self.dropped_batches: int = 0
+
+        self._queue_size: int = max(queue_size, self.max_batch_records)
+        self._clock_offset: float = time.time() - time.perf_counter()
+
+        if isinstance(address, str) and os.path.exists(address):
+            # Left behind by a publisher that did not close
+            os.unlink(address)
+
+        self._socket: socket.socket = socket.socket(address_family(address), socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer_size)
+        self._socket.bind(address)
+        self._socket.setblocking(False)
+
+        self._subscribers: Dict[Address, float] = {}
+        self._pending: Deque[np.ndarray] = deque()
+        self._pending_records: int = 0
+        self._first_pending_time: float = 0.0
+        self._sequence: int = 0
+
+        self._datagram: bytearray = bytearray(HEADER_DTYPE.itemsize + self.max_batch_records * RECORD_DTYPE.itemsize)
+        self._header: np.ndarray = np.frombuffer(self._datagram, HEADER_DTYPE, count=1)
+        self._records: np.ndarray = np.frombuffer(self._datagram, RECORD_DTYPE, self.max_batch_records,
+                                                  HEADER_DTYPE.itemsize)
+        self._header["magic"] = MAGIC
+        self._header["version"] = VERSION
+
+        self._condition: threading.Condition = threading.Condition()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Returns:
+            int: Number of subscribers.
+        """
+
+        return len(self._subscribers)
+
+    def start(self) -> None:
+        """
+        Start the sender thread.
+        """
+
+        self._thread = threading.Thread(target=self._run, name="EventPublisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Send the queued records, stop the sender thread and close the socket.
+        """
+
+        self._stop_event.set()
+
+        with self._condition:
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self._socket.close()
+
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def publish(self, frame_id: int, timestamp: float, hands: List[Hand],
+                gesture_results: List[Optional[GestureClassificationResult]]) -> None:
+        """
+        Queue the hands of a frame. Never blocks, frames without hands and frames without subscribers are not
+        published.
+
+        Args:
+            frame_id (int): Frame id.
+            timestamp (float): Capture time of the frame, time.perf_counter based, sent as Unix time.
+            hands (List[Hand]): Hands of the frame.
+            gesture_results (List[Optional[GestureClassificationResult]]): Classification result of every hand.
+        """
+
+        if not hands or not self._subscribers:
+            return
+
+        records = pack_records(frame_id, timestamp + self._clock_offset, hands, gesture_results)
+
+        with self._condition:
+            if not self._pending:
+                self._first_pending_time = time.perf_counter()
+
+            self._pending.append(records)
+            self._pending_records += len(records)
+            self.published_records += len(records)
+
+            while self._pending_records > self._queue_size:
+                dropped = self._pending.popleft()
+                self._pending_records -= len(dropped)
+                self.dropped_records += len(dropped)
+
+            # The sender waits for the batch deadline of the first record or for a full batch
+            if len(self._pending) == 1 or self._pending_records >= self.max_batch_records:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        """
+        Sender thread loop.
+        """
+
+        while True:
+            with self._condition:
+                while not self._stop_event.is_set():
+                    now = time.perf_counter()
+
+                    if self._pending_records >= self.max_batch_records or (
+                            self._pending and now - self._first_pending_time >= self.max_batch_delay):
+                        break
+
+                    # Woken up by full batches, otherwise polls for the batch deadline and subscriptions
+                    timeout = self._first_pending_time + self.max_batch_delay - now if self._pending else 0.1
+                    self._condition.wait(timeout)
+                    self._receive_subscriptions()
+
+                if self._stop_event.is_set() and not self._pending:
+                    break
+
+                count = self._take_batch()
+
+            self._receive_subscriptions()
+            self._send(count)
+
+    def _take_batch(self) -> int:
+        """
+        Move queued records into the datagram. Called with the condition held.
+
+        Returns:
+            int: Number of records of the datagram.
+        """
+
+        count = 0
+
+        while self._pending and count + len(self._pending[0]) <= self.max_batch_records:
+            records = self._pending.popleft()
+            self._records[count:count + len(records)] = records
+            count += len(records)
+
+        if count == 0 and self._pending:
+            # More hands in one frame than a datagram holds, the rest is sent with the next datagram
+            records = self._pending[0]
+            self._records[:] = records[:self.max_batch_records]
+            self._pending[0] = records[self.max_batch_records:]
+            count = self.max_batch_records
+
+        self._pending_records -= count
+        self._first_pending_time = time.perf_counter()
+
+        return count
+
+    def _send(self, count: int) -> None:
+        """
+        Send the datagram to every subscriber.
+
+        Args:
+            count (int): Number of records of the datagram.
+        """
+
+        self._header["count"] = count
+        self._header["sequence"] = self._sequence
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+
+        datagram = memoryview(self._datagram)[:HEADER_DTYPE.itemsize + count * RECORD_DTYPE.itemsize]
+
+        for subscriber in list(self._subscribers):
+            try:
+                self._socket.sendto(datagram, subscriber)
+                self.sent_batches += 1
+            except (BlockingIOError, InterruptedError):
+                # The subscriber does not keep up
+                self.dropped_batches += 1
+            except OSError:
+                # ConnectionRefusedError, FileNotFoundError: the subscriber is gone
+                del self._subscribers[subscriber]
+
+    def _receive_subscriptions(self) -> None:
+        """
+        Handle the queued control datagrams of subscribers and forget the subscribers without heartbeat.
+        """
+
+        now = time.perf_counter()
+
+        while True:
+            try:
+                message, subscriber = self._socket.recvfrom(16)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # E.g. an ICMP port unreachable of a closed UDP subscriber
+                continue
+
+            if not subscriber:
+                # Unbound Unix socket, no address to send to
+                continue
+            if message == SUBSCRIBE:
+                self._subscribers[subscriber] = now
+            elif message == UNSUBSCRIBE:
+                self._subscribers.pop(subscriber, None)
+
+        for subscriber, heartbeat_time in list(self._subscribers.items()):
+            if now - heartbeat_time > self.subscriber_timeout:
+                del self._subscribers[subscriber]
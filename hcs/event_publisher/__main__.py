@@ -0,0 +1,43 @@
+import time
+import argparse
+
+from hcs.event_publisher import NO_GESTURE, parse_address
+from hcs.event_publisher.subscriber import EventSubscriber
+from hcs.models import GestureType, HandType
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - reference subscriber of published events")
+    parser.add_argument("address", help="publisher address, UDP host:port or Unix domain socket path")
+    parser.add_argument("--summary", action="store_true",
+                        help="print received records per second instead of every record")
+    args = parser.parse_args()
+
+    subscriber = EventSubscriber(parse_address(args.address))
+    report_time, report_records = time.perf_counter(), 0
+
+    try:
+        for records in subscriber:
+            if not args.summary:
+                for record in records:
+                    gesture = GestureType(record["gesture_id"]).name if record["gesture_id"] != NO_GESTURE else "-"
+                    latency = (time.time() - record["timestamp"]) * 1000
+                    print(f"frame {record['frame_id']}: {HandType(record['hand_type']).name} hand "
+                          f"(score {record['score']:.2f}), gesture {gesture} ({record['confidence']:.2f}), "
+                          f"index tip ({record['landmarks'][8, 0]:.0f}, {record['landmarks'][8, 1]:.0f}), "
+                          f"latency {latency:.1f} ms")
+                continue
+
+            now = time.perf_counter()
+            if now - report_time >= 1.0:
+                print(f"{(subscriber.received_records - report_records) / (now - report_time):.0f} records/s, "
+                      f"{subscriber.lost_batches} batches lost")
+                report_time, report_records = now, subscriber.received_records
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+
+
+if __name__ == '__main__':
+    main()
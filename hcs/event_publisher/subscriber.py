@@ -0,0 +1,177 @@
+import os
+import time
+import socket
+import tempfile
+import numpy as np
+
+from typing import Iterator, Optional
+
+from hcs.event_publisher import Address, HEADER_DTYPE, MAGIC, RECORD_DTYPE, SUBSCRIBE, UNSUBSCRIBE, VERSION, \
+    address_family
+
+
+class EventSubscriber:
+    """
+    Reference subscriber of an EventPublisher. Receives the datagrams of the publisher and returns their records
+    as NumPy structured arrays of RECORD_DTYPE, zero-copy views of the received datagram. Lost datagrams, e.g.
+    dropped because the subscriber did not keep up, are detected from the batch sequence numbers.
+
+    Attributes:
+        publisher_address (Address): Address of the publisher.
+        address (Address): Address the subscriber is bound to.
+        heartbeat_interval (float): Time in seconds between subscriptions sent to the publisher.
+        received_batches (int): Number of received datagrams.
+        received_records (int): Number of received records.
+        lost_batches (int): Number of datagrams missing in the sequence.
+        invalid_batches (int): Number of received datagrams of another format.
+        _socket (socket.socket): Datagram socket.
+        _next_sequence (Optional[int]): Expected sequence number of the next datagram.
+        _last_heartbeat (float): Time the last subscription has been sent.
+    """
+
+    def __init__(self, publisher_address: Address, address: Optional[Address] = None, heartbeat_interval: float = 1.0,
+                 receive_buffer_size: int = 4 << 20):
+        """
+        Constructor.
+
+        Args:
+            publisher_address (Address): Unix domain socket path or UDP (host, port) of the publisher.
+            address (Optional[Address]): Defaults to None. Address to bind, a temporary socket path or a free local
+                UDP port when None.
+            heartbeat_interval (float): Defaults to 1.0. Time in seconds between subscriptions sent to the publisher,
+                shorter than its subscriber_timeout.
+            receive_buffer_size (int): Defaults to 4 MiB. Size of the socket receive buffer in bytes, absorbs
+                bursts while the subscriber is busy.
+        """
+
+        family = address_family(publisher_address)
+
+        if address is None:
+            address = os.path.join(tempfile.gettempdir(), f"hcs-subscriber-{os.getpid()}-{id(self)}.sock") \
+                if family == socket.AF_UNIX else ("127.0.0.1", 0)
+
+        self.publisher_address: Address = publisher_address
+        self.heartbeat_interval: float = heartbeat_interval
+        self.received_batches: int = 0
+        self.received_records: int = 0
+        self.lost_batches: int = 0
+        self.invalid_batches: int = 0
+
+        self._socket: socket.socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
+        self._socket.bind(address)
+        self.address: Address = self._socket.getsockname()
+
+        self._next_sequence: Optional[int] = None
+        self._last_heartbeat: float = 0.0
+
+        self._subscribe()
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Receive the records of the next datagram.
+
+        Args:
+            timeout (Optional[float]): Defaults to None. Maximum time in seconds to wait.
+
+        Returns:
+            Optional[numpy.ndarray]: Read-only records of RECORD_DTYPE or None when the timeout expired.
+        """
+
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+
+        while True:
+            now = time.perf_counter()
+            if now - self._last_heartbeat >= self.heartbeat_interval:
+                self._subscribe()
+
+            # Wakes up for the heartbeat even without datagrams
+            wait = self.heartbeat_interval - (now - self._last_heartbeat)
+            if deadline is not None:
+                if now >= deadline:
+                    return None
+                wait = min(wait, deadline - now)
+
+            self._socket.settimeout(max(wait, 0.001))
+
+            try:
+                datagram = self._socket.recv(65536)
+            except socket.timeout:
+                continue
+
+            records = self._parse(datagram)
+            if records is not None:
+                return records
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """
+        Returns:
+            Iterator[numpy.ndarray]: Records of every received datagram, until the subscriber is closed.
+        """
+
+        while self._socket.fileno() >= 0:
+            yield self.receive()
+
+    def close(self) -> None:
+        """
+        Unsubscribe and close the socket.
+        """
+
+        try:
+            self._socket.sendto(UNSUBSCRIBE, self.publisher_address)
+        except OSError:
+            # The publisher is gone
+            pass
+
+        self._socket.close()
+
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _subscribe(self) -> None:
+        """
+        Send a subscription to the publisher.
+        """
+
+        self._last_heartbeat = time.perf_counter()
+
+        try:
+            self._socket.sendto(SUBSCRIBE, self.publisher_address)
+        except OSError:
+            # The publisher is not running yet, the next heartbeat retries
+            pass
+
+    def _parse(self, datagram: bytes) -> Optional[np.ndarray]:
+        """
+        Args:
+            datagram (bytes): Received datagram.
+
+        Returns:
+            Optional[numpy.ndarray]: Records of the datagram or None when it is not a datagram of the publisher.
+        """
+
+        if len(datagram) < HEADER_DTYPE.itemsize:
+            self.invalid_batches += 1
+            return None
+
+        header = np.frombuffer(datagram, HEADER_DTYPE, count=1)[0]
+        count = int(header["count"])
+
+        if header["magic"] != MAGIC or header["version"] != VERSION or \
+                len(datagram) != HEADER_DTYPE.itemsize + count * RECORD_DTYPE.itemsize:
+            self.invalid_batches += 1
+            return None
+
+        sequence = int(header["sequence"])
+        if self._next_sequence is not None:
+            gap = (sequence - self._next_sequence) & 0xFFFFFFFF
+
+            # A restarted publisher starts over
+            if gap < 1 << 31:
+                self.lost_batches += gap
+        self._next_sequence = (sequence + 1) & 0xFFFFFFFF
+
+        self.received_batches += 1
+        self.received_records += count
+
+        return np.frombuffer(datagram, RECORD_DTYPE, count, HEADER_DTYPE.itemsize)
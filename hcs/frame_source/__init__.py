@@ -0,0 +1,296 @@
+import os
+import time
+import cv2
+import numpy as np
+
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Sequence, Tuple
+
+from hcs.models import Frame, Hand, HandType
+from hcs.models.hand import BorderBox
+
+
+class FrameSource(ABC):
+    """
+    Source of video frames with the same API as CameraVideoCapture, so the system can run on recorded input.
+
+    Attributes:
+        cam_width (int): Frame width.
+        cam_height (int): Frame height.
+        _frame_counter (int): Number of frames read so far, used as frame id.
+    """
+
+    def __init__(self, cam_width: int, cam_height: int):
+        """
+        Constructor.
+
+        Args:
+            cam_width (int): Frame width.
+            cam_height (int): Frame height.
+        """
+
+        self.cam_width: int = cam_width
+        self.cam_height: int = cam_height
+
+        self._frame_counter: int = 0
+
+    def read(self, image: Any = None) -> Tuple[bool, Any]:
+        """
+        Returns the next video frame.
+
+        Args:
+            image (Any): Defaults to None. Unused, kept for compatibility with CameraVideoCapture.
+
+        Returns:
+            Tuple[bool, Any]: return value which is 'False' no frames has been grabbed, and grabbed frame
+        """
+
+        frame = self.read_frame()
+
+        if frame is None:
+            return False, image
+
+        return True, frame.image
+
+    def read_frame(self) -> Optional[Frame]:
+        """
+        Returns the next video frame with its id and timestamp.
+
+        Returns:
+            Optional[Frame]: The next frame or None when the source is exhausted.
+        """
+
+        image = self._next_image()
+
+        if image is None:
+            return None
+
+        frame = Frame(self._frame_counter, time.perf_counter(), image)
+        self._frame_counter += 1
+
+        return frame
+
+    @abstractmethod
+    def is_opened(self) -> bool:
+        """
+        Returns:
+            bool: True while the source can deliver frames.
+        """
+
+    def release(self) -> None:
+        """
+        Release resources of the source.
+        """
+
+    @abstractmethod
+    def _next_image(self) -> Optional[Any]:
+        """
+        Returns:
+            Optional[Any]: The next BGR image or None when the source is exhausted.
+        """
+
+
+class VideoFileSource(FrameSource):
+    """
+    Frames read from a video file.
+
+    Attributes:
+        path (str): Path to the video file.
+        loop (bool): Flag to start over when the end of the file is reached.
+        cap (cv2.VideoCapture): VideoCapture instance.
+    """
+
+    def __init__(self, path: str, loop: bool = False):
+        """
+        Constructor.
+
+        Args:
+            path (str): Path to the video file.
+            loop (bool): Defaults to False. Flag to start over when the end of the file is reached.
+        """
+
+        self.path: str = path
+        self.loop: bool = loop
+        self.cap: cv2.VideoCapture = cv2.VideoCapture(path)
+
+        super().__init__(int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def is_opened(self) -> bool:
+        return self.cap.isOpened()
+
+    def release(self) -> None:
+        self.cap.release()
+
+    def _next_image(self) -> Optional[Any]:
+        success, image = self.cap.read()
+
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self.cap.read()
+
+        if not success:
+            self.cap.release()
+            return None
+
+        return image
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    Frames read from the image files of a directory in name order.
+
+    Attributes:
+        IMAGE_EXTENSIONS (Tuple[str, ...]): Extensions of the image files read.
+        paths (List[str]): Paths to the image files.
+        loop (bool): Flag to start over when all images have been read.
+        _index (int): Index of the next image.
+    """
+
+    IMAGE_EXTENSIONS: Tuple[str, ...] = (".jpg", ".jpeg", ".png", ".bmp")
+
+    def __init__(self, directory: str, loop: bool = False):
+        """
+        Constructor.
+
+        Args:
+            directory (str): Directory with the images.
+            loop (bool): Defaults to False. Flag to start over when all images have been read.
+        """
+
+        self.paths: List[str] = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(self.IMAGE_EXTENSIONS)
+        )
+        self.loop: bool = loop
+        self._index: int = 0
+
+        first_image = cv2.imread(self.paths[0]) if self.paths else None
+        height, width = first_image.shape[:2] if first_image is not None else (0, 0)
+
+        super().__init__(width, height)
+
+    def is_opened(self) -> bool:
+        return self._index < len(self.paths)
+
+    def _next_image(self) -> Optional[Any]:
+        if self._index >= len(self.paths):
+            return None
+
+        image = cv2.imread(self.paths[self._index])
+        self._index += 1
+
+        if self.loop and self._index >= len(self.paths):
+            self._index = 0
+
+        return image
+
+
+class RecordedLandmarksSource(FrameSource):
+    """
+    Hands recorded earlier, replayed without images. Detection is skipped: read_hands returns the recorded hands of
+    the next frame, read_frame returns a black frame for code that needs an image.
+
+    The recording is a .npz file with the arrays:
+        * frame_width, frame_height - frame size
+        * frame_index (M,) - index of the frame every hand belongs to
+        * frames_number - number of frames, frames without hands included
+        * landmarks (M, 21, 3), border_box (M, 4), hand_type (M,), score (M,) - hands information
+
+    Attributes:
+        loop (bool): Flag to start over when all frames have been read.
+        frames_number (int): Number of recorded frames.
+        _hands (List[List[Hand]]): Recorded hands of every frame.
+        _index (int): Index of the next frame.
+        _blank_image (Optional[numpy.ndarray]): Black frame returned by read_frame.
+    """
+
+    def __init__(self, path: str, loop: bool = False):
+        """
+        Constructor.
+
+        Args:
+            path (str): Path to the recording.
+            loop (bool): Defaults to False. Flag to start over when all frames have been read.
+        """
+
+        with np.load(path) as recording:
+            super().__init__(int(recording["frame_width"]), int(recording["frame_height"]))
+
+            self.frames_number: int = int(recording["frames_number"])
+            self._hands: List[List[Hand]] = [[] for _ in range(self.frames_number)]
+
+            for frame_index, landmarks, border_box, hand_type, score in zip(
+                    recording["frame_index"], recording["landmarks"], recording["border_box"],
+                    recording["hand_type"], recording["score"]):
+                hand = Hand()
+                hand.landmarks = landmarks.astype(np.float32)
+                hand.border_box = BorderBox(*(int(value) for value in border_box))
+                hand.center = (hand.border_box.x + hand.border_box.width // 2,
+                               hand.border_box.y + hand.border_box.height // 2)
+                hand.score = float(score)
+                hand.type = HandType(int(hand_type))
+
+                self._hands[int(frame_index)].append(hand)
+
+        self.loop: bool = loop
+        self._index: int = 0
+        self._blank_image: Optional[np.ndarray] = None
+
+    @staticmethod
+    def save(path: str, frames_hands: Sequence[List[Hand]], frame_width: int, frame_height: int) -> None:
+        """
+        Save hands of consecutive frames as a recording.
+
+        Args:
+            path (str): Path to the recording.
+            frames_hands (Sequence[List[Hand]]): Hands of every frame.
+            frame_width (int): Frame width.
+            frame_height (int): Frame height.
+        """
+
+        hands = [(frame_index, hand) for frame_index, frame_hands in enumerate(frames_hands) for hand in frame_hands]
+
+        np.savez_compressed(
+            path,
+            frame_width=frame_width,
+            frame_height=frame_height,
+            frames_number=len(frames_hands),
+            frame_index=np.array([frame_index for frame_index, _ in hands], dtype=np.int64),
+            landmarks=np.array([hand.landmarks for _, hand in hands], dtype=np.float32).reshape(-1, 21, 3),
+            border_box=np.array([tuple(hand.border_box) for _, hand in hands], dtype=np.int32).reshape(-1, 4),
+            hand_type=np.array([hand.type.value for _, hand in hands], dtype=np.int8),
+            score=np.array([hand.score for _, hand in hands], dtype=np.float32),
+        )
+
+    def read_hands(self) -> Optional[Tuple[Frame, List[Hand]]]:
+        """
+        Returns the recorded hands of the next frame.
+
+        Returns:
+            Optional[Tuple[Frame, List[Hand]]]: Frame and its hands or None when the recording is exhausted.
+        """
+
+        index = self._index
+        frame = self.read_frame()
+
+        if frame is None:
+            return None
+
+        return frame, self._hands[index]
+
+    def is_opened(self) -> bool:
+        return self._index < self.frames_number
+
+    def _next_image(self) -> Optional[Any]:
+        if self._index >= self.frames_number:
+            return None
+
+        self._index += 1
+
+        if self.loop and self._index >= self.frames_number:
+            self._index = 0
+
+        if self._blank_image is None:
+            self._blank_image = np.zeros((self.cam_height, self.cam_width, 3), dtype=np.uint8)
+
+        return self._blank_image
@@ -1,9 +1,14 @@
+import time
 import cv2
-import mediapipe as mp
-from typing import List, Any, Tuple, Union, NamedTuple, Optional
+import numpy as np
+from itertools import chain
+from typing import Dict, List, Any, Tuple, Union, NamedTuple, Optional
 
 import hcs.utils.draw_utils as du
+import hcs.utils.hand_utils as hu
 
+from hcs.hand_tracker import LandmarkTracker
+from hcs.metrics import Metrics
 from hcs.models import Hand, HandType
 
 
@@ -12,20 +17,65 @@ class HandDetector:
     Finds hands using mediapipe library. Exports the landmarks in pixel format. Adds extra functionalities like
     finding how many fingers are up. Also provides bounding box info of the hand found.
 
+    With detection_interval greater than 1 the full detection runs every few frames, or sooner when the share of
+    landmarks tracked with optical flow drops below min_tracked_share, and the landmarks are tracked with optical
+    flow in between.
+
+    With roi_margin set the detection input is cropped to a window around the previously found hands and with
+    inference_size set it is downscaled, landmarks are mapped back to full-frame pixel coordinates. When hands are
+    lost, and every roi_refresh_interval frames to find new hands, the full frame is processed again. The window is
+    tracked by a separate video mode graph per number of hands, which looks for no more hands than were found, so
+    MediaPipe does not run the palm detection on every frame while fewer than max_num_hands are visible. The graph
+    tracks hand regions in normalized coordinates of its input, so the window stays in place while it contains the
+    hands and moving it restarts the graph.
+
+    With reuse_buffers enabled the RGB conversion writes into a preallocated buffer and landmarks are
+    converted and scaled in reusable NumPy arrays, so a frame allocates only one landmarks array for all hands.
+
+    With metrics set the color_conversion, mediapipe, landmark_postprocessing and tracking stage times are recorded.
+
     Attributes:
         static_image_mode (bool): In static mode, detection is done on each image: slower.
         max_num_hands (int): Maximum number of hands detected.
         min_detection_confidence (float): Minimum Detection Confidence Threshold.
         min_tracking_confidence (float): Minimum Tracking Confidence Threshold.
+        reuse_buffers (bool): Flag optimized mode reusing preallocated buffers.
+        detection_interval (int): Maximum number of frames between full detections.
+        adaptive_interval (bool): Flag to shorten the detection interval when hands move fast.
+        min_tracked_share (float): Minimum share of landmarks of every hand tracked by optical flow between full
+            detections.
+        reference_motion_speed (float): Hand motion speed in pixels per frame still tracked for the whole interval.
+        roi_margin (Optional[float]): Margin around the previously found hands used to crop the detection input.
+        roi_refresh_interval (int): Number of frames after which the full frame is processed again.
+        inference_size (Optional[Tuple[int, int]]): Maximum width and height of the detection input.
+        metrics (Optional[Metrics]): Metrics the stage times are recorded to.
+        roi_frames (int): Number of detections that processed a cropped region instead of the full frame.
+        roi_moves (int): Number of times the window moved, restarting its MediaPipe graph.
+        detected_frames (int): Number of frames processed by the full detection.
+        tracked_frames (int): Number of frames processed by the landmark tracker.
         mp_hands (mediapipe.python.solutions.hands): MediaPipe Hands tools.
         hands (mediapipe.python.solutions.hands.Hands): Instance attribute hands of hand_detector.HandDetector.
         mp_draw (mediapipe.python.solutions.drawing_utils): MediaPipe solution drawing utils.
         tip_ids (List[int]): List of tips id.
         results (Optional[NamedTuple]): Instance attribute results of hand_detector.HandDetector.
+        _rgb_buffer (Optional[numpy.ndarray]): Preallocated flat RGB image buffer.
+        _landmarks_buffer (numpy.ndarray): Reusable buffer for landmarks scaled to pixels.
+        _tracker (LandmarkTracker): Landmark tracker used between full detections.
+        _current_interval (int): Current number of frames between full detections.
+        _frames_since_detection (int): Number of frames processed since the last full detection.
+        _prev_hands (List[Hand]): Hands found by the last detection, used to select the region of interest.
+        _frames_since_full_frame (int): Number of detections since the full frame was processed.
+        _region (Optional[Tuple[int, int, int, int]]): Window around the hands, None before the first one.
+        _roi_hands (Dict[int, mediapipe.python.solutions.hands.Hands]): MediaPipe Hands of the window by number of
+            hands.
+        _roi_hands_regions (Dict[int, Tuple[int, int, int, int]]): Window last processed by every graph.
     """
 
     def __init__(self, static_image_mode: bool = False, max_num_hands: int = 2, min_detection_confidence: float = 0.5,
-                 min_tracking_confidence: float = 0.5):
+                 min_tracking_confidence: float = 0.5, reuse_buffers: bool = False, detection_interval: int = 1,
+                 adaptive_interval: bool = True, reference_motion_speed: float = 4.0, min_tracked_share: float = 0.5,
+                 roi_margin: Optional[float] = None, roi_refresh_interval: int = 30,
+                 inference_size: Optional[Tuple[int, int]] = None, metrics: Optional[Metrics] = None):
         """
         Constructor.
 
@@ -34,12 +84,43 @@ class HandDetector:
             max_num_hands (int): Defaults to 2. Maximum number of hands detected.
             min_detection_confidence (float): Defaults to 0.5. Minimum Detection Confidence Threshold.
             min_tracking_confidence (float): Defaults to 0.5. Minimum Tracking Confidence Threshold.
+            reuse_buffers (bool): Defaults to False. Flag optimized mode reusing preallocated buffers.
+            detection_interval (int): Defaults to 1. Maximum number of frames between full detections, 1 runs the
+                full detection on every frame.
+            adaptive_interval (bool): Defaults to True. Flag to shorten the detection interval when hands move fast.
+            reference_motion_speed (float): Defaults to 4.0. Hand motion speed in pixels per frame still tracked for
+                the whole interval.
+            min_tracked_share (float): Defaults to 0.5. Minimum share of landmarks of every hand tracked by optical
+                flow, the full detection runs sooner below it. Independent of the MediaPipe min_tracking_confidence.
+            roi_margin (Optional[float]): Defaults to None. Margin added around the previously found hands, as a
+                fraction of the hand border box size, to crop the detection input. ROI cropping is disabled when None.
+            roi_refresh_interval (int): Defaults to 30. Number of frames after which the full frame is processed
+                again to find new hands.
+            inference_size (Optional[Tuple[int, int]]): Defaults to None. Maximum width and height of the detection
+                input, larger inputs are downscaled keeping the aspect ratio.
+            metrics (Optional[Metrics]): Defaults to None. Metrics the stage times are recorded to.
         """
 
         self.static_image_mode: bool = static_image_mode
         self.max_num_hands: int = max_num_hands
         self.min_detection_confidence: float = min_detection_confidence
         self.min_tracking_confidence: float = min_tracking_confidence
+        self.reuse_buffers: bool = reuse_buffers
+        self.detection_interval: int = detection_interval
+        self.adaptive_interval: bool = adaptive_interval
+        self.reference_motion_speed: float = reference_motion_speed
+        self.min_tracked_share: float = min_tracked_share
+        self.roi_margin: Optional[float] = roi_margin
+        self.roi_refresh_interval: int = roi_refresh_interval
+        self.inference_size: Optional[Tuple[int, int]] = inference_size
+        self.metrics: Optional[Metrics] = metrics
+        self.detected_frames: int = 0
+        self.tracked_frames: int = 0
+        self.roi_frames: int = 0
+        self.roi_moves: int = 0
+
+        # Imported on construction, so the import can overlap with the initialization of other components
+        import mediapipe as mp
 
         self.mp_hands = mp.solutions.hands
         self.hands: mp.solutions.hands.Hands = self.mp_hands.Hands(self.static_image_mode, self.max_num_hands,
@@ -50,9 +131,24 @@ class HandDetector:
         self.tip_ids: List[int] = [4, 8, 12, 16, 20]
         self.results: Optional[NamedTuple] = None
 
+        self._rgb_buffer: Optional[np.ndarray] = None
+        self._landmarks_buffer: np.ndarray = np.empty((21, 3), dtype=np.float64)
+
+        self._tracker: LandmarkTracker = LandmarkTracker()
+        self._current_interval: int = detection_interval
+        self._frames_since_detection: int = 0
+        self._prev_hands: List[Hand] = []
+        self._frames_since_full_frame: int = 0
+        self._region: Optional[Tuple[int, int, int, int]] = None
+        self._roi_hands: Dict[int, Any] = {}
+        self._roi_hands_regions: Dict[int, Tuple[int, int, int, int]] = {}
+
     def find_hands(self, img, draw=True, flip_type=True) -> Union[Tuple[List[Hand], Any], List[Hand]]:
         """
         Find hands in a BGR image.
+        With detection_interval greater than 1 the full detection runs only every few frames and the frames in
+        between are handled by the landmark tracker, as long as the share of tracked landmarks stays at least
+        min_tracked_share.
 
         Args:
             img (Any): Image to find the hands in.
@@ -63,36 +159,281 @@ class HandDetector:
             Union[Tuple[List[Hand], Any], List[Hand]]: Hands info with or without Image with drawings.
         """
 
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results: NamedTuple = self.hands.process(img_rgb)
+        if self.detection_interval <= 1:
+            all_hands = self._detect_hands(img, draw, flip_type)
+            self.detected_frames += 1
+        else:
+            all_hands = self._find_hands_scheduled(img, draw, flip_type)
+
+        if draw:
+            return all_hands, img
+        else:
+            return all_hands
+
+    def warm_up(self, width: int = 1280, height: int = 720) -> None:
+        """
+        Run the MediaPipe Hands graphs, of the window too in ROI mode, on a black frame, so the first real frame does
+        not pay for the lazy initialization of the graphs and the buffers. Counters, tracking state and metrics are
+        not touched.
+
+        Args:
+            width (int): Defaults to 1280. Frame width.
+            height (int): Defaults to 720. Frame height.
+        """
+
+        img = np.zeros((height, width, 3), dtype=np.uint8)
+        self.hands.process(self._convert_to_rgb(img))
+
+        if self.roi_margin is not None:
+            for num_hands in range(1, self.max_num_hands + 1):
+                self._roi_graph(num_hands, (0, 0, width, height)).process(self._convert_to_rgb(img))
+
+            # A black frame leaves nothing to track, the first window does not restart the graphs
+            self._roi_hands_regions.clear()
+
+        self.results = None
+
+    @property
+    def detection_ratio(self) -> float:
+        """
+        Returns:
+            float: Share of frames processed by the full detection, the rest was handled by tracking.
+        """
+
+        frames = self.detected_frames + self.tracked_frames
+
+        return self.detected_frames / frames if frames else 0.0
+
+    def _find_hands_scheduled(self, img: Any, draw: bool, flip_type: bool) -> List[Hand]:
+        """
+        Find hands running the full detection every few frames and tracking landmarks in between.
+        The interval between detections shrinks when hands move fast.
+
+        Args:
+            img (Any): Image to find the hands in.
+            draw (bool): Flag to draw the output on the image.
+            flip_type (bool): Flag to flip hands type.
+
+        Returns:
+            List[Hand]: Hands info.
+        """
+
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        if self._tracker.has_hands and self._frames_since_detection < self._current_interval:
+            start_time = time.perf_counter()
+            all_hands, confidence = self._tracker.track(gray)
+
+            if self.metrics is not None:
+                self.metrics.record("tracking", time.perf_counter() - start_time)
+
+            if confidence >= self.min_tracked_share:
+                self._frames_since_detection += 1
+                self.tracked_frames += 1
+
+                if self.adaptive_interval:
+                    self._adapt_interval(self._tracker.motion_speed)
+
+                if draw:
+                    for hand in all_hands:
+                        du.draw_hand_landmarks(img, hand.landmarks)
+                        du.draw_border_box(img, hand.border_box)
+                        du.draw_hand_info(img, hand)
+
+                return all_hands
+
+        all_hands = self._detect_hands(img, draw, flip_type)
+        self.detected_frames += 1
+
+        self._tracker.reset(gray, all_hands)
+        self._frames_since_detection = 1
+
+        return all_hands
+
+    def _adapt_interval(self, motion_speed: float) -> None:
+        """
+        Adapt the interval between full detections to the hand motion speed: slow hands are tracked for up to
+        detection_interval frames, fast hands are detected more often.
+
+        Args:
+            motion_speed (float): Mean landmark displacement in pixels per frame.
+        """
+
+        interval = self.detection_interval * self.reference_motion_speed / max(motion_speed, 1e-6)
+        self._current_interval = int(np.clip(interval, 1, self.detection_interval))
+
+    def _detect_hands(self, img: Any, draw: bool, flip_type: bool) -> List[Hand]:
+        """
+        Find hands in a BGR image with the full MediaPipe Hands graph. In ROI mode only the window around the
+        previously found hands is processed, falling back to the full frame when fewer hands are found. On a refresh
+        the full frame is processed and the window only when the full frame has fewer hands.
+
+        Args:
+            img (Any): Image to find the hands in.
+            draw (bool): Flag to draw the output on the image.
+            flip_type (bool): Flag to flip hands type.
+
+        Returns:
+            List[Hand]: Hands info.
+        """
 
-        all_hands: List[Hand] = []
         h, w, c = img.shape
+        window = self._select_window(w, h)
+        refresh = window is None or self._frames_since_full_frame >= self.roi_refresh_interval
+
+        all_hands: List[Hand] = []
+
+        if refresh:
+            self._frames_since_full_frame = 0
+            all_hands = self._detect_hands_in_region(img, (0, 0, w, h), self.hands, draw, flip_type)
+
+        # Hands the full frame detection missed are still tracked in the window
+        if window is not None and len(all_hands) < len(self._prev_hands):
+            self.roi_frames += 1
+            self._frames_since_full_frame += 1
+            self._region = window
+
+            all_hands = self._detect_hands_in_region(img, window, self._roi_graph(len(self._prev_hands), window),
+                                                     draw, flip_type)
+
+            # Tracking lost, look for the hands in the full frame
+            if len(all_hands) < len(self._prev_hands) and not refresh:
+                self._frames_since_full_frame = 0
+                all_hands = self._detect_hands_in_region(img, (0, 0, w, h), self.hands, draw, flip_type)
+
+        self._prev_hands = all_hands
+
+        return all_hands
+
+    def _select_window(self, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Select the window processed by the detection: the window of the last detection while it contains the
+        previous hand border boxes, otherwise their union expanded by the margin.
+
+        Args:
+            width (int): Image width.
+            height (int): Image height.
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: Window corners x_min, y_min, x_max, y_max, None without ROI cropping
+                or previously found hands.
+        """
+
+        if self.roi_margin is None or not self._prev_hands:
+            return None
+
+        boxes = np.array([hand.border_box for hand in self._prev_hands])
+        x_min, y_min = int(boxes[:, 0].min()), int(boxes[:, 1].min())
+        x_max, y_max = int((boxes[:, 0] + boxes[:, 2]).max()), int((boxes[:, 1] + boxes[:, 3]).max())
+
+        # Moving the window restarts its graph, it is kept while the hands are inside
+        if self._region is not None and self._region[0] <= x_min and self._region[1] <= y_min and \
+                x_max <= self._region[2] and y_max <= self._region[3]:
+            return self._region
+
+        margin = int(boxes[:, 2:].max() * self.roi_margin)
+
+        x_min, y_min = max(0, x_min - margin), max(0, y_min - margin)
+        x_max, y_max = min(width, x_max + margin), min(height, y_max + margin)
+
+        if x_max <= x_min or y_max <= y_min:
+            return None
+
+        return x_min, y_min, x_max, y_max
+
+    def _roi_graph(self, num_hands: int, region: Tuple[int, int, int, int]) -> Any:
+        """
+        Get the MediaPipe Hands tracking the hands in the window, created on first use and restarted when the window
+        has moved since it last ran.
+
+        Args:
+            num_hands (int): Number of hands in the window, the maximum number of hands of the graph.
+            region (Tuple[int, int, int, int]): Window corners x_min, y_min, x_max, y_max.
+
+        Returns:
+            mediapipe.python.solutions.hands.Hands: MediaPipe Hands of the window.
+        """
+
+        hands = self._roi_hands.get(num_hands)
+
+        if hands is None:
+            hands = self._roi_hands[num_hands] = self.mp_hands.Hands(self.static_image_mode, num_hands,
+                                                                     self.min_detection_confidence,
+                                                                     self.min_tracking_confidence)
+        elif self._roi_hands_regions.get(num_hands, region) != region and not self.static_image_mode:
+            # Tracked hand regions are normalized to the previous window, they would be misplaced in another one
+            hands.reset()
+            self.roi_moves += 1
+
+        self._roi_hands_regions[num_hands] = region
+
+        return hands
+
+    def _detect_hands_in_region(self, img: Any, region: Tuple[int, int, int, int], hands: Any, draw: bool,
+                                flip_type: bool) -> List[Hand]:
+        """
+        Run MediaPipe Hands on a region of the image, downscaled to the inference size, and map the landmarks back
+        to full-frame pixel coordinates.
+
+        Args:
+            img (Any): Image to find the hands in.
+            region (Tuple[int, int, int, int]): Region corners x_min, y_min, x_max, y_max.
+            hands (mediapipe.python.solutions.hands.Hands): MediaPipe Hands processing the region.
+            draw (bool): Flag to draw the output on the image.
+            flip_type (bool): Flag to flip hands type.
+
+        Returns:
+            List[Hand]: Hands info.
+        """
+
+        x_offset, y_offset, x_max, y_max = region
+        w, h = x_max - x_offset, y_max - y_offset
+        full_frame = (w, h) == (img.shape[1], img.shape[0])
+
+        input_img = img if full_frame else img[y_offset:y_max, x_offset:x_max]
+
+        # Color conversion time includes the downscale
+        start_time = time.perf_counter()
+
+        if self.inference_size is not None:
+            scale = min(1.0, self.inference_size[0] / w, self.inference_size[1] / h)
+
+            if scale < 1.0:
+                input_img = cv2.resize(input_img, (max(1, int(w * scale)), max(1, int(h * scale))),
+                                       interpolation=cv2.INTER_AREA)
+
+        img_rgb = self._convert_to_rgb(input_img)
+        converted_time = time.perf_counter()
+
+        self.results: NamedTuple = hands.process(img_rgb)
+        processed_time = time.perf_counter()
+
+        all_hands: List[Hand] = []
 
         if self.results.multi_hand_landmarks:
-            for hand_info, hand_landmarks in zip(self.results.multi_handedness, self.results.multi_hand_landmarks):
+            multi_hand_landmarks = self.results.multi_hand_landmarks
+
+            # One array for all hands of the frame, every hand gets a view of it
+            all_landmarks = np.empty((len(multi_hand_landmarks), 21, 3), dtype=np.float32)
+
+            for index, (hand_info, hand_landmarks) in enumerate(zip(self.results.multi_handedness,
+                                                                    multi_hand_landmarks)):
                 hand = Hand()
-                hand_landmarks_list = []
-
-                x_list = []
-                y_list = []
-
-                for _, landmark in enumerate(hand_landmarks.landmark):
-                    px, py, pz = int(landmark.x * w), int(landmark.y * h), landmark.z
-                    hand_landmarks_list.append([px, py, pz])
-                    x_list.append(px)
-                    y_list.append(py)
-
-                # Border box
-                x_min, x_max = min(x_list) - 20, max(x_list) + 20
-                y_min, y_max = min(y_list) - 20, max(y_list) + 20
-                box_width, box_height = x_max - x_min, y_max - y_min
-                border_box = x_min, y_min, box_width, box_height
-                center_x, center_y = border_box[0] + (border_box[2] // 2), border_box[1] + (border_box[3] // 2)
-
-                hand.landmarks = hand_landmarks_list
-                hand.border_box = border_box
-                hand.center = (center_x, center_y)
+                landmarks = all_landmarks[index]
+
+                # Normalized landmarks are relative to the region, not to the downscaled input
+                if self.reuse_buffers:
+                    self._scale_landmarks(hand_landmarks, w, h, landmarks)
+                else:
+                    for landmark_id, landmark in enumerate(hand_landmarks.landmark):
+                        landmarks[landmark_id] = int(landmark.x * w), int(landmark.y * h), landmark.z
+
+                if not full_frame:
+                    landmarks[:, 0] += x_offset
+                    landmarks[:, 1] += y_offset
+
+                hand.landmarks = landmarks
+                hand.border_box, hand.center = hu.calculate_border_box(landmarks)
                 hand.score = hand_info.classification[0].score
 
                 # set hand type
@@ -105,14 +446,19 @@ class HandDetector:
 
                 # Draw border box
                 if draw:
-                    self.mp_draw.draw_landmarks(img, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                    img = du.draw_border_box(img, border_box)
-                    img = du.draw_hand_info(img, hand)
+                    if full_frame:
+                        self.mp_draw.draw_landmarks(img, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+                    else:
+                        du.draw_hand_landmarks(img, landmarks)
+                    du.draw_border_box(img, hand.border_box)
+                    du.draw_hand_info(img, hand)
 
-        if draw:
-            return all_hands, img
-        else:
-            return all_hands
+        if self.metrics is not None:
+            self.metrics.record("color_conversion", converted_time - start_time)
+            self.metrics.record("mediapipe", processed_time - converted_time)
+            self.metrics.record("landmark_postprocessing", time.perf_counter() - processed_time)
+
+        return all_hands
 
     def get_fingers_up(self, hand: Hand) -> List[int]:
         """
@@ -150,3 +496,46 @@ class HandDetector:
                 fingers.append(0)
 
         return fingers
+
+    def _convert_to_rgb(self, img: Any) -> Any:
+        """
+        Convert BGR image to RGB. In optimized mode the conversion reuses a preallocated buffer.
+
+        Args:
+            img (Any): BGR image.
+
+        Returns:
+            Any: RGB image.
+        """
+
+        if not self.reuse_buffers:
+            return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+        # Flat buffer grown on demand, so regions of changing size reuse it as a contiguous view
+        if self._rgb_buffer is None or self._rgb_buffer.size < img.size:
+            self._rgb_buffer = np.empty(img.size, dtype=img.dtype)
+
+        return cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer[:img.size].reshape(img.shape))
+
+    def _scale_landmarks(self, hand_landmarks: Any, width: int, height: int, out: np.ndarray) -> None:
+        """
+        Convert landmark protobufs to an array and scale them to pixels with NumPy instead of per landmark.
+
+        Args:
+            hand_landmarks (Any): MediaPipe NormalizedLandmarkList of one hand.
+            width (int): Image width.
+            height (int): Image height.
+            out (numpy.ndarray): (21, 3) array the landmarks in pixel format are written to.
+        """
+
+        raw = self._landmarks_buffer
+        raw.reshape(-1)[:] = np.fromiter(chain.from_iterable((landmark.x, landmark.y, landmark.z)
+                                                             for landmark in hand_landmarks.landmark),
+                                         dtype=np.float64, count=raw.size)
+
+        # Pixel coordinates are truncated like int(), in double precision
+        raw[:, 0] *= width
+        raw[:, 1] *= height
+        np.trunc(raw[:, :2], out=raw[:, :2])
+
+        out[:] = raw
@@ -0,0 +1,325 @@
+import time
+import signal
+import threading
+import numpy as np
+import multiprocessing as mp
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from hcs.camera_video_capture.shared_frame_ring import SharedFrameRing
+from hcs.models import Hand, HandType
+from hcs.models.hand import BorderBox
+
+# Compact record of a detected hand sent back by detector processes, 281 bytes per hand
+HAND_RECORD_DTYPE = np.dtype([
+    ("landmarks", np.float32, (21, 3)),
+    ("border_box", np.int32, (4,)),
+    ("center", np.int32, (2,)),
+    ("score", np.float32),
+    ("type", np.int8),
+])
+
+
+class DetectionResult(NamedTuple):
+    """
+    Hands detected by a detector process in a frame of the shared memory ring.
+    """
+
+    sequence: int
+    timestamp: float
+    hands: Optional[List[Hand]]
+    detection_time: float
+
+
+def pack_hands(hands: List[Hand]) -> np.ndarray:
+    """
+    Pack hands into compact records.
+
+    Args:
+        hands (List[Hand]): Hands to pack.
+
+    Returns:
+        numpy.ndarray: Records of HAND_RECORD_DTYPE.
+    """
+
+    records = np.empty(len(hands), dtype=HAND_RECORD_DTYPE)
+
+    for record, hand in zip(records, hands):
+        record["landmarks"] = hand.landmarks
+        record["border_box"] = hand.border_box
+        record["center"] = hand.center
+        record["score"] = hand.score
+        record["type"] = hand.type.value
+
+    return records
+
+
+def unpack_hands(records: np.ndarray) -> List[Hand]:
+    """
+    Rebuild hands from compact records.
+
+    Args:
+        records (numpy.ndarray): Records of HAND_RECORD_DTYPE.
+
+    Returns:
+        List[Hand]: Hands.
+    """
+
+    hands = []
+
+    for record in records:
+        hand = Hand()
+        hand.landmarks = record["landmarks"]
+        hand.border_box = BorderBox(*record["border_box"].tolist())
+        hand.center = tuple(record["center"].tolist())
+        hand.score = float(record["score"])
+        hand.type = HandType(int(record["type"]))
+        hands.append(hand)
+
+    return hands
+
+
+class DetectionProcessPool:
+    """
+    Landmark detection in separate processes, so MediaPipe post-processing does not contend for the GIL with
+    classification, drawing and actuation. Frames are not sent to the processes: they read them zero-copy from the
+    SharedFrameRing the capture writes to, only the frame sequence number goes in and compact hand records come back.
+
+    Frames are handed to the first idle process. At most max_in_flight frames are detected at once, newer frames are
+    dropped instead of queued, so the detection always works on recent frames. Every process has its own
+    HandDetector, so tracking between frames only sees the frames of its process.
+
+    Attributes:
+        ring (SharedFrameRing): Ring the frames are read from.
+        processes (int): Number of detector processes.
+        max_in_flight (int): Maximum number of frames being detected at once.
+        task_timeout (float): Time in seconds after which a frame without result is given up, e.g. when a process
+            died.
+        dropped (int): Number of frames not submitted because all processes were busy.
+        lost (int): Number of frames without result, overwritten in the ring or given up.
+        _detector_kwargs (Dict[str, Any]): Arguments of the HandDetector of every process.
+        _context (Any): Multiprocessing spawn context.
+        _tasks (Any): Queue with sequence numbers of frames to detect.
+        _results (Any): Queue with detection results.
+        _workers (List[Any]): Detector processes.
+        _pending (Dict[int, float]): Capture timestamps of the submitted frames by sequence number.
+        _submit_times (Dict[int, float]): Submission times of the submitted frames by sequence number.
+        _lock (threading.Lock): Lock of the frames in flight, submit and get may be called from different threads.
+    """
+
+    def __init__(self, ring: SharedFrameRing, processes: int = 2, detector_kwargs: Optional[Dict[str, Any]] = None,
+                 max_in_flight: Optional[int] = None, task_timeout: float = 1.0):
+        """
+        Constructor.
+
+        Args:
+            ring (SharedFrameRing): Ring the frames are read from, needs ring_slots(processes) slots.
+            processes (int): Defaults to 2. Number of detector processes.
+            detector_kwargs (Optional[Dict[str, Any]]): Defaults to None. Arguments of the HandDetector of every
+                process.
+            max_in_flight (Optional[int]): Defaults to None. Maximum number of frames being detected at once, the
+                number of processes when None.
+            task_timeout (float): Defaults to 1.0. Time in seconds after which a frame without result is given up.
+        """
+
+        self.ring: SharedFrameRing = ring
+        self.processes: int = processes
+        self.max_in_flight: int = max_in_flight or processes
+        self.task_timeout: float = task_timeout
+        self.dropped: int = 0
+        self.lost: int = 0
+
+        self._detector_kwargs: Dict[str, Any] = detector_kwargs or {}
+
+        # Spawned processes do not inherit the capture and executor threads of the parent
+        self._context: Any = mp.get_context("spawn")
+        self._tasks: Any = self._context.Queue()
+        self._results: Any = self._context.Queue()
+        self._workers: List[Any] = []
+        self._pending: Dict[int, float] = {}
+        self._submit_times: Dict[int, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def ring_slots(processes: int, max_in_flight: Optional[int] = None) -> int:
+        """
+        Number of ring slots needed so frames are not overwritten while they are used: the frames in flight, the
+        frame being captured, the capture buffer and the frame being rendered.
+
+        Args:
+            processes (int): Number of detector processes.
+            max_in_flight (Optional[int]): Defaults to None. Maximum number of frames being detected at once.
+
+        Returns:
+            int: Number of slots.
+        """
+
+        return (max_in_flight or processes) + 4
+
+    def start(self, timeout: float = 60.0) -> None:
+        """
+        Start the detector processes and wait until all of them have built and warmed up their detectors.
+
+        Args:
+            timeout (float): Defaults to 60.0. Maximum time in seconds to wait for the processes.
+        """
+
+        for index in range(self.processes):
+            worker = self._context.Process(target=_detection_worker, name=f"HCSDetection-{index}", daemon=True,
+                                           args=(self.ring.spec, self._detector_kwargs, self._tasks, self._results))
+            worker.start()
+            self._workers.append(worker)
+
+        for _ in range(self.processes):
+            self._results.get(timeout=timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the detector processes, terminating the ones that do not finish in time.
+
+        Args:
+            timeout (float): Defaults to 5.0. Maximum time in seconds to wait for every process.
+        """
+
+        for _ in self._workers:
+            self._tasks.put(None)
+
+        for worker in self._workers:
+            worker.join(timeout)
+
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+        self._workers = []
+        self._tasks.cancel_join_thread()
+        self._results.cancel_join_thread()
+
+    def is_alive(self) -> bool:
+        """
+        Returns:
+            bool: True while any detector process is running.
+        """
+
+        return any(worker.is_alive() for worker in self._workers)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Returns:
+            int: Number of frames being detected.
+        """
+
+        return len(self._pending)
+
+    def submit(self, sequence: int, timestamp: float) -> bool:
+        """
+        Submit a frame of the ring for detection, unless max_in_flight frames are already being detected.
+
+        Args:
+            sequence (int): Sequence number of the frame.
+            timestamp (float): Capture timestamp of the frame.
+
+        Returns:
+            bool: True when the frame has been submitted, False when it has been dropped.
+        """
+
+        now = time.perf_counter()
+
+        with self._lock:
+            # Frames of a process that died would block the pool forever
+            for pending_sequence, submit_time in list(self._submit_times.items()):
+                if now - submit_time > self.task_timeout:
+                    del self._pending[pending_sequence], self._submit_times[pending_sequence]
+                    self.lost += 1
+
+            if len(self._pending) >= self.max_in_flight:
+                self.dropped += 1
+                return False
+
+            self._pending[sequence] = timestamp
+            self._submit_times[sequence] = now
+
+        self._tasks.put(sequence)
+
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[DetectionResult]:
+        """
+        Get the next detection result, in completion order.
+
+        Args:
+            timeout (Optional[float]): Defaults to None. Maximum time in seconds to wait.
+
+        Returns:
+            Optional[DetectionResult]: Result or None when the timeout expired. Hands are None when the frame has been
+                overwritten in the ring during the detection or given up.
+        """
+
+        try:
+            sequence, records, detection_time = self._results.get(timeout=timeout)
+        except Exception:
+            # queue.Empty, or the queue has been closed
+            return None
+
+        with self._lock:
+            # A frame given up by submit has already been counted as lost
+            given_up = sequence not in self._pending
+            timestamp = self._pending.pop(sequence, 0.0)
+            self._submit_times.pop(sequence, None)
+
+            if records is None and not given_up:
+                self.lost += 1
+
+        if records is None or given_up:
+            return DetectionResult(sequence, timestamp, None, detection_time)
+
+        return DetectionResult(sequence, timestamp, unpack_hands(records), detection_time)
+
+
+def _detection_worker(ring_spec: tuple, detector_kwargs: Dict[str, Any], tasks: Any, results: Any) -> None:
+    """
+    Detector process loop: detect hands of the ring frames whose sequence numbers arrive in the task queue.
+
+    Args:
+        ring_spec (tuple): Arguments of SharedFrameRing.attach.
+        detector_kwargs (Dict[str, Any]): Arguments of the HandDetector.
+        tasks (Any): Queue with sequence numbers, None stops the process.
+        results (Any): Queue for (sequence, records, detection time) results.
+    """
+
+    # The parent handles Ctrl+C and stops the processes
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # MediaPipe is loaded in the detector process
+    from hcs.hand_detector import HandDetector
+
+    ring = SharedFrameRing.attach(*ring_spec)
+    detector = HandDetector(**detector_kwargs)
+    detector.warm_up(ring.width, ring.height)
+    results.put(None)
+
+    while True:
+        sequence = tasks.get()
+        if sequence is None:
+            break
+
+        start_time = time.perf_counter()
+        image = ring.view(sequence)
+        records = None
+
+        if image is not None:
+            try:
+                hands = detector.find_hands(image, draw=False)
+            except Exception:
+                # A failing frame is reported as lost, the process keeps running
+                hands = None
+
+            # The slot may have been reused while MediaPipe was reading it
+            if hands is not None and ring.is_valid(sequence):
+                records = pack_hands(hands)
+
+        del image
+        results.put((sequence, records, time.perf_counter() - start_time))
+
+    ring.close()
@@ -1,49 +1,90 @@
+import os
 import pickle
-import pandas as pd
 import numpy as np
 
-from typing import Optional, Any
+from typing import Optional, Any, List, TYPE_CHECKING
 
 from hcs.models import Hand, GestureClassificationResult, GestureType
+from hcs.hand_gesture_detector.classification_cache import ClassificationCache
+from hcs.hand_gesture_detector.compiled_model import CompiledGestureModel
 import hcs.utils.hand_utils as hu
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Directory of the models shipped with the package, independent of the working directory
+MODEL_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "classification_model_file")
+DEFAULT_MODEL_PATH = os.path.join(MODEL_DIRECTORY, "hand-gestures-model.npz")
+# Path overriding the default model
+MODEL_PATH_ENVIRONMENT_VARIABLE = "HCS_MODEL_PATH"
+
 
 class HandGestureDetector:
     """
     Classification of hand gestures using a previously prepared classification model.
-    Classification model is from scikit-learn library. The model is loaded from the file.
+    The model is loaded from a compiled .npz artifact run by the NumPy inference engine (see
+    `hcs.hand_gesture_detector.model_export`), or from a pickled scikit-learn model.
 
     Attributes:
         _min_classification_confidence (float): Minimal certainty of classification to be considered
             as the correct choice of the classifier.
         _model (Optional[Any]): Classification model.
+        classification_cache (Optional[ClassificationCache]): Cache reusing results of hands that barely moved.
     """
 
-    def __init__(self, min_classification_confidence: float = 0.5):
+    def __init__(self, min_classification_confidence: float = 0.5, cache_tolerance: Optional[float] = None,
+                 cache_max_age: float = 0.5, cache_max_frames: int = 15, model_path: Optional[str] = None):
         """
         Constructor.
 
         Args:
             min_classification_confidence (float): Defaults to 0.5. Minimum Classification Confidence Threshold.
+            cache_tolerance (Optional[float]): Defaults to None. Maximum change of a normalized landmark coordinate
+                for the previous result of the hand to be reused. Classification cache is disabled when None.
+            cache_max_age (float): Defaults to 0.5. Maximum age of a cached result in seconds.
+            cache_max_frames (int): Defaults to 15. Maximum number of frames a cached result is reused for.
+            model_path (Optional[str]): Defaults to None. Path to a compiled .npz or a pickled .pkl model. When None
+                the HCS_MODEL_PATH environment variable is used, or the model shipped with the package.
         """
 
         self._min_classification_confidence: float = min_classification_confidence
         self._model: Optional[Any] = None
 
+        self.classification_cache: Optional[ClassificationCache] = None
+        if cache_tolerance is not None:
+            self.classification_cache = ClassificationCache(cache_tolerance, cache_max_age, cache_max_frames)
+
         # Load model from file
-        self.__load_classification_model('hcs/classification_model_file/hand-gestures-model.pkl')
+        if model_path is None:
+            model_path = os.environ.get(MODEL_PATH_ENVIRONMENT_VARIABLE, DEFAULT_MODEL_PATH)
+
+        self.__load_classification_model(model_path)
 
     def __load_classification_model(self, file_location_path: str) -> None:
         """
-        Load classification model from file.
+        Load classification model from file. Compiled .npz models are memory-mapped, other files are unpickled,
+        which requires scikit-learn.
 
         Args:
             file_location_path: Path to file with classification model.
         """
 
+        if file_location_path.endswith(".npz"):
+            self._model = CompiledGestureModel.load(file_location_path)
+            return
+
         with open(file_location_path, 'rb') as f:
             self._model = pickle.load(f)
 
+    def warm_up(self) -> None:
+        """
+        Run one classification of a dummy hand, so the first real frame does not pay for lazy initialization of the
+        model. The classification cache is not touched.
+        """
+
+        self.classify_features(np.zeros((1, 64), dtype=np.float64))
+
     def predict(self, hand: Hand) -> Optional[GestureClassificationResult]:
         """
         Predict hand gesture using classification model.
@@ -57,24 +98,125 @@ class HandGestureDetector:
             Optional[model.GestureClassificationResult]: Gesture Classification Result while predicting successfully.
         """
 
-        gesture_classification_result = GestureClassificationResult()
+        return self.predict_batch([hand])[0]
+
+    def predict_batch(self, hands: List[Hand]) -> List[Optional[GestureClassificationResult]]:
+        """
+        Predict gestures of many hands, e.g. both hands from a frame or recorded hands, in one vectorized call.
+        The model is run once: the predicted gesture is the class with the highest probability.
+
+        Args:
+            hands (List[model.Hand]): Hands information.
+
+        Returns:
+            List[Optional[model.GestureClassificationResult]]: Gesture Classification Result for each hand, None when
+                the gesture probability is smallest than self._min_classification_confidence.
+        """
+
+        if not hands:
+            return []
 
         # Prepare data to prediction
-        predicted_data = self.prepare_predicted_data(hand)
+        features = self.prepare_features(hands)
+
+        if self.classification_cache is None:
+            return self.classify_features(features)
+
+        return self.__classify_cached(hands, features)
+
+    def __classify_cached(self, hands: List[Hand], features: np.ndarray) -> List[Optional[GestureClassificationResult]]:
+        """
+        Predict gestures reusing cached results of hands whose landmarks barely moved.
+        Only the remaining hands are classified, in one call.
+
+        Args:
+            hands (List[model.Hand]): Hands information.
+            features (numpy.ndarray): Feature matrix of the hands.
+
+        Returns:
+            List[Optional[model.GestureClassificationResult]]: Gesture Classification Result for each hand.
+        """
+
+        results: List[Optional[GestureClassificationResult]] = [None] * len(hands)
+        keys = []
+        missed_indexes = []
 
-        hand_gesture_class = self._model.predict(predicted_data)[0]
-        hand_gesture_prob = self._model.predict_proba(predicted_data)[0]
+        for index, hand in enumerate(hands):
+            # Two hands of the same type in one frame get separate entries
+            key = (hand.type, sum(1 for previous_key in keys if previous_key[0] == hand.type))
+            keys.append(key)
 
-        gesture_classification_result.gesture_type = GestureType(hand_gesture_class)
-        gesture_classification_result.score = round(hand_gesture_prob[np.argmax(hand_gesture_prob)], 2)
+            entry = self.classification_cache.lookup(key, features[index])
+            if entry is None:
+                missed_indexes.append(index)
+            else:
+                results[index] = entry.result
 
-        if gesture_classification_result.score < self._min_classification_confidence:
-            return None
-        else:
-            return gesture_classification_result
+        if missed_indexes:
+            for index, result in zip(missed_indexes, self.classify_features(features[missed_indexes])):
+                results[index] = result
+                self.classification_cache.store(keys[index], features[index], result)
+
+        return results
+
+    def classify_features(self, features: np.ndarray) -> List[Optional[GestureClassificationResult]]:
+        """
+        Predict gestures from a prepared feature matrix.
+
+        Args:
+            features (numpy.ndarray): Feature matrix, one row per hand, as returned by prepare_features.
+
+        Returns:
+            List[Optional[model.GestureClassificationResult]]: Gesture Classification Result for each row, None when
+                the gesture probability is smallest than self._min_classification_confidence.
+        """
+
+        hand_gesture_probs = self._model.predict_proba(features)
+        hand_gesture_indexes = np.argmax(hand_gesture_probs, axis=1)
+
+        results: List[Optional[GestureClassificationResult]] = []
+
+        for hand_gesture_index, hand_gesture_prob in zip(hand_gesture_indexes, hand_gesture_probs):
+            score = round(float(hand_gesture_prob[hand_gesture_index]), 2)
+
+            if score < self._min_classification_confidence:
+                results.append(None)
+                continue
+
+            gesture_classification_result = GestureClassificationResult()
+            gesture_classification_result.gesture_type = GestureType(int(self._model.classes_[hand_gesture_index]))
+            gesture_classification_result.score = score
+
+            results.append(gesture_classification_result)
+
+        return results
+
+    @staticmethod
+    def prepare_features(hands: List[Hand]) -> np.ndarray:
+        """
+        Preparing a feature matrix to predict hand gestures. Each row starts with the hand type followed by
+        the flattened landmarks scaled to ranges [0, 1].
+
+        Args:
+            hands (List[model.Hand]): Hands information.
+
+        Returns:
+            numpy.ndarray: Feature matrix with one row per hand.
+        """
+
+        landmarks = np.stack([hand.landmarks for hand in hands])
+        border_boxes = np.array([hand.border_box for hand in hands])
+
+        features = np.empty((len(hands), 1 + landmarks[0].size), dtype=np.float64)
+        features[:, 0] = [hand.type.value for hand in hands]
+
+        # Scales Hand landmarks to ranges [0, 1] for all hands at once
+        features[:, 1:] = hu.normalize_landmarks(landmarks, border_boxes).reshape(len(hands), -1)
+
+        return features
 
     @staticmethod
-    def prepare_predicted_data(hand: Hand) -> pd.DataFrame:
+    def prepare_predicted_data(hand: Hand) -> "pd.DataFrame":
         """
         Preparing a list of landmarks to predict hand gesture.
 
@@ -85,11 +227,14 @@ class HandGestureDetector:
             pandas.core.frame.DataFrame: DataFrame object with data ready to predict hand gesture.
         """
 
+        # Imported on use, the runtime path works on NumPy features only
+        import pandas as pd
+
         # Scales Hand landmarks to ranges [0, 1].
         landmarks = hu.prepare_hand_data(hand)
 
-        # Flattening the list of hand landmarks
-        row = list(np.array(landmarks).flatten())
+        # Flattening the hand landmarks
+        row = landmarks.ravel().tolist()
         row.insert(0, hand.type.value)
 
         return pd.DataFrame([row])
@@ -0,0 +1,111 @@
+import time
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+from hcs.models import GestureClassificationResult
+
+
+@dataclass
+class CacheEntry:
+    features: np.ndarray
+    result: Optional[GestureClassificationResult]
+    timestamp: float
+    frames: int = 0
+
+
+class ClassificationCache:
+    """
+    Per-hand cache of gesture classification results keyed on the normalized landmark vector.
+    The cached result is reused while the largest change of any normalized coordinate stays under the tolerance.
+    An entry expires after max_age seconds or after being reused for max_frames frames, so the classifier still
+    confirms a held gesture from time to time.
+
+    Attributes:
+        tolerance (float): Maximum absolute change of a normalized coordinate for the cached result to be reused.
+        max_age (float): Maximum age of an entry in seconds.
+        max_frames (int): Maximum number of frames an entry is reused for.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that needed classification.
+        _entries (Dict[Hashable, CacheEntry]): Cache entries by hand key.
+    """
+
+    def __init__(self, tolerance: float = 0.02, max_age: float = 0.5, max_frames: int = 15):
+        """
+        Constructor.
+
+        Args:
+            tolerance (float): Defaults to 0.02. Maximum absolute change of a normalized coordinate for the cached
+                result to be reused.
+            max_age (float): Defaults to 0.5. Maximum age of an entry in seconds.
+            max_frames (int): Defaults to 15. Maximum number of frames an entry is reused for.
+        """
+
+        self.tolerance: float = tolerance
+        self.max_age: float = max_age
+        self.max_frames: int = max_frames
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._entries: Dict[Hashable, CacheEntry] = {}
+
+    def lookup(self, key: Hashable, features: np.ndarray, now: Optional[float] = None) -> Optional[CacheEntry]:
+        """
+        Find a cached classification for the hand.
+
+        Args:
+            key (Hashable): Hand key, e.g. hand type.
+            features (numpy.ndarray): Feature vector of the hand.
+            now (Optional[float]): Defaults to None. Current time, time.perf_counter() when not given.
+
+        Returns:
+            Optional[CacheEntry]: Cache entry with the reusable result, None on a miss.
+        """
+
+        now = time.perf_counter() if now is None else now
+        entry = self._entries.get(key)
+
+        if entry is None or now - entry.timestamp > self.max_age or entry.frames >= self.max_frames or \
+                np.max(np.abs(features - entry.features)) > self.tolerance:
+            self.misses += 1
+            return None
+
+        entry.frames += 1
+        self.hits += 1
+
+        return entry
+
+    def store(self, key: Hashable, features: np.ndarray, result: Optional[GestureClassificationResult],
+              now: Optional[float] = None) -> None:
+        """
+        Store classification result of the hand.
+
+        Args:
+            key (Hashable): Hand key, e.g. hand type.
+            features (numpy.ndarray): Feature vector of the hand.
+            result (Optional[GestureClassificationResult]): Classification result.
+            now (Optional[float]): Defaults to None. Current time, time.perf_counter() when not given.
+        """
+
+        now = time.perf_counter() if now is None else now
+        self._entries[key] = CacheEntry(features.copy(), result, now)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns:
+            float: Share of lookups answered from the cache.
+        """
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,388 @@
+import zipfile
+import numpy as np
+
+from typing import Callable, Dict, List, Mapping
+
+# Version of the artifact layout, bumped on incompatible changes
+FORMAT_VERSION = 1
+
+
+class CompiledGestureModel:
+    """
+    Gesture classification model exported from scikit-learn into a versioned .npz artifact, with an inference
+    engine written in NumPy only. It has the predict_proba / predict / classes_ interface used by
+    HandGestureDetector, without scikit-learn input validation on every call.
+
+    Supported estimators, each optionally preceded by a standard scaler:
+        * logistic_regression - LogisticRegression, multinomial or one-vs-rest
+        * random_forest - RandomForestClassifier
+        * gradient_boosting - GradientBoostingClassifier
+        * svc - SVC trained with probability=True, with libsvm Platt scaling and pairwise coupling
+
+    Artifacts are written by `hcs.hand_gesture_detector.model_export`. Arrays are stored uncompressed, so load
+    memory-maps them instead of reading the file.
+
+    Attributes:
+        estimator (str): Estimator type.
+        classes_ (numpy.ndarray): Class labels in the order of the probability columns.
+        format_version (int): Version of the artifact layout.
+        _arrays (Dict[str, numpy.ndarray]): Model parameters.
+        _predict_raw (Callable[[numpy.ndarray], numpy.ndarray]): Estimator probability function.
+    """
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        """
+        Constructor.
+
+        Args:
+            arrays (Mapping[str, numpy.ndarray]): Model parameters as written by the export tool.
+        """
+
+        self.format_version: int = int(arrays["format_version"])
+        if self.format_version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format version {self.format_version}, expected {FORMAT_VERSION}")
+
+        self.estimator: str = str(arrays["estimator"])
+        self.classes_: np.ndarray = np.asarray(arrays["classes"])
+        self._arrays: Dict[str, np.ndarray] = dict(arrays)
+
+        predictors: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+            "logistic_regression": self._predict_logistic_regression,
+            "random_forest": self._predict_random_forest,
+            "gradient_boosting": self._predict_gradient_boosting,
+            "svc": self._predict_svc,
+        }
+
+        if self.estimator not in predictors:
+            raise ValueError(f"Unsupported estimator: {self.estimator}")
+
+        self._predict_raw: Callable[[np.ndarray], np.ndarray] = predictors[self.estimator]
+
+        if self.estimator == "svc":
+            self.__prepare_svc()
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompiledGestureModel":
+        """
+        Load a model artifact.
+
+        Args:
+            path (str): Path to the .npz artifact.
+            mmap (bool): Defaults to True. Flag to memory-map the arrays instead of reading them.
+
+        Returns:
+            CompiledGestureModel: Loaded model.
+        """
+
+        if mmap:
+            return cls(_load_npz_mmap(path))
+
+        with np.load(path) as arrays:
+            return cls({name: arrays[name] for name in arrays.files})
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predict class probabilities.
+
+        Args:
+            features (numpy.ndarray): Feature matrix, one row per sample.
+
+        Returns:
+            numpy.ndarray: Probability of every class, one row per sample.
+        """
+
+        features = np.asarray(features, dtype=np.float64)
+
+        if "scaler_mean" in self._arrays:
+            features = (features - self._arrays["scaler_mean"]) / self._arrays["scaler_scale"]
+
+        return self._predict_raw(features)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predict classes as the most probable ones.
+
+        Args:
+            features (numpy.ndarray): Feature matrix, one row per sample.
+
+        Returns:
+            numpy.ndarray: Predicted class labels.
+        """
+
+        return self.classes_[np.argmax(self.predict_proba(features), axis=1)]
+
+    def _predict_logistic_regression(self, features: np.ndarray) -> np.ndarray:
+        decision = features @ self._arrays["coef"].T + self._arrays["intercept"]
+
+        if decision.shape[1] == 1:
+            positive = _expit(decision[:, 0])
+            return np.column_stack((1 - positive, positive))
+
+        if str(self._arrays["multi_class"]) == "ovr":
+            probabilities = _expit(decision)
+            return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+        return _softmax(decision)
+
+    def _predict_random_forest(self, features: np.ndarray) -> np.ndarray:
+        leaves = self.__find_leaves(features)
+
+        # Tree values are stored as class probabilities of the leaf
+        return self._arrays["tree_value"][leaves].mean(axis=1)
+
+    def _predict_gradient_boosting(self, features: np.ndarray) -> np.ndarray:
+        leaves = self.__find_leaves(features)
+        tree_class = self._arrays["tree_class"]
+
+        raw = np.tile(self._arrays["init_raw"], (len(features), 1))
+        contributions = self._arrays["learning_rate"] * self._arrays["tree_value"][leaves, 0]
+
+        for class_index in range(raw.shape[1]):
+            raw[:, class_index] += contributions[:, tree_class == class_index].sum(axis=1)
+
+        if raw.shape[1] == 1:
+            positive = _expit(raw[:, 0])
+            return np.column_stack((1 - positive, positive))
+
+        return _softmax(raw)
+
+    def __find_leaves(self, features: np.ndarray) -> np.ndarray:
+        """
+        Walk all trees at once for all samples.
+
+        Args:
+            features (numpy.ndarray): Feature matrix.
+
+        Returns:
+            numpy.ndarray: (N, T) index of the leaf reached in every tree.
+        """
+
+        # scikit-learn trees compare float32 features with float64 thresholds
+        features = features.astype(np.float32)
+
+        feature = self._arrays["tree_feature"]
+        threshold = self._arrays["tree_threshold"]
+        left = self._arrays["tree_left"]
+        right = self._arrays["tree_right"]
+
+        nodes = np.tile(self._arrays["tree_roots"], (len(features), 1))
+        rows = np.arange(len(features))[:, None]
+
+        # Leaves point to themselves, so walking max_depth steps lands every sample in its leaf
+        for _ in range(int(self._arrays["max_depth"])):
+            go_left = features[rows, feature[nodes]] <= threshold[nodes]
+            nodes = np.where(go_left, left[nodes], right[nodes])
+
+        return nodes
+
+    def __prepare_svc(self) -> None:
+        """
+        Build the coefficient matrix of all one-vs-one decision functions from the libsvm representation.
+        """
+
+        dual_coef = self._arrays["dual_coef"]
+        n_support = self._arrays["n_support"]
+        classes_number = len(n_support)
+        starts = np.concatenate(([0], np.cumsum(n_support)))
+
+        pair_coef = np.zeros((classes_number * (classes_number - 1) // 2, dual_coef.shape[1]))
+        pair_index = 0
+
+        for i in range(classes_number):
+            for j in range(i + 1, classes_number):
+                pair_coef[pair_index, starts[i]:starts[i + 1]] = dual_coef[j - 1, starts[i]:starts[i + 1]]
+                pair_coef[pair_index, starts[j]:starts[j + 1]] = dual_coef[i, starts[j]:starts[j + 1]]
+                pair_index += 1
+
+        support_vectors = self._arrays["support_vectors"]
+
+        self._pair_coef: np.ndarray = pair_coef
+        self._support_vectors_norm: np.ndarray = np.einsum("ij,ij->i", support_vectors, support_vectors)
+
+    def _predict_svc(self, features: np.ndarray) -> np.ndarray:
+        kernel = self.__svc_kernel(features)
+        decision = kernel @ self._pair_coef.T + self._arrays["intercept"]
+
+        # Platt scaling of every pair, clipped like libsvm
+        pairwise = np.clip(_expit(-(decision * self._arrays["prob_a"] + self._arrays["prob_b"])), 1e-7, 1 - 1e-7)
+
+        # Coupled also for two classes, like the libsvm version bundled with scikit-learn
+        classes_number = len(self.classes_)
+        r = np.zeros((len(features), classes_number, classes_number))
+        upper_i, upper_j = np.triu_indices(classes_number, 1)
+        r[:, upper_i, upper_j] = pairwise
+        r[:, upper_j, upper_i] = 1 - pairwise
+
+        # NumPy call overhead dominates the iterations for a few rows, e.g. the hands of one frame
+        if len(features) <= 4:
+            return np.array([_couple_pairwise_probabilities_row(row.tolist()) for row in r])
+
+        return _couple_pairwise_probabilities(r)
+
+    def __svc_kernel(self, features: np.ndarray) -> np.ndarray:
+        support_vectors = self._arrays["support_vectors"]
+        kernel = str(self._arrays["kernel"])
+        gamma = float(self._arrays["gamma"])
+
+        if kernel == "rbf":
+            squared_distances = np.einsum("ij,ij->i", features, features)[:, None] + self._support_vectors_norm - \
+                2 * features @ support_vectors.T
+            return np.exp(-gamma * np.maximum(squared_distances, 0))
+
+        dot = features @ support_vectors.T
+
+        if kernel == "linear":
+            return dot
+        if kernel == "poly":
+            return (gamma * dot + float(self._arrays["coef0"])) ** int(self._arrays["degree"])
+        if kernel == "sigmoid":
+            return np.tanh(gamma * dot + float(self._arrays["coef0"]))
+
+        raise ValueError(f"Unsupported SVC kernel: {kernel}")
+
+
+def _couple_pairwise_probabilities(r: np.ndarray) -> np.ndarray:
+    """
+    Class probabilities from pairwise probabilities, the iterative method of libsvm (Wu, Lin and Weng, 2004)
+    applied to all samples at once. Every sample stops iterating at the same point as in libsvm.
+
+    Args:
+        r (numpy.ndarray): (N, K, K) pairwise probabilities, r[n, i, j] is the probability of class i against j.
+
+    Returns:
+        numpy.ndarray: (N, K) class probabilities.
+    """
+
+    samples_number, classes_number, _ = r.shape
+
+    # Diagonal of r is zero
+    q = -r * r.transpose(0, 2, 1)
+    q[:, np.arange(classes_number), np.arange(classes_number)] = (r ** 2).sum(axis=1)
+
+    p = np.full((samples_number, classes_number), 1 / classes_number)
+    active = np.arange(samples_number)
+    eps = 0.005 / classes_number
+
+    for _ in range(max(100, classes_number)):
+        q_active = q[active]
+        p_active = p[active]
+
+        qp = np.einsum("ntj,nj->nt", q_active, p_active)
+        pqp = (p_active * qp).sum(axis=1)
+
+        converged = np.abs(qp - pqp[:, None]).max(axis=1) < eps
+        if converged.any():
+            active, q_active, p_active, qp, pqp = (values[~converged] for values in (active, q_active, p_active, qp,
+                                                                                    pqp))
+            if not len(active):
+                break
+
+        for t in range(classes_number):
+            q_tt = q_active[:, t, t]
+            diff = (-qp[:, t] + pqp) / q_tt
+
+            p_active[:, t] += diff
+            pqp = (pqp + diff * (diff * q_tt + 2 * qp[:, t])) / (1 + diff) / (1 + diff)
+            qp = (qp + diff[:, None] * q_active[:, t]) / (1 + diff)[:, None]
+            p_active /= (1 + diff)[:, None]
+
+        p[active] = p_active
+
+    return p
+
+
+def _couple_pairwise_probabilities_row(r: List[List[float]]) -> List[float]:
+    """
+    Class probabilities of one sample from pairwise probabilities, libsvm multiclass_probability on Python floats.
+
+    Args:
+        r (List[List[float]]): K x K pairwise probabilities with a zero diagonal.
+
+    Returns:
+        List[float]: Class probabilities.
+    """
+
+    k = len(r)
+    q = [[-r[j][t] * r[t][j] for j in range(k)] for t in range(k)]
+    for t in range(k):
+        q[t][t] = sum(r[j][t] * r[j][t] for j in range(k))
+
+    p = [1 / k] * k
+    eps = 0.005 / k
+
+    for _ in range(max(100, k)):
+        qp = [sum(q_tj * p_j for q_tj, p_j in zip(q_t, p)) for q_t in q]
+        pqp = sum(p_t * qp_t for p_t, qp_t in zip(p, qp))
+
+        if max(abs(qp_t - pqp) for qp_t in qp) < eps:
+            break
+
+        for t in range(k):
+            diff = (-qp[t] + pqp) / q[t][t]
+            p[t] += diff
+            pqp = (pqp + diff * (diff * q[t][t] + 2 * qp[t])) / (1 + diff) / (1 + diff)
+
+            q_t = q[t]
+            qp = [(qp_j + diff * q_tj) / (1 + diff) for qp_j, q_tj in zip(qp, q_t)]
+            p = [p_j / (1 + diff) for p_j in p]
+
+    return p
+
+
+def _expit(values: np.ndarray) -> np.ndarray:
+    # Evaluated like libsvm sigmoid_predict, without overflow for large arguments
+    exp = np.exp(-np.abs(values))
+
+    return np.where(values >= 0, 1 / (1 + exp), exp / (1 + exp))
+
+
+def _softmax(values: np.ndarray) -> np.ndarray:
+    exp = np.exp(values - values.max(axis=1, keepdims=True))
+
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _load_npz_mmap(path: str) -> Dict[str, np.ndarray]:
+    """
+    Memory-map the arrays of an uncompressed .npz file. np.load ignores mmap_mode for .npz files, but arrays
+    stored without compression are contiguous .npy files inside the archive and can be mapped directly.
+
+    Args:
+        path (str): Path to the .npz file.
+
+    Returns:
+        Dict[str, numpy.ndarray]: Arrays by name, scalars and compressed arrays are read.
+    """
+
+    arrays: Dict[str, np.ndarray] = {}
+
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # Local file header: 30 bytes, then the file name and the extra field
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = (int(length) for length in np.frombuffer(file.read(4), dtype="<u2"))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            if dtype.hasobject or not shape or not np.prod(shape):
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # Plain array view of the mapping, memmap subclass bookkeeping slows down indexing
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=file.tell(), shape=shape,
+                                     order="F" if fortran_order else "C").view(np.ndarray)
+
+    return arrays
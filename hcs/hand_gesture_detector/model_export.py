@@ -0,0 +1,172 @@
+import pickle
+import argparse
+import numpy as np
+
+from typing import Any, Dict, List
+
+from hcs.hand_gesture_detector.compiled_model import FORMAT_VERSION, CompiledGestureModel
+
+
+def export_model(model: Any, path: str) -> None:
+    """
+    Convert a trained scikit-learn classifier, optionally a pipeline with a StandardScaler, into a compiled model
+    artifact loadable by CompiledGestureModel without scikit-learn.
+
+    Args:
+        model (Any): LogisticRegression, RandomForestClassifier, GradientBoostingClassifier or SVC with
+            probability=True, or a Pipeline of a StandardScaler and one of them.
+        path (str): Path to the .npz artifact.
+    """
+
+    arrays: Dict[str, Any] = {"format_version": FORMAT_VERSION}
+
+    steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+    *transformers, estimator = steps
+
+    for transformer in transformers:
+        if type(transformer).__name__ != "StandardScaler" or "scaler_mean" in arrays:
+            raise ValueError(f"Unsupported pipeline step: {type(transformer).__name__}")
+
+        features_number = transformer.n_features_in_
+        arrays["scaler_mean"] = transformer.mean_ if transformer.with_mean else np.zeros(features_number)
+        arrays["scaler_scale"] = transformer.scale_ if transformer.with_std else np.ones(features_number)
+
+    arrays["classes"] = np.asarray(estimator.classes_)
+
+    exporters = {
+        "LogisticRegression": _export_logistic_regression,
+        "RandomForestClassifier": _export_random_forest,
+        "GradientBoostingClassifier": _export_gradient_boosting,
+        "SVC": _export_svc,
+    }
+
+    estimator_name = type(estimator).__name__
+    if estimator_name not in exporters:
+        raise ValueError(f"Unsupported estimator: {estimator_name}")
+
+    arrays.update(exporters[estimator_name](estimator))
+
+    # Uncompressed, so the arrays can be memory-mapped
+    np.savez(path, **arrays)
+
+
+def _export_logistic_regression(estimator: Any) -> Dict[str, Any]:
+    multi_class = getattr(estimator, "multi_class", "auto")
+    if multi_class == "auto" or multi_class == "deprecated":
+        multi_class = "ovr" if estimator.solver == "liblinear" else "multinomial"
+
+    return {
+        "estimator": "logistic_regression",
+        "coef": estimator.coef_,
+        "intercept": estimator.intercept_,
+        "multi_class": multi_class,
+    }
+
+
+def _export_random_forest(estimator: Any) -> Dict[str, Any]:
+    arrays = _export_trees([tree.tree_ for tree in estimator.estimators_])
+    arrays["estimator"] = "random_forest"
+
+    # Leaf values as class probabilities, like DecisionTreeClassifier.predict_proba
+    values = arrays["tree_value"][:, 0, :]
+    totals = values.sum(axis=1, keepdims=True)
+    arrays["tree_value"] = np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+
+    return arrays
+
+
+def _export_gradient_boosting(estimator: Any) -> Dict[str, Any]:
+    trees = estimator.estimators_
+    arrays = _export_trees([tree.tree_ for tree in trees.ravel()])
+
+    arrays["estimator"] = "gradient_boosting"
+    arrays["tree_value"] = arrays["tree_value"][:, 0, :1]
+    arrays["tree_class"] = np.tile(np.arange(trees.shape[1]), trees.shape[0])
+    arrays["learning_rate"] = estimator.learning_rate
+    arrays["init_raw"] = estimator._raw_predict_init(np.zeros((1, estimator.n_features_in_)))[0]
+
+    return arrays
+
+
+def _export_trees(trees: List[Any]) -> Dict[str, Any]:
+    """
+    Concatenate scikit-learn tree structures into flat arrays with global node indexes.
+    Leaves get themselves as both children, so all trees can be walked together for a fixed number of steps.
+
+    Args:
+        trees (List[Any]): sklearn.tree._tree.Tree structures.
+
+    Returns:
+        Dict[str, Any]: Flat tree arrays.
+    """
+
+    offsets = np.concatenate(([0], np.cumsum([tree.node_count for tree in trees])))
+
+    left = np.concatenate([tree.children_left + offset for tree, offset in zip(trees, offsets)])
+    right = np.concatenate([tree.children_right + offset for tree, offset in zip(trees, offsets)])
+    feature = np.concatenate([tree.feature for tree in trees])
+    threshold = np.concatenate([tree.threshold for tree in trees])
+
+    leaves = feature < 0
+    nodes = np.arange(len(feature))
+    left[leaves] = nodes[leaves]
+    right[leaves] = nodes[leaves]
+    feature[leaves] = 0
+
+    return {
+        "tree_roots": offsets[:-1].astype(np.int32),
+        "tree_left": left.astype(np.int32),
+        "tree_right": right.astype(np.int32),
+        "tree_feature": feature.astype(np.int32),
+        "tree_threshold": threshold.astype(np.float64),
+        "tree_value": np.concatenate([tree.value for tree in trees]).astype(np.float64),
+        "max_depth": max(tree.max_depth for tree in trees),
+    }
+
+
+def _export_svc(estimator: Any) -> Dict[str, Any]:
+    if not getattr(estimator, "probability", False) or not len(estimator.probA_):
+        raise ValueError("SVC has to be trained with probability=True")
+
+    return {
+        "estimator": "svc",
+        "support_vectors": estimator.support_vectors_,
+        "dual_coef": estimator._dual_coef_,
+        "intercept": estimator._intercept_,
+        "n_support": np.asarray(estimator._n_support if hasattr(estimator, "_n_support") else estimator.n_support_),
+        "kernel": estimator.kernel,
+        "gamma": estimator._gamma,
+        "coef0": estimator.coef0,
+        "degree": estimator.degree,
+        "prob_a": estimator.probA_,
+        "prob_b": estimator.probB_,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a pickled scikit-learn gesture model to a compiled model")
+    parser.add_argument("model", help="pickled scikit-learn model (.pkl)")
+    parser.add_argument("output", help="compiled model artifact (.npz)")
+    parser.add_argument("--check-samples", type=int, default=1000,
+                        help="number of random samples the exported probabilities are compared on")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        model = pickle.load(f)
+
+    export_model(model, args.output)
+
+    compiled_model = CompiledGestureModel.load(args.output)
+    features_number = (model.steps[0][1] if hasattr(model, "steps") else model).n_features_in_
+
+    # Hand type column and normalized landmarks in [0, 1]
+    samples = np.random.default_rng(0).random((args.check_samples, features_number))
+    samples[:, 0] = np.round(samples[:, 0])
+
+    difference = np.abs(compiled_model.predict_proba(samples) - model.predict_proba(samples)).max()
+    print(f"Exported {compiled_model.estimator} model to {args.output}, "
+          f"largest probability difference on {args.check_samples} samples: {difference:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+
+from typing import List, Optional, Tuple
+
+import hcs.utils.hand_utils as hu
+
+from hcs.models import Hand
+
+
+class LandmarkTracker:
+    """
+    Lightweight inter-frame hand tracking. Moves the 21 landmarks of every hand from the last detection with sparse
+    Lucas-Kanade optical flow, which is much cheaper than running the full MediaPipe Hands graph. Landmarks that
+    fail to track keep their previous position.
+
+    Attributes:
+        win_size (Tuple[int, int]): Size of the search window at each pyramid level.
+        max_level (int): Number of pyramid levels.
+        max_error (float): Maximum optical flow error of a landmark to be considered as tracked.
+        motion_speed (float): Mean displacement in pixels of the tracked landmarks between the last two frames.
+        _prev_gray (Optional[numpy.ndarray]): Previous grayscale frame.
+        _hands (List[Hand]): Hands from the previous frame.
+    """
+
+    def __init__(self, win_size: Tuple[int, int] = (21, 21), max_level: int = 3, max_error: float = 30.0):
+        """
+        Constructor.
+
+        Args:
+            win_size (Tuple[int, int]): Defaults to (21, 21). Size of the search window at each pyramid level.
+            max_level (int): Defaults to 3. Number of pyramid levels.
+            max_error (float): Defaults to 30.0. Maximum optical flow error of a landmark to be considered as tracked.
+        """
+
+        self.win_size: Tuple[int, int] = win_size
+        self.max_level: int = max_level
+        self.max_error: float = max_error
+        self.motion_speed: float = 0.0
+
+        self._prev_gray: Optional[np.ndarray] = None
+        self._hands: List[Hand] = []
+
+    @property
+    def has_hands(self) -> bool:
+        """
+        Returns:
+            bool: True when there are hands to track.
+        """
+
+        return bool(self._hands)
+
+    def reset(self, gray: np.ndarray, hands: List[Hand]) -> None:
+        """
+        Seed the tracker with hands found by the full detection.
+
+        Args:
+            gray (numpy.ndarray): Grayscale frame the hands were found in.
+            hands (List[Hand]): Detected hands.
+        """
+
+        self._prev_gray = gray
+        self._hands = hands
+
+    def track(self, gray: np.ndarray) -> Tuple[List[Hand], float]:
+        """
+        Track landmarks of the previous hands into the new frame.
+
+        Args:
+            gray (numpy.ndarray): New grayscale frame.
+
+        Returns:
+            Tuple[List[Hand], float]: Tracked hands and tracking confidence, the lowest share of successfully tracked
+                landmarks among the hands.
+        """
+
+        if self._prev_gray is None or not self._hands:
+            return [], 0.0
+
+        prev_points = np.concatenate([hand.landmarks[:, :2] for hand in self._hands]).reshape(-1, 1, 2)
+        next_points, status, error = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, prev_points, None,
+                                                              winSize=self.win_size, maxLevel=self.max_level)
+
+        landmarks_number = len(self._hands[0].landmarks)
+        tracked = ((status.ravel() == 1) & (error.ravel() < self.max_error)).reshape(len(self._hands), landmarks_number)
+        confidence = float(tracked.mean(axis=1).min())
+
+        next_points = next_points.reshape(len(self._hands), landmarks_number, 2)
+        displacements = np.linalg.norm(next_points - prev_points.reshape(next_points.shape), axis=2)
+        self.motion_speed = float(displacements[tracked].mean()) if tracked.any() else 0.0
+
+        all_hands: List[Hand] = []
+        for prev_hand, points, hand_tracked in zip(self._hands, next_points, tracked):
+            hand = Hand()
+
+            # Points lost by the optical flow are garbage, e.g. the pointer landmark, they stay where they were
+            landmarks = prev_hand.landmarks.copy()
+            landmarks[hand_tracked, :2] = points[hand_tracked]
+
+            hand.landmarks = landmarks
+            hand.border_box, hand.center = hu.calculate_border_box(landmarks)
+            hand.score = prev_hand.score
+            hand.type = prev_hand.type
+
+            all_hands.append(hand)
+
+        self._prev_gray = gray
+        self._hands = all_hands
+
+        return all_hands, confidence
@@ -1,66 +1,674 @@
+import time
+import signal
+import asyncio
+import threading
 import cv2
 import numpy as np
-from typing import List, Tuple, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Collection, Dict, List, Tuple, Any, Optional, Type, Union, TYPE_CHECKING
 
 from hcs.hand_gesture_detector import HandGestureDetector
 from hcs.camera_video_capture import CameraVideoCapture
+from hcs.camera_video_capture.capture_profile import CaptureProfile
 from hcs.hand_detector import HandDetector
 from hcs.mouse_controller import MouseController
-from hcs.fps import FPS
+from hcs.mouse_controller.pointer_filter import PointerFilter, create_pointer_filter
+from hcs.metrics import Metrics
+from hcs.utils.overlay_renderer import OverlayRenderer
 
 import hcs.utils.draw_utils as du
 
-from hcs.models import HandType, Hand, GestureType
+from hcs.models import HandType, Hand, GestureType, GestureClassificationResult, FramePacket, HandEvent, \
+    LandmarkEvent, GestureEvent, HCSEvent
+
+# Optional modules are imported only when the mode using them is enabled
+if TYPE_CHECKING:
+    from hcs.event_publisher import EventPublisher
+    from hcs.frame_source import FrameSource
+    from hcs.hand_detector.process_pool import DetectionProcessPool
+    from hcs.preview_sink import PreviewSink
+    from hcs.session_recorder import SessionRecorder
 
 
 class HandsControlSystem:
 
-    def __init__(self):
-        self.cap = CameraVideoCapture()
-        self.detector = HandDetector(max_num_hands=2, min_detection_confidence=0.8)
-        self.gesture_detector = HandGestureDetector()
-        self.mouse_control = MouseController()
-        self.fps_reader = FPS()
+    def __init__(self, headless: bool = False, preview_fps: float = 0.0,
+                 cap: Optional[Union[CameraVideoCapture, "FrameSource"]] = None,
+                 mouse_control: Optional[MouseController] = None, metrics: Optional[Metrics] = None,
+                 parallel_init: bool = True, warm_up: bool = True, shared_memory_slots: int = 0,
+                 pointer_filter: Optional[Union[str, PointerFilter]] = None, pointer_rate: float = 120.0,
+                 publisher: Optional["EventPublisher"] = None, recorder: Optional["SessionRecorder"] = None,
+                 capture_profile: Optional[Union[str, CaptureProfile]] = None):
+        """
+        Constructor.
+
+        Args:
+            headless (bool): Defaults to False. Flag to run without drawing and HighGUI calls on the control path.
+            preview_fps (float): Defaults to 0.0. Refresh rate of the optional preview window in headless mode,
+                the preview is disabled when 0.
+            cap (Optional[Union[CameraVideoCapture, FrameSource]]): Defaults to None. Source of frames, e.g. a video
+                file, the threaded camera capture when None.
+            mouse_control (Optional[MouseController]): Defaults to None. Mouse backend, e.g.
+                RecordingMouseController, the operating system mouse when None.
+            metrics (Optional[Metrics]): Defaults to None. Metrics the stage times and counters are recorded to,
+                new enabled metrics when None. Shown in the preview window instead of the FPS overlay.
+            parallel_init (bool): Defaults to True. Flag to open the camera, build the MediaPipe graph, load the
+                classification model and connect the mouse concurrently.
+            warm_up (bool): Defaults to True. Flag to run the detection and classification on dummy input before
+                the first frame.
+            shared_memory_slots (int): Defaults to 0. Number of frames of the shared memory ring the camera captures
+                into, needed by run_multiprocess, see DetectionProcessPool.ring_slots. Disabled when 0.
+            pointer_filter (Optional[Union[str, PointerFilter]]): Defaults to None. Filter of the pointer positions
+                or its name in POINTER_FILTERS, e.g. "kalman" to compensate the pipeline latency, the filter of the
+                mouse controller when None.
+            pointer_rate (float): Defaults to 120.0. Pointer moves per second of the created mouse controller,
+                independent of the camera frame rate, 0 moves the pointer once per frame.
+            publisher (Optional[EventPublisher]): Defaults to None. Started publisher the hands and gestures of every
+                frame are sent to after classification.
+            recorder (Optional[SessionRecorder]): Defaults to None. Recorder the hands and gestures of every frame are
+                appended to after classification, gets the frame size of the source when it has none. Closed by the
+                caller.
+            capture_profile (Optional[Union[str, CaptureProfile]]): Defaults to None. Camera mode of the created
+                camera capture or its name in CAPTURE_PROFILES, "auto" to choose it by probing the camera once, the
+                driver defaults when None.
+        """
+
+        self.metrics: Metrics = metrics if metrics is not None else Metrics()
+
+        cap_future: Optional["Future[CameraVideoCapture]"] = None
+        mouse_control_future: Optional["Future[MouseController]"] = None
+
+        try:
+            # Most of the work is done in native code releasing the GIL, so threads overlap well
+            with ThreadPoolExecutor(max_workers=4 if parallel_init else 1, thread_name_prefix="HCSInit") as executor:
+                cap_future = executor.submit(CameraVideoCapture, threaded=True, shared_memory_slots=shared_memory_slots,
+                                             profile=capture_profile) if cap is None else None
+                detector_future = executor.submit(HandDetector, max_num_hands=2, min_detection_confidence=0.8,
+                                                  reuse_buffers=True, metrics=self.metrics)
+                gesture_detector_future = executor.submit(HandGestureDetector)
+                mouse_control_future = executor.submit(
+                    MouseController, pointer_rate=pointer_rate) if mouse_control is None else None
+
+                self.cap = cap if cap_future is None else cap_future.result()
+                self.detector = detector_future.result()
+                self.gesture_detector = gesture_detector_future.result()
+                self.mouse_control = mouse_control if mouse_control_future is None else mouse_control_future.result()
+
+                if pointer_filter is not None:
+                    self.mouse_control.pointer_filter = create_pointer_filter(pointer_filter) if isinstance(
+                        pointer_filter, str) else pointer_filter
+
+                if warm_up:
+                    warm_up_futures = [
+                        executor.submit(self.detector.warm_up, self.cap.cam_width, self.cap.cam_height),
+                        executor.submit(self.gesture_detector.warm_up),
+                    ]
+
+                    for future in warm_up_futures:
+                        future.result()
+        except BaseException:
+            # The executor waited for all components, the created ones have threads holding the camera and the mouse
+            if cap_future is not None and cap_future.exception() is None:
+                cap_future.result().release()
+            if mouse_control_future is not None and mouse_control_future.exception() is None:
+                mouse_control_future.result().close()
+            raise
+
+        # Set when the first frame has been processed
+        self.first_frame_time: Optional[float] = None
 
         self.index_of_pointer_landmark: int = 5
         self.frame_reduction: int = 160
 
+        # End-to-end latency of the last processed frame in seconds
+        self.latency: float = 0.0
+
+        self._last_frame_time: Optional[float] = None
+        self._overlay_snapshot: Optional[dict] = None
+        self._overlay_snapshot_time: float = 0.0
+
+        self.overlay: OverlayRenderer = OverlayRenderer()
+
+        self.metrics.register_counter("frames_dropped_capture", lambda: getattr(self.cap, "dropped_frames", 0))
+        self.metrics.register_counter("actions_dropped", lambda: self.mouse_control.dropped_actions)
+        self.metrics.register_counter("actions_coalesced", lambda: self.mouse_control.coalesced_actions)
+        self.metrics.register_counter("pointer_moves", lambda: self.mouse_control.pointer_moves)
+        self.metrics.register_counter("pointer_moves_coalesced", lambda: self.mouse_control.coalesced_pointer_moves)
+        self.metrics.register_gauge("action_queue_depth", lambda: self.mouse_control.queue_depth)
+
+        self.publisher: Optional["EventPublisher"] = publisher
+        if publisher is not None:
+            self.metrics.register_counter("records_published", lambda: publisher.published_records)
+            self.metrics.register_counter("records_dropped_publisher", lambda: publisher.dropped_records)
+            self.metrics.register_gauge("subscribers", lambda: publisher.subscribers)
+
+        self.recorder: Optional["SessionRecorder"] = recorder
+        if recorder is not None:
+            if not recorder.frame_width:
+                recorder.frame_width, recorder.frame_height = self.cap.cam_width, self.cap.cam_height
+
+            self.metrics.register_counter("hands_recorded", lambda: recorder.records)
+
+        self.headless: bool = headless
+        self.stop_event: threading.Event = threading.Event()
+
+        self.preview: Optional["PreviewSink"] = None
+        if headless and preview_fps > 0:
+            from hcs.preview_sink import PreviewSink
+
+            self.preview = PreviewSink(self.__render_preview, preview_fps, on_quit=self.stop)
+
+    def stop(self) -> None:
+        """
+        Stop the running loop. Safe to call from other threads and signal handlers.
+        """
+
+        self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """
+        Stop the running loop on SIGINT and SIGTERM. Has to be called from the main thread.
+        """
+
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signal_number, lambda *_: self.stop())
+
     def run(self):
-        while self.cap.is_opened():
-            success, img = self.cap.read()
-            all_hands, img = self.detector.find_hands(img)
+        if self.preview is not None:
+            self.preview.start()
 
-            for hand in all_hands:
+        while self.cap.is_opened() and not self.stop_event.is_set():
+            read_start = time.perf_counter()
+            frame = self.cap.read_frame()
+            if frame is None:
+                continue
 
-                if hand.type == HandType.RIGHT:
-                    # Show boundary box
-                    du.draw_bounding_box(img, (self.frame_reduction, self.frame_reduction), (
-                        self.cap.cam_width - self.frame_reduction, self.cap.cam_height - self.frame_reduction))
+            self.metrics.record("capture", time.perf_counter() - read_start)
 
-                    self.__right_hand_control(img, hand)
+            # In threaded mode the frame was captured before the read, latencies are measured from the capture
+            img, frame_start = frame.image, frame.timestamp
 
-                if hand.type == HandType.LEFT:
-                    self.__left_hand_control(img, hand)
+            all_hands = self.detector.find_hands(img, draw=False)
 
-            # Shop FPS
-            _, img = self.fps_reader.update(img)
+            stage_start = time.perf_counter()
+            gesture_results = self.classify_hands(all_hands)
+            self.metrics.record("classification", time.perf_counter() - stage_start)
+            self.__export_frame(frame.frame_id, frame_start, all_hands, gesture_results)
+
+            stage_start = time.perf_counter()
+            self.control(all_hands, gesture_results, frame_start)
+            self.metrics.record("actuation", time.perf_counter() - stage_start)
+
+            if self.headless:
+                if self.preview is not None:
+                    self.preview.post(img, all_hands, gesture_results)
+                    self.preview.show()
+                self.__record_frame(frame_start, all_hands, gesture_results)
+                continue
+
+            stage_start = time.perf_counter()
+            img = self.__render_preview(img, all_hands, gesture_results, show_metrics=True)
 
             cv2.imshow("HCS - preview", img)
-            if cv2.waitKey(1) == ord('q'):
+            key = cv2.waitKey(1)
+            self.metrics.record("render", time.perf_counter() - stage_start)
+            self.__record_frame(frame_start, all_hands, gesture_results)
+
+            if key == ord('q'):
                 break
 
+        self.__shutdown()
+
+    def __shutdown(self) -> None:
+        if self.preview is not None:
+            self.preview.stop()
+
         self.cap.release()
-        cv2.destroyAllWindows()
+        self.mouse_control.close()
 
-    def __right_hand_control(self, img: Any, right_hand: Hand) -> None:
-        # Move pointer
-        x, y = self.__calculate_pointer_position(right_hand.landmarks)
-        self.mouse_control.move(x, y)
+        if not self.headless:
+            cv2.destroyAllWindows()
+
+    def run_pipelined(self, queue_size: int = 1):
+        """
+        Run the system as a pipeline of stages: capture -> landmark detection -> gesture classification ->
+        actuation -> render. Each stage except render works on its own thread and the stages are connected by
+        bounded queues that drop the oldest frame when full. Rendering stays on the calling thread because
+        HighGUI windows have to be handled there. In headless mode nothing is rendered on the calling thread.
+
+        When a stage raises, the pipeline finishes, the camera is released and the exception of the stage is raised
+        again.
+
+        Args:
+            queue_size (int): Defaults to 1. Size of the queues between stages.
+        """
+
+        from hcs.pipeline import Pipeline
+
+        pipeline = Pipeline(self.__capture_stage, self.__detection_stage, self.__classification_stage,
+                            self.__actuation_stage, queue_size=queue_size,
+                            names=["capture", "detection", "classification", "actuation"])
+        pipeline.start()
+
+        self.metrics.register_counter("frames_dropped_pipeline", lambda: pipeline.dropped)
+        self.metrics.register_counter("pipeline_stage_failures",
+                                      lambda: sum(stage.error is not None for stage in pipeline.stages))
+
+        last_frame_id = -1
+
+        if self.preview is not None:
+            self.preview.start()
+
+        try:
+            while self.cap.is_opened() and not self.stop_event.is_set():
+                packet: Optional[FramePacket] = pipeline.output.get(timeout=0.1)
+
+                if packet is None:
+                    if pipeline.output.closed:
+                        break
+                    continue
+
+                # Frames travel through the stages in order, a late frame is never rendered
+                if packet.frame.frame_id <= last_frame_id:
+                    continue
+                last_frame_id = packet.frame.frame_id
+
+                self.latency = time.perf_counter() - packet.frame.timestamp
+
+                if self.headless:
+                    if self.preview is not None:
+                        self.preview.post(packet.frame.image, packet.hands, packet.gesture_results)
+                        self.preview.show()
+                    self.__record_frame(packet.frame.timestamp, packet.hands, packet.gesture_results)
+                    continue
+
+                stage_start = time.perf_counter()
+                img = self.__render_preview(packet.frame.image, packet.hands, packet.gesture_results,
+                                            show_metrics=True)
+
+                cv2.imshow("HCS - preview", img)
+                key = cv2.waitKey(1)
+
+                packet.stage_timestamps["render"] = time.perf_counter()
+                self.metrics.record("render", packet.stage_timestamps["render"] - stage_start)
+                self.__record_frame(packet.frame.timestamp, packet.hands, packet.gesture_results)
+
+                if key == ord('q'):
+                    break
+        finally:
+            pipeline.stop()
+            self.__shutdown()
+
+        failed_stage = pipeline.failed_stage
+        if failed_stage is not None:
+            raise RuntimeError(f"Pipeline stage {failed_stage.name} failed") from failed_stage.error
+
+    def run_multiprocess(self, processes: int = 2):
+        """
+        Run the landmark detection in separate processes. The camera captures into a shared memory ring, a
+        dispatcher thread passes sequence numbers of new frames to the DetectionProcessPool and the calling thread
+        classifies, actuates and renders the hands coming back. Frames are never copied between processes.
+
+        Args:
+            processes (int): Defaults to 2. Number of detector processes.
+        """
+
+        from hcs.hand_detector.process_pool import DetectionProcessPool
+
+        ring = getattr(self.cap, "shared_ring", None)
+        if ring is None:
+            raise ValueError("Multi-process mode needs a CameraVideoCapture with shared_memory_slots")
+
+        pool = DetectionProcessPool(ring, processes, detector_kwargs={
+            "max_num_hands": 2, "min_detection_confidence": 0.8, "reuse_buffers": True})
+        pool.start()
+
+        self.metrics.register_counter("frames_dropped_processes", lambda: pool.dropped)
+        self.metrics.register_counter("frames_lost_processes", lambda: pool.lost)
+        self.metrics.register_gauge("detections_in_flight", lambda: pool.in_flight)
+
+        dispatcher_stop_event = threading.Event()
+        dispatcher = threading.Thread(target=self.__dispatch_frames, args=(pool, dispatcher_stop_event),
+                                      name="HCSFrameDispatcher", daemon=True)
+        dispatcher.start()
+
+        last_sequence = -1
+
+        if self.preview is not None:
+            self.preview.start()
+
+        try:
+            while self.cap.is_opened() and not self.stop_event.is_set():
+                result = pool.get(timeout=0.1)
+
+                if result is None:
+                    if not pool.is_alive():
+                        break
+                    continue
+
+                # Processes finish in any order, a late frame is never used
+                if result.hands is None or result.sequence <= last_sequence:
+                    continue
+                last_sequence = result.sequence
+
+                self.metrics.record("detection", result.detection_time)
+
+                stage_start = time.perf_counter()
+                gesture_results = self.classify_hands(result.hands)
+                self.metrics.record("classification", time.perf_counter() - stage_start)
+                self.__export_frame(result.sequence, result.timestamp, result.hands, gesture_results)
+
+                stage_start = time.perf_counter()
+                self.control(result.hands, gesture_results, result.timestamp)
+                self.metrics.record("actuation", time.perf_counter() - stage_start)
+
+                self.latency = time.perf_counter() - result.timestamp
+
+                img = None
+                if self.preview is not None or not self.headless:
+                    # Drawing works on a copy, the slot is going to be reused by the capture
+                    view = ring.view(result.sequence)
+                    img = view.copy() if view is not None else None
+
+                    # A slot reused during the copy gives a torn frame, it is not shown
+                    if img is not None and not ring.is_valid(result.sequence):
+                        img = None
+
+                if self.headless or img is None:
+                    if self.preview is not None and img is not None:
+                        self.preview.post(img, result.hands, gesture_results)
+                    if self.preview is not None:
+                        self.preview.show()
+                    self.__record_frame(result.timestamp, result.hands, gesture_results)
+                    continue
+
+                stage_start = time.perf_counter()
+                img = self.__render_preview(img, result.hands, gesture_results, show_metrics=True)
+
+                cv2.imshow("HCS - preview", img)
+                key = cv2.waitKey(1)
+
+                self.metrics.record("render", time.perf_counter() - stage_start)
+                self.__record_frame(result.timestamp, result.hands, gesture_results)
+
+                if key == ord('q'):
+                    break
+        finally:
+            dispatcher_stop_event.set()
+            dispatcher.join()
+            pool.stop()
+            self.__shutdown()
 
-        detection_result = self.gesture_detector.predict(right_hand)
+    async def events(self, buffer_size: int = 64, event_types: Optional[Collection[Type[HCSEvent]]] = None,
+                     control: bool = False) -> AsyncIterator[HCSEvent]:
+        """
+        Stream hand, landmark and gesture events to an asyncio application:
 
-        # Draw right hand detection info
-        du.draw_gesture_info(img, detection_result, right_hand.border_box)
+            async for event in hcs.events(event_types=[GestureEvent]):
+                ...
+
+        Capture and inference run on executor threads, never on the event loop, and the capture of the next frame
+        overlaps the inference of the current one. Events wait in a buffer of buffer_size events; while it is full
+        the inference waits for the consumer, and the latest-frame capture drops the frames captured meanwhile, so
+        a slow consumer gets recent events instead of a growing backlog.
+
+        Mouse actuation is an optional consumer of the processed frames, enabled with control. Like run, the stream
+        releases the camera when it ends: at the end of the source, after stop, or when the generator is closed,
+        explicitly with aclose or by the event loop once a consumer that stopped iterating has dropped it. The
+        optional preview window is handled on the event loop thread.
+
+        Args:
+            buffer_size (int): Defaults to 64. Maximum number of events waiting for the consumer.
+            event_types (Optional[Collection[Type[HCSEvent]]]): Defaults to None. Event types to stream, e.g.
+                [GestureEvent], all of them when None.
+            control (bool): Defaults to False. Flag to perform mouse actions for the processed frames.
+
+        Returns:
+            AsyncIterator[HCSEvent]: HandEvent when a hand appears or disappears, LandmarkEvent for every detected
+                hand of every frame and GestureEvent for every classified hand.
+        """
+
+        loop = asyncio.get_running_loop()
+        buffer: "asyncio.Queue[Optional[HCSEvent]]" = asyncio.Queue(max(1, buffer_size))
+        event_types = tuple(event_types) if event_types is not None else (HandEvent, LandmarkEvent, GestureEvent)
+
+        # The detector keeps tracking state between frames, so inference runs on a single thread
+        capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="HCSEventsCapture")
+        inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="HCSEventsInference")
+
+        self.metrics.register_gauge("event_buffer_depth", buffer.qsize)
+
+        async def produce() -> None:
+            present_hands: Dict[HandType, Hand] = {}
+            capture: Optional["asyncio.Future[Optional[FramePacket]]"] = None
+
+            try:
+                capture = loop.run_in_executor(capture_executor, self.__capture_stage, None)
+
+                while self.cap.is_opened() and not self.stop_event.is_set():
+                    packet = await capture
+                    capture = loop.run_in_executor(capture_executor, self.__capture_stage, None)
+
+                    if packet is None:
+                        continue
+
+                    packet = await loop.run_in_executor(inference_executor, self.__infer_stage, packet, control)
+                    self.latency = time.perf_counter() - packet.frame.timestamp
+
+                    for event in self.__frame_events(packet, present_hands):
+                        if isinstance(event, event_types):
+                            await buffer.put(event)
+
+                    if self.preview is not None:
+                        self.preview.post(packet.frame.image, packet.hands, packet.gesture_results)
+                        self.preview.show()
+                    self.__record_frame(packet.frame.timestamp, packet.hands, packet.gesture_results)
+
+                # End marker after the buffered events
+                await buffer.put(None)
+            except Exception:
+                # The consumer stops at the end marker and gets the error, the buffered events are dropped
+                while buffer.full():
+                    buffer.get_nowait()
+                buffer.put_nowait(None)
+                raise
+            finally:
+                if capture is not None:
+                    capture.cancel()
+
+        def wait_for_executors() -> None:
+            capture_executor.shutdown(wait=True)
+            inference_executor.shutdown(wait=True)
+
+        if self.preview is not None:
+            self.preview.start()
+
+        producer = loop.create_task(produce())
+
+        try:
+            while True:
+                event = await buffer.get()
+                if event is None:
+                    break
+
+                yield event
+
+            # Errors of the capture or the inference are raised to the consumer
+            await producer
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+            # Captures and inferences in flight finish before the camera is released
+            await loop.run_in_executor(None, wait_for_executors)
+            self.__shutdown()
+
+    def __infer_stage(self, packet: FramePacket, control: bool) -> FramePacket:
+        packet = self.__classification_stage(self.__detection_stage(packet))
+
+        return self.__actuation_stage(packet) if control else packet
+
+    @staticmethod
+    def __frame_events(packet: FramePacket, present_hands: Dict[HandType, Hand]) -> List[HCSEvent]:
+        frame_id, timestamp = packet.frame.frame_id, packet.frame.timestamp
+        hands = {hand.type: hand for hand in packet.hands}
+        events: List[HCSEvent] = []
+
+        for hand_type in sorted(present_hands.keys() - hands.keys(), key=lambda lost_type: lost_type.value):
+            events.append(HandEvent(frame_id, timestamp, hand_type, False))
+        for hand_type in sorted(hands.keys() - present_hands.keys(), key=lambda found_type: found_type.value):
+            events.append(HandEvent(frame_id, timestamp, hand_type, True, hands[hand_type]))
+
+        present_hands.clear()
+        present_hands.update(hands)
+
+        for hand, result in zip(packet.hands, packet.gesture_results):
+            events.append(LandmarkEvent(frame_id, timestamp, hand))
+
+            if result is not None:
+                events.append(GestureEvent(frame_id, timestamp, hand, result))
+
+        return events
+
+    def __dispatch_frames(self, pool: "DetectionProcessPool", stop_event: threading.Event) -> None:
+        while self.cap.is_opened() and not stop_event.is_set():
+            start_time = time.perf_counter()
+            frame = self.cap.read_frame()
+
+            if frame is None:
+                continue
+
+            self.metrics.record("capture", time.perf_counter() - start_time)
+            pool.submit(frame.frame_id, frame.timestamp)
+
+    def __capture_stage(self, _: None) -> Optional[FramePacket]:
+        start_time = time.perf_counter()
+        frame = self.cap.read_frame()
+
+        if frame is None:
+            return None
+
+        self.metrics.record("capture", time.perf_counter() - start_time)
+
+        return FramePacket(frame)
+
+    def __detection_stage(self, packet: FramePacket) -> FramePacket:
+        packet.hands = self.detector.find_hands(packet.frame.image, draw=False)
+
+        return packet
+
+    def __classification_stage(self, packet: FramePacket) -> FramePacket:
+        start_time = time.perf_counter()
+        packet.gesture_results = self.classify_hands(packet.hands)
+        self.metrics.record("classification", time.perf_counter() - start_time)
+        self.__export_frame(packet.frame.frame_id, packet.frame.timestamp, packet.hands, packet.gesture_results)
+
+        return packet
+
+    def __export_frame(self, frame_id: int, timestamp: float, hands: List[Hand],
+                       gesture_results: List[Optional[GestureClassificationResult]]) -> None:
+        if self.publisher is not None:
+            self.publisher.publish(frame_id, timestamp, hands, gesture_results)
+
+        if self.recorder is not None:
+            self.recorder.record(frame_id, timestamp, hands, gesture_results)
+
+    def __actuation_stage(self, packet: FramePacket) -> FramePacket:
+        start_time = time.perf_counter()
+        self.control(packet.hands, packet.gesture_results, packet.frame.timestamp)
+        self.metrics.record("actuation", time.perf_counter() - start_time)
+
+        return packet
+
+    def __record_frame(self, frame_start: float, hands: List[Hand],
+                       gesture_results: List[Optional[GestureClassificationResult]]) -> None:
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter()
+
+        if not self.metrics.enabled:
+            return
+
+        now = time.perf_counter()
+
+        self.metrics.record("end_to_end", now - frame_start)
+        if self._last_frame_time is not None:
+            self.metrics.record("frame_interval", now - self._last_frame_time)
+        self._last_frame_time = now
+
+        self.metrics.increment("frames_processed")
+        self.metrics.increment("hands_detected", len(hands))
+
+        for result in gesture_results:
+            if result is not None:
+                self.metrics.increment("gestures_classified", labels={"gesture": result.gesture_type.name})
+
+    def classify_hands(self, hands: List[Hand]) -> List[Optional[GestureClassificationResult]]:
+        """
+        Classify gestures of all hands of a frame.
+
+        Args:
+            hands (List[Hand]): Hands of the frame.
+
+        Returns:
+            List[Optional[GestureClassificationResult]]: Classification result of every hand.
+        """
+
+        return self.gesture_detector.predict_batch(hands)
+
+    def control(self, hands: List[Hand], gesture_results: List[Optional[GestureClassificationResult]],
+                timestamp: Optional[float] = None) -> None:
+        """
+        Perform mouse actions for the hands of a frame.
+
+        Args:
+            hands (List[Hand]): Hands of the frame.
+            gesture_results (List[Optional[GestureClassificationResult]]): Classification result of every hand.
+            timestamp (Optional[float]): Defaults to None. Capture time of the frame, used by the pointer filter to
+                compensate the pipeline latency, the current time when None.
+        """
+
+        right_hand_found = False
+
+        for hand, detection_result in zip(hands, gesture_results):
+
+            if hand.type == HandType.RIGHT:
+                self.__right_hand_control(hand, detection_result, timestamp)
+                right_hand_found = True
+
+            if hand.type == HandType.LEFT:
+                self.__left_hand_control(detection_result)
+
+        # The speed of a lost hand is not extrapolated when it comes back
+        if not right_hand_found:
+            self.mouse_control.reset_pointer()
+
+    def __render_preview(self, img: Any, hands: List[Hand],
+                         gesture_results: List[Optional[GestureClassificationResult]],
+                         show_metrics: bool = False) -> Any:
+        if any(hand.type == HandType.RIGHT for hand in hands):
+            du.draw_bounding_box(img, (self.frame_reduction, self.frame_reduction),
+                                 (img.shape[1] - self.frame_reduction, img.shape[0] - self.frame_reduction))
+
+        for hand, detection_result in zip(hands, gesture_results):
+            self.overlay.draw_hand(img, hand)
+            self.overlay.draw_gesture_info(img, detection_result, hand.border_box)
+
+        if show_metrics and self.metrics.enabled:
+            # Percentiles are recomputed twice per second, not on every frame
+            now = time.perf_counter()
+            if self._overlay_snapshot is None or now - self._overlay_snapshot_time > 0.5:
+                self._overlay_snapshot = self.metrics.snapshot()
+                self._overlay_snapshot_time = now
+
+            self.overlay.draw_metrics(img, self._overlay_snapshot)
+
+        return img
+
+    def __right_hand_control(self, right_hand: Hand, detection_result: Optional[GestureClassificationResult],
+                             timestamp: Optional[float] = None) -> None:
+        # Move pointer
+        x, y = self.__calculate_pointer_position(right_hand.landmarks)
+        self.mouse_control.move(x, y, timestamp)
 
         # Check if the hand gesture has been classified
         if detection_result:
@@ -76,7 +684,7 @@ class HandsControlSystem:
             if detection_result.gesture_type == GestureType.GO_BACK:
                 self.mouse_control.go_back()
 
-    def __calculate_pointer_position(self, landmarks: List[List[float]]) -> Tuple[float, float]:
+    def __calculate_pointer_position(self, landmarks: np.ndarray) -> Tuple[float, float]:
         x1, y1, _ = landmarks[self.index_of_pointer_landmark]
 
         x2 = np.interp(x1, (self.frame_reduction, self.cap.cam_width - self.frame_reduction),
@@ -86,12 +694,7 @@ class HandsControlSystem:
 
         return x2, y2
 
-    def __left_hand_control(self, img: Any, left_hand: Hand) -> None:
-        detection_result = self.gesture_detector.predict(left_hand)
-
-        # Draw left hand detection info
-        du.draw_gesture_info(img, detection_result, left_hand.border_box)
-
+    def __left_hand_control(self, detection_result: Optional[GestureClassificationResult]) -> None:
         # Check if the hand gesture has been classified
         if detection_result:
             # Left button mouse click
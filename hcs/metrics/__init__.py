@@ -0,0 +1,276 @@
+import time
+import threading
+import numpy as np
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class RollingHistogram:
+    """
+    Latency histogram over the latest recorded values, kept in a fixed size ring buffer.
+
+    Attributes:
+        window (int): Number of latest values the percentiles are computed from.
+        count (int): Number of all recorded values.
+        total (float): Sum of all recorded values.
+        _values (List[float]): Ring buffer of the latest values, a list is cheaper to write to than an array.
+    """
+
+    def __init__(self, window: int = 1024):
+        """
+        Constructor.
+
+        Args:
+            window (int): Defaults to 1024. Number of latest values the percentiles are computed from.
+        """
+
+        self.window: int = window
+        self.count: int = 0
+        self.total: float = 0.0
+
+        self._values: List[float] = [0.0] * window
+
+    def record(self, value: float) -> None:
+        """
+        Record a value.
+
+        Args:
+            value (float): Recorded value.
+        """
+
+        self._values[self.count % self.window] = value
+        self.count += 1
+        self.total += value
+
+    def percentiles(self, quantiles: Tuple[float, ...]) -> List[float]:
+        """
+        Percentiles of the values in the window.
+
+        Args:
+            quantiles (Tuple[float, ...]): Quantiles in the range [0, 1].
+
+        Returns:
+            List[float]: Percentile of every quantile, zeros when nothing was recorded.
+        """
+
+        if not self.count:
+            return [0.0] * len(quantiles)
+
+        values = np.array(self._values[:min(self.count, self.window)])
+
+        return [float(value) for value in np.quantile(values, quantiles)]
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: Number of values, mean, p50, p95, p99 and max of the window in milliseconds.
+        """
+
+        values = np.array(self._values[:min(self.count, self.window)])
+        p50, p95, p99 = self.percentiles(Metrics.QUANTILES)
+
+        return {
+            "count": self.count,
+            "mean_ms": float(values.mean()) * 1000 if len(values) else 0.0,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "p99_ms": p99 * 1000,
+            "max_ms": float(values.max()) * 1000 if len(values) else 0.0,
+        }
+
+
+class Metrics:
+    """
+    Processing metrics: rolling per-stage latency histograms, event counters and values collected on demand, such
+    as dropped frames. Stages record durations in seconds, e.g. capture, color_conversion, mediapipe,
+    landmark_postprocessing, classification, actuation and render.
+
+    Recording is thread safe. A disabled instance returns right away from every recording call, so instrumented
+    code costs only a couple of clock reads.
+
+    Attributes:
+        QUANTILES (Tuple[float, ...]): Quantiles reported for every stage.
+        enabled (bool): Flag to record metrics.
+        window (int): Number of latest values of every stage histogram.
+        start_time (float): Creation time.
+        _histograms (Dict[str, RollingHistogram]): Histogram of every stage.
+        _counters (Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int]): Counters by name and labels.
+        _collected_counters (Dict[str, Callable[[], float]]): Functions returning current values of counters.
+        _collected_gauges (Dict[str, Callable[[], float]]): Functions returning current values of gauges.
+        _lock (threading.Lock): Lock of the recorded values.
+    """
+
+    QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+    def __init__(self, enabled: bool = True, window: int = 1024):
+        """
+        Constructor.
+
+        Args:
+            enabled (bool): Defaults to True. Flag to record metrics.
+            window (int): Defaults to 1024. Number of latest values of every stage histogram.
+        """
+
+        self.enabled: bool = enabled
+        self.window: int = window
+        self.start_time: float = time.perf_counter()
+
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+        self._collected_counters: Dict[str, Callable[[], float]] = {}
+        self._collected_gauges: Dict[str, Callable[[], float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, stage: str, duration: float) -> None:
+        """
+        Record a stage duration.
+
+        Args:
+            stage (str): Stage name.
+            duration (float): Duration in seconds.
+        """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            histogram = self._histograms.get(stage)
+
+            if histogram is None:
+                histogram = self._histograms[stage] = RollingHistogram(self.window)
+
+            histogram.record(duration)
+
+    def increment(self, name: str, amount: int = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): Counter name.
+            amount (int): Defaults to 1. Increment.
+            labels (Optional[Dict[str, str]]): Defaults to None. Labels of the counter, e.g. gesture type.
+        """
+
+        if not self.enabled:
+            return
+
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def register_counter(self, name: str, collect: Callable[[], float]) -> None:
+        """
+        Register a counter kept elsewhere, e.g. dropped frames of the camera capture. Its value is read only when
+        a snapshot is taken.
+
+        Args:
+            name (str): Counter name.
+            collect (Callable[[], float]): Function returning the current value.
+        """
+
+        self._collected_counters[name] = collect
+
+    def register_gauge(self, name: str, collect: Callable[[], float]) -> None:
+        """
+        Register a gauge, e.g. queue depth. Its value is read only when a snapshot is taken.
+
+        Args:
+            name (str): Gauge name.
+            collect (Callable[[], float]): Function returning the current value.
+        """
+
+        self._collected_gauges[name] = collect
+
+    def snapshot(self) -> Dict:
+        """
+        Current state of all metrics.
+
+        Returns:
+            Dict: Uptime, stage summaries in milliseconds, counters with their mean rate per second and gauges.
+                Labeled counters are keyed like name{label="value"}.
+        """
+
+        with self._lock:
+            stages = {stage: histogram.summary() for stage, histogram in self._histograms.items()}
+            counters = {_format_key(name, labels): value for (name, labels), value in self._counters.items()}
+
+        counters.update({name: collect() for name, collect in self._collected_counters.items()})
+        uptime = time.perf_counter() - self.start_time
+
+        return {
+            "uptime_s": uptime,
+            "stages": stages,
+            "counters": counters,
+            "rates_per_s": {name: value / uptime if uptime > 0 else 0.0 for name, value in counters.items()},
+            "gauges": {name: collect() for name, collect in self._collected_gauges.items()},
+        }
+
+    def to_prometheus(self, prefix: str = "hcs", labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Metrics in the Prometheus text exposition format. Stage histograms are exported as summaries in seconds.
+
+        Args:
+            prefix (str): Defaults to "hcs". Prefix of metric names.
+            labels (Optional[Dict[str, str]]): Defaults to None. Labels added to every sample, e.g. stream name.
+
+        Returns:
+            str: Metrics text.
+        """
+
+        common = tuple(sorted(labels.items())) if labels else ()
+        lines = [f"# TYPE {prefix}_stage_seconds summary"]
+
+        with self._lock:
+            for stage, histogram in self._histograms.items():
+                stage_labels = common + (("stage", stage),)
+
+                for quantile, value in zip(self.QUANTILES, histogram.percentiles(self.QUANTILES)):
+                    quantile_labels = stage_labels + (("quantile", str(quantile)),)
+                    lines.append(f"{_format_key(f'{prefix}_stage_seconds', quantile_labels)} {value!r}")
+                lines.append(f"{_format_key(f'{prefix}_stage_seconds_sum', stage_labels)} {histogram.total!r}")
+                lines.append(f"{_format_key(f'{prefix}_stage_seconds_count', stage_labels)} {histogram.count}")
+
+            counters = [(name, common + counter_labels, value)
+                        for (name, counter_labels), value in self._counters.items()]
+
+        counters += [(name, common, collect()) for name, collect in self._collected_counters.items()]
+
+        for name in sorted({name for name, _, _ in counters}):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines += [f"{_format_key(f'{prefix}_{name}_total', counter_labels)} {value}"
+                      for counter_name, counter_labels, value in counters if counter_name == name]
+
+        for name, collect in self._collected_gauges.items():
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{_format_key(f'{prefix}_{name}', common)} {collect()}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """
+        Remove recorded values and restart the uptime.
+        """
+
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.start_time = time.perf_counter()
+
+
+def _format_key(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Format a metric name with labels.
+
+    Args:
+        name (str): Metric name.
+        labels (Tuple[Tuple[str, str], ...]): Label names and values.
+
+    Returns:
+        str: Name like name{label="value"}.
+    """
+
+    if not labels:
+        return name
+
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
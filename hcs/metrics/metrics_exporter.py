@@ -0,0 +1,100 @@
+import os
+import json
+import threading
+
+from typing import Optional
+
+from hcs.metrics import Metrics
+
+
+class MetricsExporter:
+    """
+    Writes metrics snapshots to a file at a fixed interval on a background thread, as JSON or in the Prometheus
+    text format (e.g. for the node_exporter textfile collector). The file is replaced atomically, so readers never
+    see a partial snapshot.
+
+    Attributes:
+        FORMATS (Tuple[str, ...]): Supported formats.
+        metrics (Metrics): Exported metrics.
+        path (str): Path to the exported file.
+        interval (float): Export interval in seconds.
+        format (str): Export format, "json" or "prometheus".
+        exports (int): Number of written snapshots.
+        _stop_event (threading.Event): Event stopping the export thread.
+        _thread (Optional[threading.Thread]): Export thread.
+    """
+
+    FORMATS = ("json", "prometheus")
+
+    def __init__(self, metrics: Metrics, path: str, interval: float = 5.0, format: Optional[str] = None):
+        """
+        Constructor.
+
+        Args:
+            metrics (Metrics): Exported metrics.
+            path (str): Path to the exported file.
+            interval (float): Defaults to 5.0. Export interval in seconds.
+            format (Optional[str]): Defaults to None. Export format, "json" or "prometheus", chosen by the file
+                extension when None: Prometheus for .prom, JSON otherwise.
+        """
+
+        if format is None:
+            format = "prometheus" if path.endswith(".prom") else "json"
+
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported metrics format: {format}")
+
+        self.metrics: Metrics = metrics
+        self.path: str = path
+        self.interval: float = interval
+        self.format: str = format
+        self.exports: int = 0
+
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the export thread.
+        """
+
+        self._thread = threading.Thread(target=self._run, name="MetricsExporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the export thread, writing the final snapshot.
+        """
+
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def export(self) -> None:
+        """
+        Write the current snapshot.
+        """
+
+        if self.format == "prometheus":
+            text = self.metrics.to_prometheus()
+        else:
+            text = json.dumps(self.metrics.snapshot(), indent=2)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(text)
+
+        os.replace(tmp_path, self.path)
+        self.exports += 1
+
+    def _run(self) -> None:
+        """
+        Export thread loop.
+        """
+
+        while not self._stop_event.wait(self.interval):
+            self.export()
+
+        self.export()
@@ -1,4 +1,7 @@
+from hcs.models.frame import Frame
+from hcs.models.frame_packet import FramePacket
 from hcs.models.gesture_classification_result import GestureClassificationResult
 from hcs.models.gesture_type import GestureType
 from hcs.models.hand import Hand
 from hcs.models.hand_type import HandType
+from hcs.models.hand_event import HandEvent, LandmarkEvent, GestureEvent, HCSEvent
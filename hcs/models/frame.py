@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class Frame:
+    frame_id: int
+    timestamp: float
+    image: Any
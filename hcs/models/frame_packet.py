@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from hcs.models.frame import Frame
+from hcs.models.gesture_classification_result import GestureClassificationResult
+from hcs.models.hand import Hand
+
+
+@dataclass
+class FramePacket:
+    frame: Frame
+    hands: List[Hand] = field(default_factory=list)
+    gesture_results: List[Optional[GestureClassificationResult]] = field(default_factory=list)
+    stage_timestamps: Dict[str, float] = field(default_factory=dict)
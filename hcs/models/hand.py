@@ -1,6 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import List, Tuple, NamedTuple
 
+import numpy as np
+
 from hcs.models.hand_type import HandType
 
 
@@ -11,10 +13,20 @@ class BorderBox(NamedTuple):
     height: int
 
 
-@dataclass
+@dataclass(init=False, eq=False)
 class Hand:
-    landmarks: List[List[float]] = field(init=False)
-    border_box: BorderBox = field(init=False)
-    center: Tuple[int, int] = field(init=False)
-    score: float = field(init=False)
-    type: HandType = field(init=False)
+    __slots__ = ("landmarks", "border_box", "center", "score", "type")
+
+    landmarks: np.ndarray
+    border_box: BorderBox
+    center: Tuple[int, int]
+    score: float
+    type: HandType
+
+    @property
+    def landmarks_list(self) -> List[List[float]]:
+        """
+        Compatibility view of the (21, 3) landmarks array as a list of [x, y, z] lists.
+        """
+
+        return self.landmarks.tolist()
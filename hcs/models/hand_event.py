@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from hcs.models.gesture_classification_result import GestureClassificationResult
+from hcs.models.hand import Hand
+from hcs.models.hand_type import HandType
+
+
+@dataclass
+class HandEvent:
+    """
+    A hand appeared in or disappeared from the camera image.
+    """
+
+    frame_id: int
+    timestamp: float
+    hand_type: HandType
+    present: bool
+    hand: Optional[Hand] = None
+
+
+@dataclass
+class LandmarkEvent:
+    """
+    Landmarks of a hand detected in a frame.
+    """
+
+    frame_id: int
+    timestamp: float
+    hand: Hand
+
+
+@dataclass
+class GestureEvent:
+    """
+    Gesture classified for a hand detected in a frame.
+    """
+
+    frame_id: int
+    timestamp: float
+    hand: Hand
+    result: GestureClassificationResult
+
+
+HCSEvent = Union[HandEvent, LandmarkEvent, GestureEvent]
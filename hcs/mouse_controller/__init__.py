@@ -1,7 +1,17 @@
 import time
 
-import autopy
-from autopy.key import Code, Modifier
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import autopy
+    from autopy.key import Code, Modifier
+except ImportError:
+    # Headless machines without a desktop use RecordingMouseController or NullMouseController
+    autopy = None
+
+from hcs.mouse_controller.action_executor import ActionExecutor
+from hcs.mouse_controller.pointer_filter import ExponentialFilter, PointerFilter
+from hcs.mouse_controller.pointer_interpolator import PointerInterpolator
 
 
 class MouseController:
@@ -12,91 +22,296 @@ class MouseController:
         * grab - grab and moving elements
         * go_back - an action imitating a keyboard shortcut LEFT_ARROW + ALT
 
+    The operating system is only touched in the _move_pointer, _click_button, _toggle_button and _tap_navigation_key
+    primitives, which RecordingMouseController and NullMouseController override.
+
+    Pointer positions pass through a PointerFilter. The default exponential smoothing trades lag for steadiness,
+    OneEuroFilter and KalmanPredictor reduce the lag, the latter also compensates the time a frame spent in the
+    pipeline when move gets its capture timestamp.
+
+    In asynchronous mode actions are executed by an ActionExecutor worker thread and repeated requests are
+    debounced with per-action cooldowns, and the pointer is moved by a PointerInterpolator thread at pointer_rate,
+    independent of the camera frame rate, so the calling thread is never blocked.
+
     Attributes:
+        ACTION_COOLDOWNS (Dict[str, float]): Default cooldown in seconds of each action.
         screen_width (float): Device screen width.
         screen_height (float): Device screen height.
-        _smoothing_factor (float): Mouse marker movement smoothing factor.
-        _prev_location_x (float): X previous mouse marker location.
-        _prev_location_y (float): Y previous mouse marker location.
-        _curr_location_x (float): X current mouse marker location.
-        _curr_location_y (float): Y current mouse marker location.
+        pointer_filter (PointerFilter): Filter of the pointer positions.
         _active_grab (bool): Flag active grab action.
+        _action_cooldowns (Dict[str, float]): Cooldown in seconds of each action.
+        _executor (Optional[ActionExecutor]): Executor of actions in asynchronous mode.
+        _pointer (Optional[PointerInterpolator]): Pointer thread in asynchronous mode.
     """
 
-    def __init__(self, smoothing_factor: float = 7.0):
+    ACTION_COOLDOWNS: Dict[str, float] = {
+        "click": 0.2,
+        "grab": 0.3,
+        "go_back": 0.3,
+        "go_forward": 0.3,
+    }
+
+    def __init__(self, smoothing_factor: float = 7.0, asynchronous: bool = True,
+                 action_cooldowns: Optional[Dict[str, float]] = None, action_queue_size: int = 4,
+                 screen_size: Optional[Tuple[float, float]] = None, pointer_filter: Optional[PointerFilter] = None,
+                 pointer_rate: float = 120.0):
         """
         Constructor.
 
         Args:
-            smoothing_factor (float): Defaults to 7.0 . Mouse marker movement smoothing factor.
+            smoothing_factor (float): Defaults to 7.0 . Mouse marker movement smoothing factor of the default
+                pointer filter.
+            asynchronous (bool): Defaults to True. Flag to execute actions on a worker thread instead of blocking.
+            action_cooldowns (Optional[Dict[str, float]]): Defaults to None. Cooldowns overriding ACTION_COOLDOWNS.
+            action_queue_size (int): Defaults to 4. Maximum number of pending actions in asynchronous mode.
+            screen_size (Optional[Tuple[float, float]]): Defaults to None. Screen size, read from the device when None.
+            pointer_filter (Optional[PointerFilter]): Defaults to None. Filter of the pointer positions, exponential
+                smoothing with smoothing_factor when None.
+            pointer_rate (float): Defaults to 120.0. Pointer moves per second in asynchronous mode, e.g. the display
+                refresh rate, 0 moves the pointer once per move call.
         """
 
-        self._smoothing_factor: float = smoothing_factor
+        self._pointer_filter: PointerFilter = pointer_filter if pointer_filter is not None else ExponentialFilter(
+            smoothing_factor)
 
-        self.screen_width, self.screen_height = autopy.screen.size()
-        self._prev_location_x, self._prev_location_y = 0, 0
-        self._curr_location_x, self._curr_location_y = 0, 0
+        self.screen_width, self.screen_height = screen_size if screen_size is not None else autopy.screen.size()
         self._active_grab: bool = False
 
-    def move(self, x: float, y: float) -> None:
+        self._action_cooldowns: Dict[str, float] = {**self.ACTION_COOLDOWNS, **(action_cooldowns or {})}
+        self._executor: Optional[ActionExecutor] = None
+        self._pointer: Optional[PointerInterpolator] = None
+
+        if asynchronous:
+            self._executor = ActionExecutor(self._action_cooldowns, action_queue_size)
+
+            if pointer_rate > 0:
+                self._pointer = PointerInterpolator(self._move_pointer, self._pointer_filter, pointer_rate)
+
+    @property
+    def pointer_filter(self) -> PointerFilter:
+        """
+        Returns:
+            PointerFilter: Filter of the pointer positions.
+        """
+
+        return self._pointer_filter
+
+    @pointer_filter.setter
+    def pointer_filter(self, pointer_filter: PointerFilter) -> None:
+        self._pointer_filter = pointer_filter
+
+        if self._pointer is not None:
+            self._pointer.pointer_filter = pointer_filter
+
+    def move(self, x: float, y: float, timestamp: Optional[float] = None) -> None:
         """
         Move mouse pointer action.
 
         Args:
             x (float): X mouse marker location.
             y (float): Y mouse marker location.
+            timestamp (Optional[float]): Defaults to None. Capture time of the frame the location was measured in,
+                time.perf_counter based, the current time when None.
         """
 
+        now = time.perf_counter()
+        timestamp = timestamp if timestamp is not None else now
+
+        # Mirror the camera image
+        x = self.screen_width - x
+
+        if self._pointer is not None:
+            self._pointer.post(x, y, timestamp)
+            return
+
         # Smoothen values
-        curr_location_x = self._prev_location_x + (x - self._prev_location_x) / self._smoothing_factor
-        curr_location_y = self._prev_location_y + (y - self._prev_location_y) / self._smoothing_factor
+        location_x, location_y = self._pointer_filter.filter(x, y, timestamp, now)
 
         # using int remove error in 'autopy.mouse.move()'
-        autopy.mouse.move(int(self.screen_width - curr_location_x), int(curr_location_y))
+        self._move_pointer(int(location_x), int(location_y))
 
-        self._prev_location_x, self._prev_location_y = curr_location_x, curr_location_y
+    def reset_pointer(self) -> None:
+        """
+        Forget the pointer filter state, e.g. when the hand has been lost.
+        """
+
+        if self._pointer is not None:
+            self._pointer.reset()
+        else:
+            self._pointer_filter.reset()
 
     def click(self) -> None:
         """
         Mouse left button click action.
         """
 
-        autopy.mouse.click()
+        self._perform("click", self._click)
+
+    def grab(self) -> None:
+        """
+        The action of grabbing items with the mouse.
+        """
+
+        self._perform("grab", self._grab)
+
+    def go_back(self) -> None:
+        """
+        An action imitating a keyboard shortcut LEFT_ARROW + ALT.
+        """
+
+        self._perform("go_back", self._go_back)
+
+    def go_forward(self) -> None:
+        """
+        An action imitating a keyboard shortcut RIGHT_ARROW + ALT.
+        """
+
+        self._perform("go_forward", self._go_forward)
+
+    def close(self) -> None:
+        """
+        Execute pending actions and stop the action executor and the pointer thread.
+        """
+
+        if self._executor is not None:
+            self._executor.close()
+
+        if self._pointer is not None:
+            self._pointer.close()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Returns:
+            int: Number of actions waiting for execution.
+        """
+
+        return self._executor.queue_depth if self._executor is not None else 0
+
+    @property
+    def dropped_actions(self) -> int:
+        """
+        Returns:
+            int: Number of actions dropped because the action queue was full.
+        """
+
+        return self._executor.dropped_actions if self._executor is not None else 0
+
+    @property
+    def coalesced_actions(self) -> int:
+        """
+        Returns:
+            int: Number of actions coalesced by the action cooldowns.
+        """
+
+        return self._executor.coalesced_actions if self._executor is not None else 0
+
+    @property
+    def pointer_moves(self) -> int:
+        """
+        Returns:
+            int: Number of pointer moves performed by the pointer thread.
+        """
+
+        return self._pointer.emitted_moves if self._pointer is not None else 0
+
+    @property
+    def coalesced_pointer_moves(self) -> int:
+        """
+        Returns:
+            int: Number of pointer thread ticks without a move because the pointer position did not change.
+        """
+
+        return self._pointer.coalesced_moves if self._pointer is not None else 0
+
+    def _perform(self, name: str, action: Callable[[], None]) -> None:
+        """
+        Perform the action on the executor, or directly followed by the cooldown sleep in synchronous mode.
+
+        Args:
+            name (str): Action name.
+            action (Callable[[], None]): Function performing the action.
+        """
+
+        if self._executor is not None:
+            self._executor.submit(name, action)
+        else:
+            action()
+            time.sleep(self._action_cooldowns[name])
+
+    def _click(self) -> None:
+        """
+        Left mouse button click.
+        """
+
+        self._click_button()
 
         # Reset grab flag
         self._reset_grab_action()
 
-        time.sleep(0.2)
-
-    def grab(self) -> None:
+    def _grab(self) -> None:
         """
-        The action of grabbing items with the mouse.
+        Toggle left mouse button to grab or release items.
         """
 
         if self._active_grab:
-            autopy.mouse.toggle(down=False)
+            self._toggle_button(down=False)
         else:
-            autopy.mouse.toggle(down=True)
-
-        time.sleep(0.3)
+            self._toggle_button(down=True)
 
         self._active_grab = not self._active_grab
 
-    def go_back(self) -> None:
+    def _go_back(self) -> None:
         """
-        An action imitating a keyboard shortcut LEFT_ARROW + ALT.
+        Tap LEFT_ARROW + ALT.
         """
 
-        autopy.key.tap(Code.LEFT_ARROW, [Modifier.ALT])
-        time.sleep(0.3)
+        self._tap_navigation_key(forward=False)
 
-    def go_forward(self) -> None:
+    def _go_forward(self) -> None:
         """
-        An action imitating a keyboard shortcut RIGHT_ARROW + ALT.
+        Tap RIGHT_ARROW + ALT.
+        """
+
+        self._tap_navigation_key(forward=True)
+
+    def _move_pointer(self, x: int, y: int) -> None:
+        """
+        Move the operating system pointer.
+
+        Args:
+            x (int): X pointer location.
+            y (int): Y pointer location.
+        """
+
+        autopy.mouse.move(x, y)
+
+    def _click_button(self) -> None:
+        """
+        Click the left mouse button.
+        """
+
+        autopy.mouse.click()
+
+    def _toggle_button(self, down: bool) -> None:
+        """
+        Press or release the left mouse button.
+
+        Args:
+            down (bool): True to press, False to release.
+        """
+
+        autopy.mouse.toggle(down=down)
+
+    def _tap_navigation_key(self, forward: bool) -> None:
+        """
+        Tap RIGHT_ARROW + ALT or LEFT_ARROW + ALT.
+
+        Args:
+            forward (bool): True for RIGHT_ARROW, False for LEFT_ARROW.
         """
 
-        autopy.key.tap(Code.RIGHT_ARROW, [Modifier.ALT])
-        time.sleep(0.3)
+        autopy.key.tap(Code.RIGHT_ARROW if forward else Code.LEFT_ARROW, [Modifier.ALT])
 
     def _reset_grab_action(self) -> None:
         """
@@ -0,0 +1,119 @@
+import time
+import queue
+import threading
+
+from typing import Callable, Dict, Optional, Tuple
+
+
+class ActionExecutor:
+    """
+    Executes mouse and keyboard actions asynchronously on a worker thread, so the caller never waits for them.
+    Every action has its own cooldown: an action requested again before its cooldown has passed is coalesced with
+    the previous one instead of being executed. When the action queue is full, new actions are dropped.
+
+    Attributes:
+        cooldowns (Dict[str, float]): Cooldown in seconds for each action name.
+        executed_actions (int): Number of executed actions.
+        dropped_actions (int): Number of actions dropped because the queue was full.
+        coalesced_actions (int): Number of actions coalesced with a previous request of the same action.
+        failed_actions (int): Number of actions that raised an exception.
+        _queue (queue.Queue): Queue with pending actions.
+        _last_request_time (Dict[str, float]): Time the action was last accepted.
+        _lock (threading.Lock): Lock guarding counters and request times.
+        _thread (threading.Thread): Worker thread.
+    """
+
+    def __init__(self, cooldowns: Dict[str, float], queue_size: int = 4):
+        """
+        Constructor.
+
+        Args:
+            cooldowns (Dict[str, float]): Cooldown in seconds for each action name.
+            queue_size (int): Defaults to 4. Maximum number of pending actions.
+        """
+
+        self.cooldowns: Dict[str, float] = dict(cooldowns)
+        self.executed_actions: int = 0
+        self.dropped_actions: int = 0
+        self.coalesced_actions: int = 0
+        self.failed_actions: int = 0
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Callable[[], None]]]]" = queue.Queue(max(1, queue_size))
+        self._last_request_time: Dict[str, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        self._thread: threading.Thread = threading.Thread(target=self._run, name="ActionExecutor", daemon=True)
+        self._thread.start()
+
+    def submit(self, name: str, action: Callable[[], None]) -> bool:
+        """
+        Request an action. Never blocks.
+
+        Args:
+            name (str): Action name, used to look up the cooldown.
+            action (Callable[[], None]): Function performing the action.
+
+        Returns:
+            bool: True when the action has been queued, False when it has been coalesced or dropped.
+        """
+
+        now = time.perf_counter()
+
+        with self._lock:
+            last_request_time = self._last_request_time.get(name)
+
+            if last_request_time is not None and now - last_request_time < self.cooldowns.get(name, 0.0):
+                self.coalesced_actions += 1
+                return False
+
+            try:
+                self._queue.put_nowait((name, action))
+            except queue.Full:
+                self.dropped_actions += 1
+                return False
+
+            self._last_request_time[name] = now
+
+        return True
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Returns:
+            int: Number of actions waiting for execution.
+        """
+
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        """
+        Execute pending actions and stop the worker thread.
+        """
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        """
+        Worker thread loop.
+        """
+
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                break
+
+            _, action = item
+
+            try:
+                action()
+            except Exception:
+                # A failing action must not stop the executor
+                with self._lock:
+                    self.failed_actions += 1
+                continue
+
+            with self._lock:
+                self.executed_actions += 1
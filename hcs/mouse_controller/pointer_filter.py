@@ -0,0 +1,327 @@
+import math
+import time
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple, Type
+
+
+class PointerFilter(ABC):
+    """
+    Filter of pointer positions measured in camera frames. Measurements are fed with update together with the
+    capture time of their frame, position returns the filtered position at a given time, so a predicting filter
+    can compensate the time the frame spent in the pipeline.
+
+    Attributes:
+        continuous (bool): Flag position changes between measurements, e.g. by prediction.
+        initialized (bool): Flag set after the first measurement.
+    """
+
+    continuous: bool = False
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+
+        self.initialized: bool = False
+
+    @abstractmethod
+    def update(self, x: float, y: float, timestamp: float) -> None:
+        """
+        Feed a measured position.
+
+        Args:
+            x (float): Measured X position.
+            y (float): Measured Y position.
+            timestamp (float): Capture time of the frame the position was measured in, time.perf_counter based.
+        """
+
+    @abstractmethod
+    def position(self, now: float) -> Tuple[float, float]:
+        """
+        Args:
+            now (float): Time the position is needed at, time.perf_counter based.
+
+        Returns:
+            Tuple[float, float]: Filtered position.
+        """
+
+    def filter(self, x: float, y: float, timestamp: float, now: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Feed a measured position and return the filtered position.
+
+        Args:
+            x (float): Measured X position.
+            y (float): Measured Y position.
+            timestamp (float): Capture time of the frame the position was measured in.
+            now (Optional[float]): Defaults to None. Time the position is needed at, the current time when None.
+
+        Returns:
+            Tuple[float, float]: Filtered position.
+        """
+
+        self.update(x, y, timestamp)
+
+        return self.position(time.perf_counter() if now is None else now)
+
+    def reset(self) -> None:
+        """
+        Forget the filter state, e.g. when the hand has been lost.
+        """
+
+        self.initialized = False
+
+
+class ExponentialFilter(PointerFilter):
+    """
+    Exponential smoothing moving the pointer a fixed fraction of the remaining distance on every measurement, the
+    original MouseController behaviour. Removes jitter at the cost of lag growing with the smoothing factor.
+
+    Attributes:
+        smoothing_factor (float): Mouse marker movement smoothing factor, 1 disables smoothing.
+        _x (float): Filtered X position.
+        _y (float): Filtered Y position.
+    """
+
+    def __init__(self, smoothing_factor: float = 7.0):
+        """
+        Constructor.
+
+        Args:
+            smoothing_factor (float): Defaults to 7.0. Mouse marker movement smoothing factor.
+        """
+
+        super().__init__()
+
+        self.smoothing_factor: float = smoothing_factor
+        self._x, self._y = 0.0, 0.0
+
+    def update(self, x: float, y: float, timestamp: float) -> None:
+        self._x += (x - self._x) / self.smoothing_factor
+        self._y += (y - self._y) / self.smoothing_factor
+        self.initialized = True
+
+    def position(self, now: float) -> Tuple[float, float]:
+        return self._x, self._y
+
+
+class OneEuroFilter(PointerFilter):
+    """
+    One Euro filter (Casiez et al., 2012): a low-pass filter whose cutoff frequency grows with the pointer speed.
+    A still hand gets heavy smoothing, so there is no jitter, and a fast moving hand gets little, so there is
+    little lag.
+
+    Attributes:
+        min_cutoff (float): Cutoff frequency in Hz of a still pointer.
+        beta (float): Cutoff frequency increase per pixel per second of pointer speed.
+        derivative_cutoff (float): Cutoff frequency in Hz of the speed estimate.
+        _position (Tuple[float, float]): Filtered position.
+        _speed (Tuple[float, float]): Filtered speed in pixels per second.
+        _timestamp (float): Capture time of the last measurement.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.01, derivative_cutoff: float = 1.0):
+        """
+        Constructor.
+
+        Args:
+            min_cutoff (float): Defaults to 1.0. Cutoff frequency in Hz of a still pointer, lower removes more
+                jitter.
+            beta (float): Defaults to 0.01. Cutoff frequency increase per pixel per second of pointer speed,
+                higher removes more lag.
+            derivative_cutoff (float): Defaults to 1.0. Cutoff frequency in Hz of the speed estimate.
+        """
+
+        super().__init__()
+
+        self.min_cutoff: float = min_cutoff
+        self.beta: float = beta
+        self.derivative_cutoff: float = derivative_cutoff
+
+        self._position: Tuple[float, float] = (0.0, 0.0)
+        self._speed: Tuple[float, float] = (0.0, 0.0)
+        self._timestamp: float = 0.0
+
+    def update(self, x: float, y: float, timestamp: float) -> None:
+        if not self.initialized:
+            self._position, self._speed, self._timestamp = (x, y), (0.0, 0.0), timestamp
+            self.initialized = True
+            return
+
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            return
+
+        (previous_x, previous_y), (speed_x, speed_y) = self._position, self._speed
+
+        alpha = _smoothing_alpha(self.derivative_cutoff, dt)
+        speed_x += alpha * ((x - previous_x) / dt - speed_x)
+        speed_y += alpha * ((y - previous_y) / dt - speed_y)
+
+        # The cutoff follows the speed of the pointer, not of each axis, so diagonal moves are not distorted
+        alpha = _smoothing_alpha(self.min_cutoff + self.beta * math.hypot(speed_x, speed_y), dt)
+
+        self._position = (previous_x + alpha * (x - previous_x), previous_y + alpha * (y - previous_y))
+        self._speed = (speed_x, speed_y)
+        self._timestamp = timestamp
+
+    def position(self, now: float) -> Tuple[float, float]:
+        return self._position
+
+
+class KalmanPredictor(PointerFilter):
+    """
+    Constant velocity Kalman filter extrapolating the pointer to the time it is shown. The measured position is
+    late by the time the frame spent in capture, detection and classification; the predictor moves the pointer
+    forward by that measured latency plus lead_time, limited to max_prediction, so the pointer keeps up with the
+    hand.
+
+    Extrapolating a noisy speed estimate brings jitter back, so the prediction fades out below speed_threshold,
+    where the hand is practically still, and the predicted positions are smoothed by a One Euro filter.
+
+    Both axes share the motion model, so they share the covariance and the gain.
+
+    Attributes:
+        measurement_noise (float): Standard deviation of the measured position in pixels.
+        process_noise (float): Standard deviation of the hand acceleration in pixels per second squared.
+        lead_time (float): Time in seconds predicted on top of the measured latency, e.g. display latency.
+        max_prediction (float): Maximum prediction time in seconds.
+        speed_threshold (float): Speed in pixels per second at which half of the prediction is applied.
+        smoothing (Optional[OneEuroFilter]): Filter of the predicted positions, updated on every position call.
+        _state (Tuple[float, float, float, float]): X, Y positions and X, Y speeds.
+        _covariance (Tuple[float, float, float]): Position variance, position-speed covariance and speed variance.
+        _timestamp (float): Capture time of the last measurement.
+    """
+
+    continuous: bool = True
+
+    def __init__(self, measurement_noise: float = 6.0, process_noise: float = 4000.0, lead_time: float = 0.0,
+                 max_prediction: float = 0.1, speed_threshold: float = 200.0, smoothing_cutoff: Optional[float] = 1.0):
+        """
+        Constructor.
+
+        Args:
+            measurement_noise (float): Defaults to 6.0. Standard deviation of the measured position in pixels,
+                higher smooths more.
+            process_noise (float): Defaults to 4000.0. Standard deviation of the hand acceleration in pixels per
+                second squared, higher follows direction changes faster.
+            lead_time (float): Defaults to 0.0. Time in seconds predicted on top of the measured latency.
+            max_prediction (float): Defaults to 0.1. Maximum prediction time in seconds, longer predictions overshoot
+                when the hand stops.
+            speed_threshold (float): Defaults to 200.0. Speed in pixels per second at which half of the prediction
+                is applied.
+            smoothing_cutoff (Optional[float]): Defaults to 1.0. Cutoff frequency in Hz of the One Euro filter of
+                the predicted positions while the pointer is still, None disables the smoothing.
+        """
+
+        super().__init__()
+
+        self.measurement_noise: float = measurement_noise
+        self.process_noise: float = process_noise
+        self.lead_time: float = lead_time
+        self.max_prediction: float = max_prediction
+        self.speed_threshold: float = speed_threshold
+        self.smoothing: Optional[OneEuroFilter] = OneEuroFilter(smoothing_cutoff) if smoothing_cutoff else None
+
+        self._state: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+        self._covariance: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self._timestamp: float = 0.0
+
+    def update(self, x: float, y: float, timestamp: float) -> None:
+        r = self.measurement_noise ** 2
+
+        if not self.initialized:
+            # Unknown speed, as uncertain as a hand crossing the frame in a fraction of a second
+            self._state = (x, y, 0.0, 0.0)
+            self._covariance = (r, 0.0, (self.process_noise * 0.25) ** 2)
+            self._timestamp = timestamp
+            self.initialized = True
+            return
+
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            return
+
+        position_x, position_y, speed_x, speed_y = self._state
+        p00, p01, p11 = self._covariance
+        q = self.process_noise ** 2
+
+        # Predict: constant velocity with white noise acceleration
+        position_x += speed_x * dt
+        position_y += speed_y * dt
+        p00 += dt * (2 * p01 + dt * p11) + q * dt ** 4 / 4
+        p01 += dt * p11 + q * dt ** 3 / 2
+        p11 += q * dt ** 2
+
+        # Update with the measured position
+        gain_position, gain_speed = p00 / (p00 + r), p01 / (p00 + r)
+        innovation_x, innovation_y = x - position_x, y - position_y
+
+        self._state = (position_x + gain_position * innovation_x, position_y + gain_position * innovation_y,
+                       speed_x + gain_speed * innovation_x, speed_y + gain_speed * innovation_y)
+        self._covariance = ((1 - gain_position) * p00, (1 - gain_position) * p01, p11 - gain_speed * p01)
+        self._timestamp = timestamp
+
+    def position(self, now: float) -> Tuple[float, float]:
+        position_x, position_y, speed_x, speed_y = self._state
+        prediction = min(max(now - self._timestamp + self.lead_time, 0.0), self.max_prediction)
+
+        # Speed noise of a still hand is not extrapolated
+        squared_speed = speed_x * speed_x + speed_y * speed_y
+        prediction *= squared_speed / (squared_speed + self.speed_threshold ** 2 or 1.0)
+
+        x, y = position_x + speed_x * prediction, position_y + speed_y * prediction
+
+        if self.smoothing is None:
+            return x, y
+
+        return self.smoothing.filter(x, y, now, now)
+
+    def reset(self) -> None:
+        super().reset()
+
+        if self.smoothing is not None:
+            self.smoothing.reset()
+
+
+# Filters by name, for configuration from HandsControlSystem and the command line
+POINTER_FILTERS: Dict[str, Type[PointerFilter]] = {
+    "exponential": ExponentialFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanPredictor,
+}
+
+
+def create_pointer_filter(name: str, **kwargs: Any) -> PointerFilter:
+    """
+    Create a pointer filter by name.
+
+    Args:
+        name (str): Filter name, one of POINTER_FILTERS.
+        **kwargs (Any): Filter arguments.
+
+    Returns:
+        PointerFilter: Pointer filter.
+    """
+
+    if name not in POINTER_FILTERS:
+        raise ValueError(f"Unknown pointer filter: {name}")
+
+    return POINTER_FILTERS[name](**kwargs)
+
+
+def _smoothing_alpha(cutoff: float, dt: float) -> float:
+    """
+    Smoothing factor of a first order low-pass filter.
+
+    Args:
+        cutoff (float): Cutoff frequency in Hz.
+        dt (float): Time since the previous sample in seconds.
+
+    Returns:
+        float: Weight of the new sample.
+    """
+
+    tau = 1.0 / (2 * math.pi * cutoff)
+
+    return 1.0 / (1.0 + tau / dt)
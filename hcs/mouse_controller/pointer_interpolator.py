@@ -0,0 +1,202 @@
+import time
+import threading
+
+from typing import Callable, Optional, Tuple
+
+from hcs.mouse_controller.pointer_filter import PointerFilter
+
+
+class PointerInterpolator:
+    """
+    Moves the pointer on a worker thread at a fixed rate, e.g. 120 Hz, independent of the camera frame rate. The
+    vision loop only posts target positions, which never blocks on the operating system pointer API.
+
+    Between two targets the pointer glides from where it was towards the newer target over the measured interval
+    between targets, so it does not step once per camera frame. Filters predicting the pointer between
+    measurements (PointerFilter.continuous) are evaluated on every tick instead. A move to the position the pointer
+    already has is coalesced, and the thread sleeps until the next target once the pointer has settled.
+
+    Attributes:
+        rate (float): Pointer moves per second.
+        pointer_filter (PointerFilter): Filter of the posted positions.
+        emitted_moves (int): Number of pointer moves performed.
+        coalesced_moves (int): Number of ticks without a move because the pointer position did not change.
+        failed_moves (int): Number of pointer moves that raised an exception.
+        _move_pointer (Callable[[int, int], None]): Function moving the pointer to a screen pixel.
+        _start (Optional[Tuple[float, float]]): Position the pointer glides from, None before the first target.
+        _target (Tuple[float, float]): Filtered target position.
+        _position (Tuple[float, float]): Position of the last tick.
+        _last_moved (Optional[Tuple[int, int]]): Pixel the pointer has last been moved to.
+        _glide_start (float): Time the glide towards the target started.
+        _interval (float): Smoothed interval in seconds between targets.
+        _last_post_time (Optional[float]): Time the last target has been posted.
+        _posted (threading.Event): Event waking up the settled thread.
+        _stop_event (threading.Event): Event stopping the thread.
+        _lock (threading.Lock): Lock of the filter and the glide, post, reset and the thread use both.
+        _thread (threading.Thread): Worker thread.
+    """
+
+    def __init__(self, move_pointer: Callable[[int, int], None], pointer_filter: PointerFilter,
+                 rate: float = 120.0):
+        """
+        Constructor.
+
+        Args:
+            move_pointer (Callable[[int, int], None]): Function moving the pointer to a screen pixel.
+            pointer_filter (PointerFilter): Filter of the posted screen positions.
+            rate (float): Defaults to 120.0. Pointer moves per second, e.g. the display refresh rate.
+        """
+
+        self.rate: float = rate
+        self.pointer_filter: PointerFilter = pointer_filter
+        self.emitted_moves: int = 0
+        self.coalesced_moves: int = 0
+        self.failed_moves: int = 0
+
+        self._move_pointer: Callable[[int, int], None] = move_pointer
+        self._start: Optional[Tuple[float, float]] = None
+        self._target: Tuple[float, float] = (0.0, 0.0)
+        self._position: Tuple[float, float] = (0.0, 0.0)
+        self._last_moved: Optional[Tuple[int, int]] = None
+        self._glide_start: float = 0.0
+        self._interval: float = 1 / 30
+        self._last_post_time: Optional[float] = None
+
+        self._posted: threading.Event = threading.Event()
+        self._stop_event: threading.Event = threading.Event()
+        self._lock: threading.Lock = threading.Lock()
+
+        self._thread: threading.Thread = threading.Thread(target=self._run, name="PointerInterpolator", daemon=True)
+        self._thread.start()
+
+    def post(self, x: float, y: float, timestamp: float) -> None:
+        """
+        Post a measured pointer position. Never blocks on the pointer API.
+
+        Args:
+            x (float): Measured X screen position.
+            y (float): Measured Y screen position.
+            timestamp (float): Capture time of the frame the position was measured in, time.perf_counter based.
+        """
+
+        now = time.perf_counter()
+
+        with self._lock:
+            self.pointer_filter.update(x, y, timestamp)
+            target = self.pointer_filter.position(now)
+
+            if self._last_post_time is not None:
+                # Hand dropouts do not stretch the glide
+                self._interval += 0.2 * (min(now - self._last_post_time, 0.2) - self._interval)
+            self._last_post_time = now
+
+            self._start = self._position if self._start is not None else target
+            self._target = target
+            self._glide_start = now
+
+        self._posted.set()
+
+    def reset(self) -> None:
+        """
+        Forget the filter state, e.g. when the hand has been lost. The pointer stays where it is.
+        """
+
+        with self._lock:
+            self.pointer_filter.reset()
+            self._last_post_time = None
+
+            if self._start is not None:
+                self._start = self._target = self._position
+
+    def close(self) -> None:
+        """
+        Stop the worker thread.
+        """
+
+        if self._thread.is_alive():
+            self._stop_event.set()
+            self._posted.set()
+            self._thread.join()
+
+    def _next_position(self, now: float) -> Optional[Tuple[float, float]]:
+        """
+        Args:
+            now (float): Time of the tick.
+
+        Returns:
+            Optional[Tuple[float, float]]: Position of the tick, None while there is no target.
+        """
+
+        with self._lock:
+            if self._start is None:
+                return None
+
+            if self.pointer_filter.continuous and self.pointer_filter.initialized:
+                self._position = self.pointer_filter.position(now)
+            else:
+                progress = min((now - self._glide_start) / self._interval, 1.0)
+                (start_x, start_y), (target_x, target_y) = self._start, self._target
+                self._position = (start_x + (target_x - start_x) * progress,
+                                  start_y + (target_y - start_y) * progress)
+
+            return self._position
+
+    def _run(self) -> None:
+        """
+        Worker thread loop.
+        """
+
+        period = 1.0 / self.rate
+        deadline = time.perf_counter()
+
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+
+            if deadline > now:
+                time.sleep(deadline - now)
+                now = time.perf_counter()
+
+            # Ticks missed while the thread was not scheduled are skipped, not caught up
+            deadline = max(deadline + period, now)
+
+            self._posted.clear()
+            position = self._next_position(now)
+
+            pixel = (int(position[0]), int(position[1])) if position is not None else None
+            if pixel is None or pixel == self._last_moved:
+                self.coalesced_moves += pixel is not None
+
+                # Checked after clearing _posted, a close in between has already set it again
+                if self._settled(now) and not self._stop_event.is_set():
+                    self._posted.wait()
+                    deadline = time.perf_counter()
+                continue
+
+            try:
+                self._move_pointer(*pixel)
+            except Exception:
+                # A failing move must not stop the pointer
+                self.failed_moves += 1
+                continue
+
+            self._last_moved = pixel
+            self.emitted_moves += 1
+
+    def _settled(self, now: float) -> bool:
+        """
+        Args:
+            now (float): Time of the tick.
+
+        Returns:
+            bool: True when the pointer will not move until the next target, so the thread can sleep.
+        """
+
+        with self._lock:
+            if self._start is None:
+                return True
+
+            if self.pointer_filter.continuous and self.pointer_filter.initialized:
+                # Predictions and their smoothing converge within the prediction time after the last target
+                return self._last_post_time is None or now - self._last_post_time > 1.0
+
+            return now - self._glide_start >= self._interval
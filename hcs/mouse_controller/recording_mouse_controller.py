@@ -0,0 +1,60 @@
+import time
+
+from typing import Any, List, Tuple
+
+from hcs.mouse_controller import MouseController
+
+
+class RecordingMouseController(MouseController):
+    """
+    Mouse controller that records the operating system calls instead of performing them. Used to run the system
+    on machines without a desktop and to check which actions a recording triggers.
+
+    Attributes:
+        events (List[Tuple[float, str, Tuple[Any, ...]]]): Recorded calls as (timestamp, name, arguments).
+    """
+
+    def __init__(self, screen_size: Tuple[float, float] = (1920, 1080), **kwargs: Any):
+        """
+        Constructor.
+
+        Args:
+            screen_size (Tuple[float, float]): Defaults to (1920, 1080). Simulated screen size.
+            **kwargs (Any): MouseController arguments.
+        """
+
+        self.events: List[Tuple[float, str, Tuple[Any, ...]]] = []
+
+        super().__init__(screen_size=screen_size, **kwargs)
+
+    def _record(self, name: str, *args: Any) -> None:
+        """
+        Record the call.
+
+        Args:
+            name (str): Call name.
+            *args (Any): Call arguments.
+        """
+
+        self.events.append((time.perf_counter(), name, args))
+
+    def _move_pointer(self, x: int, y: int) -> None:
+        self._record("move", x, y)
+
+    def _click_button(self) -> None:
+        self._record("click")
+
+    def _toggle_button(self, down: bool) -> None:
+        self._record("toggle", down)
+
+    def _tap_navigation_key(self, forward: bool) -> None:
+        self._record("go_forward" if forward else "go_back")
+
+
+class NullMouseController(RecordingMouseController):
+    """
+    Mouse controller that ignores the operating system calls, for benchmarks of the vision path.
+    """
+
+    def _record(self, name: str, *args: Any) -> None:
+        pass
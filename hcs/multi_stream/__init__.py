@@ -0,0 +1,338 @@
+import os
+import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from hcs.hand_detector import HandDetector
+from hcs.hand_gesture_detector import HandGestureDetector
+from hcs.metrics import Metrics
+from hcs.models import FramePacket
+from hcs.multi_stream.batched_classifier import BatchedClassifier
+from hcs.multi_stream.stream_worker import StreamWorker, SourceFactory
+
+
+def default_detector_factory(metrics: Metrics) -> HandDetector:
+    """
+    Build the landmark detector of a stream with the settings of HandsControlSystem.
+
+    Args:
+        metrics (Metrics): Metrics of the stream.
+
+    Returns:
+        HandDetector: Landmark detector.
+    """
+
+    return HandDetector(max_num_hands=2, min_detection_confidence=0.8, reuse_buffers=True, metrics=metrics)
+
+
+class MultiStreamRuntime:
+    """
+    Processing of many cameras or video streams in one process, e.g. several stations on one machine.
+
+    Every stream has its own capture thread and landmark detector (see StreamWorker). Detection of captured frames
+    is scheduled on a pool of worker threads - MediaPipe releases the GIL, so the pool spreads the work across
+    cores. The scheduler serves streams with a waiting frame in round-robin order and never runs two frames of one
+    stream at once, so a busy stream cannot starve the others and there are never more detections in flight than
+    workers. Detected hands of all streams are classified in batches by one shared model (see BatchedClassifier).
+
+    Every stream records its own metrics and handles its own failures: an unplugged camera is reconnected in the
+    background while the other streams keep running.
+
+    Attributes:
+        streams (Dict[str, StreamWorker]): Streams by name.
+        workers (int): Number of detection workers.
+        metrics (Metrics): Metrics of the scheduler and the shared classifier.
+        classifier (BatchedClassifier): Shared batched gesture classifier.
+        on_result (Optional[Callable[[str, FramePacket], None]]): Called with the stream name and every classified
+            packet, e.g. to drive actuation.
+        _detector_factory (Callable[[Metrics], HandDetector]): Function building the detector of a stream.
+        _executor (Optional[ThreadPoolExecutor]): Detection workers.
+        _in_flight (int): Number of detections in progress.
+        _condition (threading.Condition): Condition signalling a captured frame or a finished detection.
+        _stop_event (threading.Event): Event stopping the scheduler.
+        _finished_event (threading.Event): Event set when all streams have finished or failed.
+        _scheduler_thread (Optional[threading.Thread]): Scheduler thread.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, SourceFactory]] = None, workers: Optional[int] = None,
+                 detector_factory: Callable[[Metrics], HandDetector] = default_detector_factory,
+                 gesture_detector: Optional[HandGestureDetector] = None,
+                 on_result: Optional[Callable[[str, FramePacket], None]] = None, max_batch_size: int = 32,
+                 max_wait: float = 0.002, metrics_enabled: bool = True):
+        """
+        Constructor.
+
+        Args:
+            sources (Optional[Dict[str, SourceFactory]]): Defaults to None. Functions opening the sources by stream
+                name, reconnected when they fail. More streams can be added with add_stream.
+            workers (Optional[int]): Defaults to None. Number of detection workers, the number of CPUs when None.
+            detector_factory (Callable[[Metrics], HandDetector]): Defaults to default_detector_factory. Function
+                building the detector of a stream.
+            gesture_detector (Optional[HandGestureDetector]): Defaults to None. Shared gesture detector, the default
+                model when None.
+            on_result (Optional[Callable[[str, FramePacket], None]]): Defaults to None. Called with the stream name
+                and every classified packet on the classifier thread.
+            max_batch_size (int): Defaults to 32. Number of waiting hands classified without waiting any longer.
+            max_wait (float): Defaults to 0.002. Maximum time in seconds a packet waits for hands of other streams.
+            metrics_enabled (bool): Defaults to True. Flag to record metrics of the streams and the runtime.
+        """
+
+        self.streams: Dict[str, StreamWorker] = {}
+        self.workers: int = workers or os.cpu_count() or 1
+        self.metrics: Metrics = Metrics(enabled=metrics_enabled)
+        self.on_result: Optional[Callable[[str, FramePacket], None]] = on_result
+
+        gesture_detector = gesture_detector if gesture_detector is not None else HandGestureDetector()
+        gesture_detector.warm_up()
+        self.classifier: BatchedClassifier = BatchedClassifier(gesture_detector, max_batch_size, max_wait,
+                                                               self.metrics)
+
+        self._detector_factory: Callable[[Metrics], HandDetector] = detector_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: int = 0
+        self._condition: threading.Condition = threading.Condition()
+        self._stop_event: threading.Event = threading.Event()
+        self._finished_event: threading.Event = threading.Event()
+        self._scheduler_thread: Optional[threading.Thread] = None
+
+        self.metrics.register_gauge("detections_in_flight", lambda: self._in_flight)
+        self.metrics.register_gauge("streams_running", lambda: sum(
+            stream.state == StreamWorker.RUNNING for stream in self.streams.values()))
+
+        for name, source_factory in (sources or {}).items():
+            self.add_stream(name, source_factory)
+
+    def add_stream(self, name: str, source_factory: SourceFactory, reconnect: bool = True,
+                   reconnect_interval: float = 1.0, max_open_failures: Optional[int] = None,
+                   lossless: Optional[bool] = None) -> StreamWorker:
+        """
+        Add a stream. Has to be called before start.
+
+        Args:
+            name (str): Unique stream name.
+            source_factory (SourceFactory): Function opening the source, e.g. a CameraVideoCapture or a FrameSource.
+            reconnect (bool): Defaults to True. Flag to reopen the source when it ends or fails, False for files.
+            reconnect_interval (float): Defaults to 1.0. Time in seconds between attempts to open the source.
+            max_open_failures (Optional[int]): Defaults to None. Maximum number of failed attempts in a row to open
+                the source before the stream fails, unlimited when None.
+            lossless (Optional[bool]): Defaults to None. Flag to detect every frame instead of the latest one, set
+                for streams without reconnect when None.
+
+        Returns:
+            StreamWorker: Added stream.
+        """
+
+        if name in self.streams:
+            raise ValueError(f"Stream {name} already exists")
+
+        stream = StreamWorker(name, source_factory, self._detector_factory, reconnect=reconnect,
+                              reconnect_interval=reconnect_interval, max_open_failures=max_open_failures,
+                              metrics=Metrics(enabled=self.metrics.enabled), on_frame=self._notify,
+                              lossless=lossless)
+        self.streams[name] = stream
+
+        return stream
+
+    def start(self) -> None:
+        """
+        Start the streams, the detection workers, the classifier and the scheduler.
+        """
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="MultiStreamDetection")
+        self.classifier.start()
+
+        for stream in self.streams.values():
+            stream.start()
+
+        self._scheduler_thread = threading.Thread(target=self._schedule, name="MultiStreamScheduler", daemon=True)
+        self._scheduler_thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the streams, finish the detections in progress, classify the waiting hands and stop all threads.
+        """
+
+        for stream in self.streams.values():
+            stream.stop()
+
+        self._stop_event.set()
+        self._notify()
+
+        if self._scheduler_thread is not None:
+            self._scheduler_thread.join()
+            self._scheduler_thread = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        self.classifier.stop()
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """
+        Start the runtime and block until all streams have finished or failed, the duration has elapsed or stop
+        has been called from another thread.
+
+        Args:
+            duration (Optional[float]): Defaults to None. Maximum run time in seconds, unlimited when None.
+        """
+
+        self.start()
+
+        try:
+            self._finished_event.wait(duration)
+        finally:
+            self.stop()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all streams have finished or failed.
+
+        Args:
+            timeout (Optional[float]): Defaults to None. Maximum time in seconds to wait.
+
+        Returns:
+            bool: True when all streams have finished or failed.
+        """
+
+        return self._finished_event.wait(timeout)
+
+    def snapshot(self) -> Dict:
+        """
+        Current state of the runtime, compatible with MetricsExporter.
+
+        Returns:
+            Dict: Metrics of the scheduler and the classifier, and state and metrics of every stream.
+        """
+
+        return {**self.metrics.snapshot(),
+                "streams": {name: stream.snapshot() for name, stream in self.streams.items()}}
+
+    def to_prometheus(self, prefix: str = "hcs") -> str:
+        """
+        Metrics in the Prometheus text exposition format, compatible with MetricsExporter. Metrics of the streams
+        are labeled with the stream name.
+
+        Args:
+            prefix (str): Defaults to "hcs". Prefix of metric names.
+
+        Returns:
+            str: Metrics text.
+        """
+
+        texts = [self.metrics.to_prometheus(f"{prefix}_runtime")]
+        texts += [stream.metrics.to_prometheus(prefix, labels={"stream": name})
+                  for name, stream in self.streams.items()]
+
+        # Samples of one metric family have to follow its single TYPE line
+        families: Dict[str, List[str]] = {}
+        for text in texts:
+            samples: List[str] = []
+            for line in text.splitlines():
+                if line.startswith("# TYPE"):
+                    samples = families.setdefault(line, [])
+                else:
+                    samples.append(line)
+
+        return "".join(f"{type_line}\n" + "".join(f"{line}\n" for line in lines)
+                       for type_line, lines in families.items())
+
+    def _notify(self) -> None:
+        """
+        Wake up the scheduler.
+        """
+
+        with self._condition:
+            self._condition.notify()
+
+    def _schedule(self) -> None:
+        """
+        Scheduler thread loop dispatching captured frames to the detection workers.
+        """
+
+        streams = list(self.streams.values())
+        next_index = 0
+
+        with self._condition:
+            while not self._stop_event.is_set():
+                stream = None
+
+                if self._in_flight < self.workers:
+                    for offset in range(len(streams)):
+                        candidate = streams[(next_index + offset) % len(streams)]
+
+                        if not candidate.busy and len(candidate.frames):
+                            stream = candidate
+                            next_index = (next_index + offset + 1) % len(streams)
+                            break
+
+                if stream is None:
+                    if self._in_flight == 0 and not any(stream.is_alive() or len(stream.frames)
+                                                        for stream in streams):
+                        self._finished_event.set()
+                        break
+
+                    self._condition.wait(0.1)
+                    continue
+
+                packet = stream.frames.get(timeout=0)
+                if packet is None:
+                    continue
+
+                stream.busy = True
+                self._in_flight += 1
+                self._executor.submit(self._detect, stream, packet)
+
+    def _detect(self, stream: StreamWorker, packet: FramePacket) -> None:
+        """
+        Detection task run by a worker.
+
+        Args:
+            stream (StreamWorker): Stream of the frame.
+            packet (FramePacket): Captured frame.
+        """
+
+        start_time = time.perf_counter()
+        stream.metrics.record("scheduling_delay", start_time - packet.stage_timestamps["capture"])
+        result = None
+
+        try:
+            result = stream.detect(packet)
+            stream.metrics.record("detection", time.perf_counter() - start_time)
+        finally:
+            with self._condition:
+                stream.busy = False
+                self._in_flight -= 1
+                self._condition.notify()
+
+        if result is not None:
+            self.classifier.submit(result, lambda classified_packet: self._finish(stream, classified_packet))
+
+    def _finish(self, stream: StreamWorker, packet: FramePacket) -> None:
+        """
+        Record metrics of a classified packet and pass it to on_result.
+
+        Args:
+            stream (StreamWorker): Stream of the packet.
+            packet (FramePacket): Classified packet.
+        """
+
+        metrics = stream.metrics
+        metrics.record("end_to_end", time.perf_counter() - packet.frame.timestamp)
+        metrics.increment("frames_processed")
+        metrics.increment("hands_detected", len(packet.hands))
+
+        for result in packet.gesture_results:
+            if result is not None:
+                metrics.increment("gestures_classified", labels={"gesture": result.gesture_type.name})
+
+        if self.on_result is None:
+            return
+
+        try:
+            self.on_result(stream.name, packet)
+        except Exception as error:
+            stream.last_error = f"{type(error).__name__}: {error}"
+            metrics.increment("result_errors")
@@ -0,0 +1,81 @@
+import json
+import argparse
+
+from hcs.camera_video_capture import CameraVideoCapture
+from hcs.frame_source import VideoFileSource, ImageDirectorySource
+from hcs.multi_stream import MultiStreamRuntime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - process many cameras or video streams")
+    parser.add_argument("--camera", type=int, action="append", default=[], help="camera device number, repeatable")
+    parser.add_argument("--video", action="append", default=[], help="path to a video file, repeatable")
+    parser.add_argument("--images", action="append", default=[], help="directory with image files, repeatable")
+    parser.add_argument("--loop", action="store_true", help="start video files and directories over at the end")
+    parser.add_argument("--workers", type=int, default=None, help="number of detection workers, all CPUs by default")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--reconnect-interval", type=float, default=1.0,
+                        help="seconds between attempts to reopen a failed camera")
+    parser.add_argument("--max-batch-size", type=int, default=32, help="maximum number of hands classified at once")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0,
+                        help="maximum time a hand waits for hands of other streams")
+    parser.add_argument("--metrics-file", default=None,
+                        help="periodically export metrics to this file, Prometheus text format for .prom, JSON otherwise")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="metrics export interval in seconds")
+    parser.add_argument("--json", action="store_true", help="print the final report as JSON")
+    args = parser.parse_args()
+
+    if not (args.camera or args.video or args.images):
+        parser.error("at least one --camera, --video or --images source is required")
+
+    runtime = MultiStreamRuntime(workers=args.workers, max_batch_size=args.max_batch_size,
+                                 max_wait=args.max_wait_ms / 1000)
+
+    for device_num in args.camera:
+        runtime.add_stream(f"camera{device_num}", lambda device_num=device_num: CameraVideoCapture(device_num),
+                           reconnect_interval=args.reconnect_interval)
+
+    for index, path in enumerate(args.video):
+        runtime.add_stream(f"video{index}", lambda path=path: VideoFileSource(path, loop=args.loop), reconnect=False)
+
+    for index, directory in enumerate(args.images):
+        runtime.add_stream(f"images{index}",
+                           lambda directory=directory: ImageDirectorySource(directory, loop=args.loop), reconnect=False)
+
+    exporter = None
+    if args.metrics_file:
+        from hcs.metrics.metrics_exporter import MetricsExporter
+
+        # The runtime exposes snapshot and to_prometheus like Metrics, with labeled per-stream metrics
+        exporter = MetricsExporter(runtime, args.metrics_file, args.metrics_interval)
+        exporter.start()
+
+    try:
+        runtime.run(args.duration)
+    except KeyboardInterrupt:
+        # Streams are already stopped by run
+        pass
+    finally:
+        if exporter is not None:
+            exporter.stop()
+
+    report = runtime.snapshot()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for name, stream in report["streams"].items():
+        frames = stream["counters"].get("frames_processed", 0)
+        end_to_end = stream["stages"].get("end_to_end", {})
+        last_error = f", last error: {stream['last_error']}" if stream["last_error"] else ""
+        print(f"{name}: {stream['state']}, {frames} frames, {frames / stream['uptime_s']:.1f} FPS, "
+              f"end-to-end p50 {end_to_end.get('p50_ms', 0.0):.1f} ms, p95 {end_to_end.get('p95_ms', 0.0):.1f} ms, "
+              f"restarts {stream['restarts']}{last_error}")
+
+    print(f"classifier: {report['counters'].get('batches', 0)} batches, "
+          f"mean batch size {report['gauges']['mean_batch_size']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
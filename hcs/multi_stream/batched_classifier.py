@@ -0,0 +1,178 @@
+import time
+import threading
+
+from typing import Callable, List, Optional, Tuple
+
+from hcs.hand_gesture_detector import HandGestureDetector
+from hcs.metrics import Metrics
+from hcs.models import FramePacket
+
+
+class BatchedClassifier:
+    """
+    One gesture classification model shared by many streams. Packets submitted from any thread are collected on a
+    worker thread for at most max_wait seconds, or until max_batch_size hands are waiting, and the hands of all of
+    them are classified in one vectorized call. Packets without hands are passed on right away.
+
+    The classification cache of the detector is not used, cache entries are keyed by hand type only and would mix
+    hands of different streams.
+
+    Attributes:
+        gesture_detector (HandGestureDetector): Shared gesture detector.
+        metrics (Metrics): Metrics the batch classification times and sizes are recorded to.
+        max_batch_size (int): Number of waiting hands classified without waiting any longer.
+        max_wait (float): Maximum time in seconds the oldest packet waits for the batch to fill up.
+        batches (int): Number of classified batches.
+        classified_hands (int): Number of classified hands.
+        _pending (List[Tuple[FramePacket, Callable[[FramePacket], None], float]]): Waiting packets with their
+            callbacks and submission times.
+        _pending_hands (int): Number of hands of the waiting packets.
+        _condition (threading.Condition): Condition signalling a submitted packet.
+        _stopped (bool): Flag stopped classifier.
+        _thread (Optional[threading.Thread]): Worker thread.
+    """
+
+    def __init__(self, gesture_detector: HandGestureDetector, max_batch_size: int = 32, max_wait: float = 0.002,
+                 metrics: Optional[Metrics] = None):
+        """
+        Constructor.
+
+        Args:
+            gesture_detector (HandGestureDetector): Shared gesture detector.
+            max_batch_size (int): Defaults to 32. Number of waiting hands classified without waiting any longer.
+            max_wait (float): Defaults to 0.002. Maximum time in seconds the oldest packet waits for the batch to
+                fill up.
+            metrics (Optional[Metrics]): Defaults to None. Metrics of the classifier, new enabled metrics when None.
+        """
+
+        self.gesture_detector: HandGestureDetector = gesture_detector
+        self.metrics: Metrics = metrics if metrics is not None else Metrics()
+        self.max_batch_size: int = max(1, max_batch_size)
+        self.max_wait: float = max_wait
+        self.batches: int = 0
+        self.classified_hands: int = 0
+
+        self._pending: List[Tuple[FramePacket, Callable[[FramePacket], None], float]] = []
+        self._pending_hands: int = 0
+        self._condition: threading.Condition = threading.Condition()
+        self._stopped: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.metrics.register_gauge("mean_batch_size", lambda: self.classified_hands / max(1, self.batches))
+
+    def start(self) -> None:
+        """
+        Start the worker thread.
+        """
+
+        self._thread = threading.Thread(target=self._run, name="BatchedClassifier", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Classify the waiting packets and stop the worker thread.
+        """
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, packet: FramePacket, callback: Callable[[FramePacket], None]) -> None:
+        """
+        Submit a packet for classification. The callback is called with the packet and its gesture results on the
+        worker thread, or right away on the calling thread when the packet has no hands.
+
+        Args:
+            packet (FramePacket): Packet with detected hands.
+            callback (Callable[[FramePacket], None]): Function receiving the classified packet.
+        """
+
+        if not packet.hands:
+            packet.gesture_results = []
+            self._call(callback, packet)
+            return
+
+        with self._condition:
+            self._pending.append((packet, callback, time.perf_counter()))
+            self._pending_hands += len(packet.hands)
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """
+        Worker thread loop.
+        """
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopped)
+
+                if not self._pending:
+                    break
+
+                # More streams may deliver hands until the oldest packet has waited long enough
+                deadline = self._pending[0][2] + self.max_wait
+                while self._pending_hands < self.max_batch_size and not self._stopped:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending
+                self._pending = []
+                self._pending_hands = 0
+
+            self._classify(batch)
+
+    def _classify(self, batch: List[Tuple[FramePacket, Callable[[FramePacket], None], float]]) -> None:
+        """
+        Classify the hands of all packets in one call and pass every packet to its callback.
+
+        Args:
+            batch (List[Tuple[FramePacket, Callable[[FramePacket], None], float]]): Packets with their callbacks
+                and submission times.
+        """
+
+        hands = [hand for packet, _, _ in batch for hand in packet.hands]
+
+        start_time = time.perf_counter()
+        try:
+            features = self.gesture_detector.prepare_features(hands)
+            results = self.gesture_detector.classify_features(features)
+        except Exception:
+            # The packets are still passed on, the streams keep running with unclassified hands
+            self.metrics.increment("classification_errors")
+            results = [None] * len(hands)
+        end_time = time.perf_counter()
+
+        self.batches += 1
+        self.classified_hands += len(hands)
+        self.metrics.record("classification", end_time - start_time)
+        self.metrics.increment("batches")
+        self.metrics.increment("hands_classified", len(hands))
+
+        offset = 0
+        for packet, callback, submit_time in batch:
+            packet.gesture_results = results[offset:offset + len(packet.hands)]
+            packet.stage_timestamps["classification"] = end_time
+            offset += len(packet.hands)
+
+            self.metrics.record("batch_wait", start_time - submit_time)
+            self._call(callback, packet)
+
+    def _call(self, callback: Callable[[FramePacket], None], packet: FramePacket) -> None:
+        """
+        Call a packet callback, a failing callback does not affect packets of other streams.
+
+        Args:
+            callback (Callable[[FramePacket], None]): Function receiving the classified packet.
+            packet (FramePacket): Classified packet.
+        """
+
+        try:
+            callback(packet)
+        except Exception:
+            self.metrics.increment("callback_errors")
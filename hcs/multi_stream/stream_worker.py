@@ -0,0 +1,289 @@
+import time
+import threading
+
+from typing import Callable, Dict, Optional, Union, TYPE_CHECKING
+
+from hcs.metrics import Metrics
+from hcs.models import FramePacket
+from hcs.pipeline import LatestQueue
+
+if TYPE_CHECKING:
+    from hcs.camera_video_capture import CameraVideoCapture
+    from hcs.frame_source import FrameSource
+    from hcs.hand_detector import HandDetector
+
+# Function opening the source of a stream
+SourceFactory = Callable[[], Union["CameraVideoCapture", "FrameSource"]]
+
+
+class StreamWorker:
+    """
+    Input stream of MultiStreamRuntime: a capture thread reading frames of its own source into a latest-wins queue
+    and its own HandDetector, run by the runtime scheduler. A lossless stream, e.g. a video file that would
+    otherwise be decoded much faster than detected, waits for the queued frame to be taken instead of dropping it.
+
+    Failures stay inside the stream. A source that cannot be opened, or keeps failing to deliver frames, e.g. an
+    unplugged camera, is released and opened again every reconnect_interval seconds. A detection error drops only
+    the frame.
+
+    Attributes:
+        STARTING (str): State before the source is opened for the first time.
+        RUNNING (str): State while frames are captured.
+        RECONNECTING (str): State while the source is being reopened.
+        FINISHED (str): State after the source ended and reconnecting is disabled.
+        FAILED (str): State after the source could not be opened max_open_failures times in a row.
+        name (str): Stream name.
+        metrics (Metrics): Metrics of the stream.
+        state (str): Stream state.
+        restarts (int): Number of times the source has been reopened after a disconnect.
+        last_error (Optional[str]): Description of the latest error.
+        frames (LatestQueue): Captured frames waiting for detection.
+        busy (bool): Flag set by the scheduler while a frame of the stream is being detected.
+        source (Optional[Union[CameraVideoCapture, FrameSource]]): Opened source.
+        detector (Optional[HandDetector]): Landmark detector of the stream, built when the source is first opened.
+        _source_factory (SourceFactory): Function opening the source.
+        _detector_factory (Callable[[Metrics], HandDetector]): Function building the detector.
+        lossless (bool): Flag to detect every frame, the capture waits for the detection.
+        _reconnect (bool): Flag to reopen a source that ended or failed.
+        _reconnect_interval (float): Time in seconds between attempts to open the source.
+        _max_open_failures (Optional[int]): Maximum number of failed attempts in a row to open the source.
+        _open_failures (int): Number of failed attempts in a row to open the source.
+        _max_read_failures (int): Number of failed reads in a row after which an opened source is reconnected.
+        _on_frame (Optional[Callable[[], None]]): Called after every captured frame.
+        _stop_event (threading.Event): Event stopping the capture thread.
+        _thread (Optional[threading.Thread]): Capture thread.
+    """
+
+    STARTING = "starting"
+    RUNNING = "running"
+    RECONNECTING = "reconnecting"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+    def __init__(self, name: str, source_factory: SourceFactory,
+                 detector_factory: Callable[[Metrics], "HandDetector"], reconnect: bool = True,
+                 reconnect_interval: float = 1.0, max_open_failures: Optional[int] = None, max_read_failures: int = 30,
+                 metrics: Optional[Metrics] = None, on_frame: Optional[Callable[[], None]] = None,
+                 lossless: Optional[bool] = None):
+        """
+        Constructor.
+
+        Args:
+            name (str): Stream name.
+            source_factory (SourceFactory): Function opening the source, e.g. a CameraVideoCapture or a FrameSource.
+            detector_factory (Callable[[Metrics], HandDetector]): Function building the detector recording to the
+                given metrics.
+            reconnect (bool): Defaults to True. Flag to reopen a source that ended or failed, e.g. a camera. When
+                False the stream finishes at the end of the source, e.g. a video file.
+            reconnect_interval (float): Defaults to 1.0. Time in seconds between attempts to open the source.
+            max_open_failures (Optional[int]): Defaults to None. Maximum number of failed attempts in a row to open
+                the source before the stream fails, unlimited when None.
+            max_read_failures (int): Defaults to 30. Number of failed reads in a row after which an opened source is
+                considered disconnected.
+            metrics (Optional[Metrics]): Defaults to None. Metrics of the stream, new enabled metrics when None.
+            on_frame (Optional[Callable[[], None]]): Defaults to None. Called after every captured frame.
+            lossless (Optional[bool]): Defaults to None. Flag to detect every frame instead of the latest one, by
+                default set for streams without reconnect, whose sources are files.
+        """
+
+        self.name: str = name
+        self.metrics: Metrics = metrics if metrics is not None else Metrics()
+        self.state: str = self.STARTING
+        self.restarts: int = 0
+        self.last_error: Optional[str] = None
+
+        self.frames: LatestQueue = LatestQueue(1)
+        self.busy: bool = False
+        self.lossless: bool = lossless if lossless is not None else not reconnect
+
+        self.source: Optional[Union["CameraVideoCapture", "FrameSource"]] = None
+        self.detector: Optional["HandDetector"] = None
+
+        self._source_factory: SourceFactory = source_factory
+        self._detector_factory: Callable[[Metrics], "HandDetector"] = detector_factory
+        self._reconnect: bool = reconnect
+        self._reconnect_interval: float = reconnect_interval
+        self._max_open_failures: Optional[int] = max_open_failures
+        self._open_failures: int = 0
+        self._max_read_failures: int = max_read_failures
+        self._on_frame: Optional[Callable[[], None]] = on_frame
+
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.metrics.register_counter("frames_dropped_queue", lambda: self.frames.dropped)
+        self.metrics.register_counter("restarts", lambda: self.restarts)
+
+    def start(self) -> None:
+        """
+        Start the capture thread. The source is opened and the detector built on that thread, so streams start
+        concurrently.
+        """
+
+        self._thread = threading.Thread(target=self._run, name=f"StreamWorker-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the capture thread and release the source.
+        """
+
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_alive(self) -> bool:
+        """
+        Returns:
+            bool: True while the capture thread is running.
+        """
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def detect(self, packet: FramePacket) -> Optional[FramePacket]:
+        """
+        Detect hands of a captured frame. Called by the scheduler, never for two frames of the stream at once.
+
+        Args:
+            packet (FramePacket): Captured frame.
+
+        Returns:
+            Optional[FramePacket]: Packet with detected hands, None when the detection failed.
+        """
+
+        try:
+            packet.hands = self.detector.find_hands(packet.frame.image, draw=False)
+        except Exception as error:
+            self.last_error = f"{type(error).__name__}: {error}"
+            self.metrics.increment("detection_errors")
+            return None
+
+        packet.stage_timestamps["detection"] = time.perf_counter()
+
+        return packet
+
+    def snapshot(self) -> Dict:
+        """
+        Returns:
+            Dict: State, restarts and the latest error of the stream with its metrics snapshot.
+        """
+
+        return {"state": self.state, "restarts": self.restarts, "last_error": self.last_error,
+                **self.metrics.snapshot()}
+
+    def _run(self) -> None:
+        """
+        Capture thread loop.
+        """
+
+        read_failures = 0
+
+        while not self._stop_event.is_set():
+            if self.source is None and not self._open_source():
+                continue
+
+            start_time = time.perf_counter()
+            try:
+                frame = self.source.read_frame()
+            except Exception as error:
+                self.last_error = f"{type(error).__name__}: {error}"
+                frame = None
+
+            if frame is None:
+                read_failures += 1
+
+                # A camera that is still open may only have timed out
+                if self.source.is_opened() and read_failures < self._max_read_failures:
+                    continue
+
+                read_failures = 0
+                self._release_source()
+
+                if not self._reconnect:
+                    self.state = self.FINISHED
+                    break
+
+                self.metrics.increment("disconnects")
+                self.state = self.RECONNECTING
+                self._stop_event.wait(self._reconnect_interval)
+                continue
+
+            read_failures = 0
+            packet = FramePacket(frame)
+            packet.stage_timestamps["capture"] = time.perf_counter()
+            self.metrics.record("capture", packet.stage_timestamps["capture"] - start_time)
+
+            # Files are read as fast as they are detected, not faster
+            while self.lossless and not self.frames.wait_for_space(0.1):
+                if self._stop_event.is_set():
+                    break
+
+            self.frames.put(packet)
+            if self._on_frame is not None:
+                self._on_frame()
+
+        self._release_source()
+        self.frames.close()
+
+        if self._on_frame is not None:
+            self._on_frame()
+
+    def _open_source(self) -> bool:
+        """
+        Open the source and, the first time, build and warm up the detector. After a failed attempt waits
+        reconnect_interval seconds.
+
+        Returns:
+            bool: True when the source has been opened.
+        """
+
+        try:
+            source = self._source_factory()
+
+            if not source.is_opened():
+                source.release()
+                raise RuntimeError("source could not be opened")
+
+            if self.detector is None:
+                self.detector = self._detector_factory(self.metrics)
+                self.detector.warm_up(source.cam_width, source.cam_height)
+        except Exception as error:
+            self.last_error = f"{type(error).__name__}: {error}"
+            self.metrics.increment("open_failures")
+            self._open_failures += 1
+
+            if not self._reconnect or (self._max_open_failures is not None
+                                       and self._open_failures >= self._max_open_failures):
+                self.state = self.FAILED
+                self._stop_event.set()
+                return False
+
+            self.state = self.RECONNECTING
+            self._stop_event.wait(self._reconnect_interval)
+            return False
+
+        if self.detector is not None and self.state == self.RECONNECTING:
+            self.restarts += 1
+
+        self._open_failures = 0
+        self.source = source
+        self.state = self.RUNNING
+
+        return True
+
+    def _release_source(self) -> None:
+        """
+        Release the opened source, ignoring errors of a broken device.
+        """
+
+        if self.source is None:
+            return
+
+        try:
+            self.source.release()
+        except Exception as error:
+            self.last_error = f"{type(error).__name__}: {error}"
+
+        self.source = None
@@ -0,0 +1,303 @@
+import time
+import threading
+
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+
+class LatestQueue:
+    """
+    Bounded queue connecting pipeline stages. Putting never blocks: when the queue is full the oldest item is
+    dropped, so a slow consumer always works on the most recent data. A producer that must not lose items waits
+    with wait_for_space before putting.
+
+    Attributes:
+        maxsize (int): Maximum number of items kept in the queue.
+        dropped (int): Number of items dropped because the queue was full.
+        _items (Deque[Any]): Queued items.
+        _condition (threading.Condition): Condition signalling that an item is available or has been removed.
+        _closed (bool): Flag closed queue.
+    """
+
+    def __init__(self, maxsize: int = 1):
+        """
+        Constructor.
+
+        Args:
+            maxsize (int): Defaults to 1. Maximum number of items kept in the queue.
+        """
+
+        self.maxsize: int = max(1, maxsize)
+        self.dropped: int = 0
+
+        self._items: Deque[Any] = deque()
+        self._condition: threading.Condition = threading.Condition()
+        self._closed: bool = False
+
+    def put(self, item: Any) -> None:
+        """
+        Put item into the queue, dropping the oldest one if the queue is full.
+
+        Args:
+            item (Any): Item to put.
+        """
+
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Remove and return the oldest item from the queue.
+
+        Args:
+            timeout (Optional[float]): Defaults to None. Maximum time in seconds to wait for an item.
+
+        Returns:
+            Optional[Any]: Item or None when the timeout expired or the queue has been closed.
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: self._items or self._closed, timeout)
+
+            if not self._items:
+                return None
+
+            # Wakes producers waiting for space
+            self._condition.notify_all()
+
+            return self._items.popleft()
+
+    def wait_for_space(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until an item can be put without dropping the oldest one.
+
+        Args:
+            timeout (Optional[float]): Defaults to None. Maximum time in seconds to wait.
+
+        Returns:
+            bool: True when the queue has space, False when the timeout expired or the queue has been closed.
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._items) < self.maxsize or self._closed, timeout)
+
+            return len(self._items) < self.maxsize and not self._closed
+
+    def close(self) -> None:
+        """
+        Close the queue and wake up all waiting consumers.
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Returns:
+            bool: True when the queue has been closed.
+        """
+
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class PipelineStage:
+    """
+    Pipeline stage running a processing function on its own worker thread.
+    The stage takes items from the input queue, processes them and puts the results into the output queue.
+    A stage without an input queue is a source: its function is called repeatedly with None.
+    When the function returns None the item is not passed on. When the function raises, the stage stops and keeps
+    the exception, its output queue is closed so the next stages finish as well.
+
+    Attributes:
+        name (str): Stage name, also used to store the stage timestamp.
+        processed (int): Number of items processed by the stage.
+        busy_time (float): Total time in seconds spent in the processing function.
+        error (Optional[Exception]): Exception that stopped the stage, None while it works.
+        _function (Callable[[Any], Any]): Processing function.
+        _input_queue (Optional[LatestQueue]): Queue with items to process.
+        _output_queue (Optional[LatestQueue]): Queue for processed items.
+        _stop_event (threading.Event): Event stopping the stage.
+        _thread (Optional[threading.Thread]): Worker thread.
+    """
+
+    def __init__(self, name: str, function: Callable[[Any], Any], input_queue: Optional[LatestQueue] = None,
+                 output_queue: Optional[LatestQueue] = None):
+        """
+        Constructor.
+
+        Args:
+            name (str): Stage name.
+            function (Callable[[Any], Any]): Processing function.
+            input_queue (Optional[LatestQueue]): Defaults to None. Queue with items to process.
+            output_queue (Optional[LatestQueue]): Defaults to None. Queue for processed items.
+        """
+
+        self.name: str = name
+        self.processed: int = 0
+        self.busy_time: float = 0.0
+        self.error: Optional[Exception] = None
+
+        self._function: Callable[[Any], Any] = function
+        self._input_queue: Optional[LatestQueue] = input_queue
+        self._output_queue: Optional[LatestQueue] = output_queue
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the worker thread.
+        """
+
+        self._thread = threading.Thread(target=self._run, name=f"PipelineStage-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the worker thread and close the output queue so the next stage finishes as well.
+        """
+
+        self._stop_event.set()
+
+        if self._input_queue is not None:
+            self._input_queue.close()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+        if self._output_queue is not None:
+            self._output_queue.close()
+
+    def is_alive(self) -> bool:
+        """
+        Returns:
+            bool: True when the worker thread is running.
+        """
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        """
+        Worker thread loop.
+        """
+
+        try:
+            while not self._stop_event.is_set():
+                if self._input_queue is not None:
+                    item = self._input_queue.get(timeout=0.1)
+
+                    if item is None:
+                        if self._input_queue.closed:
+                            break
+                        continue
+                else:
+                    item = None
+
+                start_time = time.perf_counter()
+                result = self._function(item)
+                end_time = time.perf_counter()
+
+                self.processed += 1
+                self.busy_time += end_time - start_time
+
+                if result is None:
+                    continue
+
+                if hasattr(result, "stage_timestamps"):
+                    result.stage_timestamps[self.name] = end_time
+
+                if self._output_queue is not None:
+                    self._output_queue.put(result)
+        except Exception as error:
+            self.error = error
+        finally:
+            # The next stage waits for this queue, it is closed even when the function raised
+            if self._output_queue is not None:
+                self._output_queue.close()
+
+
+class Pipeline:
+    """
+    Chain of pipeline stages connected by bounded latest-wins queues. Every stage works on its own thread, so the
+    throughput is set by the slowest stage instead of the sum of all stages.
+
+    Attributes:
+        stages (List[PipelineStage]): Pipeline stages in processing order.
+        output (LatestQueue): Queue with items processed by the last stage.
+    """
+
+    def __init__(self, source: Callable[[Any], Any], *functions: Callable[[Any], Any], queue_size: int = 1,
+                 names: Optional[List[str]] = None):
+        """
+        Constructor.
+
+        Args:
+            source (Callable[[Any], Any]): Function producing new items, called repeatedly with None.
+            *functions (Callable[[Any], Any]): Processing functions of the next stages.
+            queue_size (int): Defaults to 1. Size of the queues between stages.
+            names (Optional[List[str]]): Defaults to None. Stage names, by default taken from function names.
+        """
+
+        all_functions = [source, *functions]
+        names = names or [function.__name__ for function in all_functions]
+
+        queues = [LatestQueue(queue_size) for _ in all_functions]
+
+        self.stages: List[PipelineStage] = [
+            PipelineStage(names[0], source, None, queues[0])
+        ]
+        for index in range(1, len(all_functions)):
+            self.stages.append(PipelineStage(names[index], all_functions[index], queues[index - 1], queues[index]))
+
+        self.output: LatestQueue = queues[-1]
+
+    def start(self) -> None:
+        """
+        Start all stages.
+        """
+
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self) -> None:
+        """
+        Stop all stages starting with the source.
+        """
+
+        for stage in self.stages:
+            stage.stop()
+
+    def is_alive(self) -> bool:
+        """
+        Returns:
+            bool: True when any stage is still running.
+        """
+
+        return any(stage.is_alive() for stage in self.stages)
+
+    @property
+    def failed_stage(self) -> Optional[PipelineStage]:
+        """
+        Returns:
+            Optional[PipelineStage]: First stage stopped by an exception, None when all stages work.
+        """
+
+        return next((stage for stage in self.stages if stage.error is not None), None)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Returns:
+            int: Number of items dropped by all queues.
+        """
+
+        return sum(stage._output_queue.dropped for stage in self.stages if stage._output_queue is not None)
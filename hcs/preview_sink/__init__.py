@@ -0,0 +1,132 @@
+import time
+import threading
+import cv2
+
+from typing import Any, Callable, Optional
+
+from hcs.pipeline import LatestQueue
+
+
+class PreviewSink:
+    """
+    Optional preview window kept off the control path. The control loop only posts its latest frame with the
+    processing results, which never blocks; a separate thread renders the newest post at a low rate.
+
+    HighGUI windows have to be handled on the thread that owns them, the main thread on macOS and Windows, so the
+    rendered frame is shown by calling show from the control loop, which returns at once when no new frame has been
+    rendered.
+
+    Attributes:
+        fps (float): Maximum preview refresh rate.
+        window_name (str): Name of the preview window.
+        rendered_frames (int): Number of rendered preview frames.
+        shown_frames (int): Number of preview frames shown in the window.
+        _render (Callable[..., Any]): Function drawing the results on the frame and returning the image.
+        _on_quit (Optional[Callable[[], None]]): Called when 'q' is pressed in the preview window.
+        _queue (LatestQueue): Latest posted frame.
+        _rendered (LatestQueue): Latest rendered frame waiting to be shown.
+        _stop_event (threading.Event): Event stopping the preview thread.
+        _thread (Optional[threading.Thread]): Render thread.
+    """
+
+    def __init__(self, render: Callable[..., Any], fps: float = 5.0, window_name: str = "HCS - preview",
+                 on_quit: Optional[Callable[[], None]] = None):
+        """
+        Constructor.
+
+        Args:
+            render (Callable[..., Any]): Function drawing the posted results on the frame and returning the image.
+            fps (float): Defaults to 5.0. Maximum preview refresh rate.
+            window_name (str): Defaults to "HCS - preview". Name of the preview window.
+            on_quit (Optional[Callable[[], None]]): Defaults to None. Called when 'q' is pressed in the window.
+        """
+
+        self.fps: float = fps
+        self.window_name: str = window_name
+        self.rendered_frames: int = 0
+        self.shown_frames: int = 0
+
+        self._render: Callable[..., Any] = render
+        self._on_quit: Optional[Callable[[], None]] = on_quit
+        self._queue: LatestQueue = LatestQueue(1)
+        self._rendered: LatestQueue = LatestQueue(1)
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the render thread.
+        """
+
+        self._thread = threading.Thread(target=self._run, name="PreviewSink", daemon=True)
+        self._thread.start()
+
+    def post(self, img: Any, *results: Any) -> None:
+        """
+        Post a frame with its processing results. Never blocks, an older post not rendered yet is dropped.
+
+        Args:
+            img (Any): Frame.
+            *results (Any): Processing results passed to the render function.
+        """
+
+        self._queue.put((img, results))
+
+    def show(self) -> bool:
+        """
+        Show the latest rendered frame and handle the window events. Called on the thread owning the window, never
+        waits for a frame.
+
+        Returns:
+            bool: True when a new frame has been shown.
+        """
+
+        img = self._rendered.get(timeout=0)
+
+        if img is None:
+            return False
+
+        cv2.imshow(self.window_name, img)
+        self.shown_frames += 1
+
+        if cv2.waitKey(1) == ord('q') and self._on_quit is not None:
+            self._on_quit()
+
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop the render thread and close the window. Called on the thread owning the window.
+        """
+
+        self._stop_event.set()
+        self._queue.close()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self.shown_frames:
+            cv2.destroyWindow(self.window_name)
+
+    def _run(self) -> None:
+        """
+        Render thread loop.
+        """
+
+        interval = 1 / self.fps
+
+        while not self._stop_event.is_set():
+            start_time = time.perf_counter()
+            item = self._queue.get(timeout=interval)
+
+            if item is None:
+                continue
+
+            img, results = item
+            img = self._render(img, *results)
+            self._rendered.put(img)
+            self.rendered_frames += 1
+
+            # Limit the refresh rate
+            self._stop_event.wait(max(0.0, interval - (time.perf_counter() - start_time)))
@@ -0,0 +1,289 @@
+import os
+import glob
+import time
+import numpy as np
+
+from typing import Any, Dict, List, Optional
+
+from hcs.models import Hand, GestureClassificationResult
+
+# Record of one hand of a frame, fields ordered so that every field is naturally aligned, 304 bytes
+SESSION_RECORD_DTYPE = np.dtype([
+    ("frame_id", "<u8"),
+    ("timestamp", "<f8"),
+    ("landmarks", "<f4", (21, 3)),
+    ("border_box", "<i4", (4,)),
+    ("score", "<f4"),
+    ("gesture_score", "<f4"),
+    ("latency", "<f4"),
+    ("hand_type", "i1"),
+    ("gesture_id", "i1"),
+], align=True)
+
+# File header, padded to one page so the records start page aligned
+SESSION_HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("record_size", "<u4"),
+    ("frame_width", "<u4"),
+    ("frame_height", "<u4"),
+    ("created", "<f8"),
+    ("count", "<u8"),
+])
+
+SESSION_HEADER_SIZE = 4096
+SESSION_MAGIC = b"HCSR"
+SESSION_VERSION = 1
+
+# Gesture id of a hand without classification result
+NO_GESTURE = -1
+
+
+class SessionRecorder:
+    """
+    Records the hands detected in every frame with their classified gestures for later analysis, e.g. of
+    misclassifications in the field, at a few microseconds per frame.
+
+    Records (see SESSION_RECORD_DTYPE) are appended to a binary file through a memory map. The file grows in
+    preallocated chunks of chunk_records records, so appending never extends the file, and the record count in the
+    header is updated with every frame, so a crashed session stays readable. When the next chunk would exceed
+    max_file_size, the recording continues in a new file: files are named <stem>_0000<ext>, <stem>_0001<ext>, ...
+    Existing files are never overwritten, a recording to the path of an earlier one continues after its highest
+    index. Use load_session or load_sessions to read them.
+
+    Attributes:
+        path (str): Path pattern of the files, e.g. session.hcsr.
+        frame_width (int): Frame width.
+        frame_height (int): Frame height.
+        chunk_records (int): Number of records allocated at once.
+        max_file_size (int): Maximum size of a file in bytes.
+        files (List[str]): Paths of the written files.
+        records (int): Number of recorded hands of all files.
+        _clock_offset (float): Difference of Unix time and time.perf_counter.
+        _file (Optional[Any]): Current file.
+        _header (Optional[numpy.memmap]): Header of the current file.
+        _chunk (Optional[numpy.memmap]): Memory map of the current chunk.
+        _chunk_start (int): Index of the first record of the current chunk.
+        _count (int): Number of records of the current file.
+        _allocated (int): Number of allocated records of the current file.
+    """
+
+    def __init__(self, path: str, frame_width: int = 0, frame_height: int = 0, chunk_records: int = 16384,
+                 max_file_size: int = 1 << 30):
+        """
+        Constructor.
+
+        Args:
+            path (str): Path pattern of the files, e.g. session.hcsr, the files get an index appended to the stem.
+            frame_width (int): Defaults to 0. Frame width stored in the header.
+            frame_height (int): Defaults to 0. Frame height stored in the header.
+            chunk_records (int): Defaults to 16384. Number of records allocated at once, about 5 MB.
+            max_file_size (int): Defaults to 1 GiB. Maximum size of a file in bytes.
+        """
+
+        self.path: str = path
+        self.frame_width: int = frame_width
+        self.frame_height: int = frame_height
+        self.chunk_records: int = chunk_records
+        self.max_file_size: int = max(max_file_size,
+                                      SESSION_HEADER_SIZE + chunk_records * SESSION_RECORD_DTYPE.itemsize)
+        self.files: List[str] = []
+        self.records: int = 0
+
+        self._clock_offset: float = time.time() - time.perf_counter()
+        self._file: Optional[Any] = None
+        self._header: Optional[np.memmap] = None
+        self._chunk: Optional[np.memmap] = None
+        self._chunk_start: int = 0
+        self._count: int = 0
+        self._allocated: int = 0
+
+    def record(self, frame_id: int, timestamp: float, hands: List[Hand],
+               gesture_results: List[Optional[GestureClassificationResult]]) -> None:
+        """
+        Append the hands of a frame, frames without hands are not recorded.
+
+        Args:
+            frame_id (int): Frame id.
+            timestamp (float): Capture time of the frame, time.perf_counter based, recorded as Unix time.
+            hands (List[Hand]): Hands of the frame.
+            gesture_results (List[Optional[GestureClassificationResult]]): Classification result of every hand.
+        """
+
+        if not hands:
+            return
+
+        if self._chunk is None or self._count + len(hands) > self._chunk_start + len(self._chunk):
+            self._allocate(len(hands))
+
+        start = self._count - self._chunk_start
+        records = self._chunk[start:start + len(hands)]
+
+        records["frame_id"] = frame_id
+        records["timestamp"] = timestamp + self._clock_offset
+        records["latency"] = time.perf_counter() - timestamp
+        records["landmarks"] = [hand.landmarks for hand in hands]
+        records["border_box"] = [hand.border_box for hand in hands]
+        records["score"] = [hand.score for hand in hands]
+        records["hand_type"] = [hand.type.value for hand in hands]
+        records["gesture_id"] = [result.gesture_type.value if result is not None else NO_GESTURE
+                                 for result in gesture_results]
+        records["gesture_score"] = [result.score if result is not None else 0.0 for result in gesture_results]
+
+        # Published after the records, a crash never exposes a partial record
+        self._count += len(hands)
+        self._header["count"] = self._count
+        self.records += len(hands)
+
+    def close(self) -> None:
+        """
+        Close the current file, releasing its unused preallocated space.
+        """
+
+        if self._file is None:
+            return
+
+        self._header.flush()
+        self._chunk = self._header = None
+
+        self._file.truncate(SESSION_HEADER_SIZE + self._count * SESSION_RECORD_DTYPE.itemsize)
+        self._file.close()
+        self._file = None
+
+    def _allocate(self, needed: int) -> None:
+        """
+        Map the next chunk, allocating it at the end of the current file or starting a new file when the file would
+        exceed max_file_size.
+
+        Args:
+            needed (int): Number of records that have to fit into the chunk.
+        """
+
+        records = max(self.chunk_records, needed)
+
+        if self._file is None or SESSION_HEADER_SIZE + (self._count + records) * SESSION_RECORD_DTYPE.itemsize > \
+                self.max_file_size:
+            self.close()
+            self._open_file()
+
+        # The chunk starts at the first unused record, a frame never spans two chunks
+        self._chunk_start = self._count
+        self._allocated = self._count + records
+        size = SESSION_HEADER_SIZE + self._allocated * SESSION_RECORD_DTYPE.itemsize
+
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(self._file.fileno(), 0, size)
+        else:
+            self._file.truncate(size)
+
+        self._chunk = np.memmap(self._file, SESSION_RECORD_DTYPE, "r+",
+                                SESSION_HEADER_SIZE + self._chunk_start * SESSION_RECORD_DTYPE.itemsize, (records,))
+
+    def _open_file(self) -> None:
+        """
+        Create the next file and write its header.
+        """
+
+        stem, extension = os.path.splitext(self.path)
+
+        existing = session_files(self.path)
+        index = int(os.path.splitext(existing[-1])[0].rsplit("_", 1)[1]) + 1 if existing else 0
+
+        # Exclusive creation, a file created meanwhile by another recorder is skipped
+        while True:
+            path = f"{stem}_{index:04d}{extension}"
+            try:
+                self._file = open(path, "x+b")
+                break
+            except FileExistsError:
+                index += 1
+
+        self._file.truncate(SESSION_HEADER_SIZE)
+        self.files.append(path)
+
+        self._header = np.memmap(self._file, SESSION_HEADER_DTYPE, "r+", 0, (1,))
+        self._header["magic"] = SESSION_MAGIC
+        self._header["version"] = SESSION_VERSION
+        self._header["record_size"] = SESSION_RECORD_DTYPE.itemsize
+        self._header["frame_width"] = self.frame_width
+        self._header["frame_height"] = self.frame_height
+        self._header["created"] = time.time()
+        self._header["count"] = 0
+
+        self._count = self._allocated = 0
+
+
+def session_info(path: str) -> Dict[str, Any]:
+    """
+    Args:
+        path (str): Path to a session file.
+
+    Returns:
+        Dict[str, Any]: Frame size, creation time and number of records of the file.
+    """
+
+    header = np.fromfile(path, SESSION_HEADER_DTYPE, count=1)
+
+    if len(header) == 0 or header[0]["magic"] != SESSION_MAGIC:
+        raise ValueError(f"{path} is not a session recording")
+    if header[0]["version"] != SESSION_VERSION or header[0]["record_size"] != SESSION_RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} has an unsupported format version {header[0]['version']}")
+
+    return {
+        "frame_width": int(header[0]["frame_width"]),
+        "frame_height": int(header[0]["frame_height"]),
+        "created": float(header[0]["created"]),
+        "count": int(header[0]["count"]),
+    }
+
+
+def load_session(path: str) -> np.ndarray:
+    """
+    Map the records of a session file without reading them, for random access and vectorized analysis, e.g.
+    records[records["gesture_score"] < 0.5]["landmarks"]. Files of a running recorder can be loaded, they contain
+    the records written so far.
+
+    Args:
+        path (str): Path to a session file.
+
+    Returns:
+        numpy.ndarray: Read-only numpy.memmap of SESSION_RECORD_DTYPE, an empty array when there are no records.
+    """
+
+    count = session_info(path)["count"]
+
+    if count == 0:
+        return np.empty(0, dtype=SESSION_RECORD_DTYPE)
+
+    return np.memmap(path, SESSION_RECORD_DTYPE, "r", SESSION_HEADER_SIZE, (count,))
+
+
+def session_files(path: str) -> List[str]:
+    """
+    Args:
+        path (str): Path pattern given to SessionRecorder, e.g. session.hcsr.
+
+    Returns:
+        List[str]: Paths of the files recorded with the path pattern in recording order.
+    """
+
+    stem, extension = os.path.splitext(path)
+
+    return sorted(glob.glob(f"{glob.escape(stem)}_[0-9][0-9][0-9][0-9]{extension}"))
+
+
+def load_sessions(path: str) -> List[np.ndarray]:
+    """
+    Map the records of all files of a recording. Recordings made one after another with the same path pattern are
+    returned together in recording order, the frame ids restart with every recording.
+
+    Args:
+        path (str): Path pattern given to SessionRecorder, e.g. session.hcsr, or a glob pattern of session files.
+
+    Returns:
+        List[numpy.ndarray]: Records of every file in recording order.
+    """
+
+    paths = session_files(path) or sorted(glob.glob(path))
+
+    return [load_session(file_path) for file_path in paths]
@@ -0,0 +1,49 @@
+import time
+import argparse
+import numpy as np
+
+from hcs.models import GestureType, HandType
+from hcs.session_recorder import NO_GESTURE, load_session, session_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - summary of recorded sessions")
+    parser.add_argument("paths", nargs="+", help="session files")
+    parser.add_argument("--min-score", type=float, default=0.5,
+                        help="gesture score below which a classification counts as low confidence")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        info = session_info(path)
+        records = load_session(path)
+
+        print(f"{path}: {info['frame_width']}x{info['frame_height']}, "
+              f"created {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info['created']))}")
+
+        if len(records) == 0:
+            print("  no hands recorded")
+            continue
+
+        frames = len(np.unique(records["frame_id"]))
+        duration = float(records["timestamp"][-1] - records["timestamp"][0])
+        print(f"  {len(records)} hands in {frames} frames over {duration:.1f} s, "
+              f"latency p50 {np.percentile(records['latency'], 50) * 1000:.1f} ms, "
+              f"p95 {np.percentile(records['latency'], 95) * 1000:.1f} ms")
+
+        for hand_type in HandType:
+            hands = records[records["hand_type"] == hand_type.value]
+            if len(hands) == 0:
+                continue
+
+            print(f"  {hand_type.name} hand: {len(hands)}, mean score {hands['score'].mean():.2f}")
+            gesture_ids, counts = np.unique(hands["gesture_id"], return_counts=True)
+
+            for gesture_id, count in zip(gesture_ids, counts):
+                name = GestureType(gesture_id).name if gesture_id != NO_GESTURE else "unclassified"
+                gesture_scores = hands["gesture_score"][hands["gesture_id"] == gesture_id]
+                low = int(np.count_nonzero(gesture_scores < args.min_score)) if gesture_id != NO_GESTURE else 0
+                print(f"    {name}: {count}, {low} below score {args.min_score:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+import os
+import time
+import pickle
+import shutil
+import tempfile
+import tracemalloc
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, RidgeClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from hcs.hand_gesture_detector.compiled_model import CompiledGestureModel
+from hcs.hand_gesture_detector.model_export import export_model
+
+# Candidate models of the notebook, built from a seed
+CANDIDATES: Dict[str, Callable[[int], Any]] = {
+    "lr": lambda seed: make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000, random_state=seed)),
+    "ridge": lambda seed: make_pipeline(StandardScaler(), RidgeClassifier(random_state=seed)),
+    "rf": lambda seed: make_pipeline(StandardScaler(), RandomForestClassifier(random_state=seed)),
+    "rf_small": lambda seed: make_pipeline(StandardScaler(),
+                                           RandomForestClassifier(n_estimators=20, max_depth=10, random_state=seed)),
+    "gb": lambda seed: make_pipeline(StandardScaler(), GradientBoostingClassifier(random_state=seed)),
+    "svc": lambda seed: make_pipeline(StandardScaler(), SVC(probability=True, random_state=seed)),
+}
+
+
+@dataclass
+class CandidateReport:
+    """
+    Evaluation of a candidate model. Latencies of exportable candidates are measured on the compiled model used
+    at runtime. Candidates without class probabilities, like RidgeClassifier, are measured with scikit-learn and
+    are never selected, HandGestureDetector needs probabilities for its confidence threshold.
+
+    Attributes:
+        artifact_bytes (int): Size of the compiled artifact file, or of the pickle for not exportable candidates.
+        memory_bytes (int): Memory allocated by loading the compiled artifact, or by unpickling the model.
+    """
+
+    name: str
+    cv_accuracy: float
+    cv_accuracy_std: float
+    single_latency_p50_ms: float
+    single_latency_p95_ms: float
+    batch_latency_per_row_ms: float
+    artifact_bytes: int
+    memory_bytes: int
+    exportable: bool
+    within_budget: bool = False
+
+
+def evaluate_candidate(name: str, model: Any, features: np.ndarray, targets: np.ndarray, folds: int = 5,
+                       seed: int = 0, latency_repeats: int = 300, batch_size: int = 64,
+                       export_path: Optional[str] = None) -> CandidateReport:
+    """
+    Cross-validate a candidate, fit it on the whole dataset, export it to the compiled model format and measure
+    its inference latency and size - of the compiled artifact, or of the pickle for not exportable candidates. The
+    memory footprint is measured with tracemalloc around loading the artifact.
+
+    Args:
+        name (str): Candidate name.
+        model (Any): Unfitted scikit-learn model.
+        features (numpy.ndarray): Feature matrix.
+        targets (numpy.ndarray): Gesture types.
+        folds (int): Defaults to 5. Number of stratified cross-validation folds.
+        seed (int): Defaults to 0. Seed of the fold split and of the latency samples.
+        latency_repeats (int): Defaults to 300. Number of timed single-row predictions.
+        batch_size (int): Defaults to 64. Number of rows of the timed batch predictions.
+        export_path (Optional[str]): Defaults to None. Path the compiled model is written to, a temporary file
+            when None.
+
+    Returns:
+        CandidateReport: Evaluation of the candidate.
+    """
+
+    split = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    scores = cross_val_score(model, features, targets, cv=split, scoring="accuracy")
+
+    model.fit(features, targets)
+
+    exportable = hasattr(model, "predict_proba")
+    if exportable:
+        if export_path is not None:
+            artifact_bytes, memory_bytes, predict = _export_compiled(model, export_path)
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                artifact_bytes, memory_bytes, predict = _export_compiled(model,
+                                                                         os.path.join(directory, f"{name}.npz"))
+    else:
+        artifact = pickle.dumps(model)
+        artifact_bytes = len(artifact)
+        memory_bytes, loaded = _traced_load(lambda: pickle.loads(artifact))
+        predict = loaded.decision_function
+
+    rng = np.random.default_rng(seed)
+    rows = features[rng.integers(0, len(features), latency_repeats)]
+    batch = features[rng.integers(0, len(features), batch_size)]
+
+    # Warm-up, the first call pays for lazy allocations
+    predict(rows[:1])
+
+    single_latencies = np.empty(latency_repeats)
+    for index in range(latency_repeats):
+        start_time = time.perf_counter()
+        predict(rows[index:index + 1])
+        single_latencies[index] = time.perf_counter() - start_time
+
+    batch_latencies = np.empty(max(1, latency_repeats // 10))
+    for index in range(len(batch_latencies)):
+        start_time = time.perf_counter()
+        predict(batch)
+        batch_latencies[index] = time.perf_counter() - start_time
+
+    return CandidateReport(
+        name=name,
+        cv_accuracy=float(scores.mean()),
+        cv_accuracy_std=float(scores.std()),
+        single_latency_p50_ms=float(np.percentile(single_latencies, 50)) * 1000,
+        single_latency_p95_ms=float(np.percentile(single_latencies, 95)) * 1000,
+        batch_latency_per_row_ms=float(np.median(batch_latencies)) * 1000 / batch_size,
+        artifact_bytes=artifact_bytes,
+        memory_bytes=memory_bytes,
+        exportable=exportable,
+    )
+
+
+def _export_compiled(model: Any, path: str) -> Tuple[int, int, Callable[[np.ndarray], np.ndarray]]:
+    """
+    Args:
+        model (Any): Fitted scikit-learn model with class probabilities.
+        path (str): Path the compiled model is written to.
+
+    Returns:
+        Tuple[int, int, Callable[[numpy.ndarray], numpy.ndarray]]: Size of the compiled artifact in bytes, memory
+            allocated by loading it in bytes and the predict_proba of the loaded compiled model.
+    """
+
+    export_model(model, path)
+    memory_bytes, compiled = _traced_load(lambda: CompiledGestureModel.load(path, mmap=False))
+
+    return os.path.getsize(path), memory_bytes, compiled.predict_proba
+
+
+def _traced_load(load: Callable[[], Any]) -> Tuple[int, Any]:
+    """
+    Args:
+        load (Callable[[], Any]): Loads a model.
+
+    Returns:
+        Tuple[int, Any]: Memory still allocated after the load in bytes, NumPy arrays included, and the model.
+    """
+
+    # Leaves tracing on when the caller already traces, the difference is what the load allocated
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        loaded = load()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    return after - before, loaded
+
+
+def select_model(reports: List[CandidateReport], latency_budget_ms: float) -> CandidateReport:
+    """
+    Select the most accurate exportable candidate whose p95 single-row latency fits the budget, the faster one on
+    equal accuracy. When no candidate fits, the fastest exportable one is selected.
+
+    Args:
+        reports (List[CandidateReport]): Evaluated candidates.
+        latency_budget_ms (float): Maximum p95 single-row latency in milliseconds.
+
+    Returns:
+        CandidateReport: Selected candidate.
+    """
+
+    for report in reports:
+        report.within_budget = report.single_latency_p95_ms <= latency_budget_ms
+
+    exportable = [report for report in reports if report.exportable]
+    if not exportable:
+        raise ValueError("No exportable candidate model")
+
+    within_budget = [report for report in exportable if report.within_budget]
+
+    if not within_budget:
+        return min(exportable, key=lambda report: report.single_latency_p95_ms)
+
+    return max(within_budget, key=lambda report: (report.cv_accuracy, -report.single_latency_p95_ms))
+
+
+def train(features: np.ndarray, targets: np.ndarray, output_path: str, candidates: Optional[List[str]] = None,
+          latency_budget_ms: float = 1.0, folds: int = 5, seed: int = 0,
+          progress: Optional[Callable[[CandidateReport], None]] = None) -> Tuple[CandidateReport, List[CandidateReport]]:
+    """
+    Evaluate candidate models and write the selected one as a compiled model loadable by HandGestureDetector.
+
+    Args:
+        features (numpy.ndarray): Feature matrix, see hcs.dataset.load_dataset.
+        targets (numpy.ndarray): Gesture types.
+        output_path (str): Path to the compiled model (.npz).
+        candidates (Optional[List[str]]): Defaults to None. Names of CANDIDATES to evaluate, all when None.
+        latency_budget_ms (float): Defaults to 1.0. Maximum p95 single-row latency in milliseconds.
+        folds (int): Defaults to 5. Number of cross-validation folds.
+        seed (int): Defaults to 0. Seed of the fold split, the models and the latency samples.
+        progress (Optional[Callable[[CandidateReport], None]]): Defaults to None. Called after every candidate.
+
+    Returns:
+        Tuple[CandidateReport, List[CandidateReport]]: Selected candidate and all reports.
+    """
+
+    reports: List[CandidateReport] = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in candidates or list(CANDIDATES):
+            report = evaluate_candidate(name, CANDIDATES[name](seed), features, targets, folds, seed,
+                                        export_path=os.path.join(directory, f"{name}.npz"))
+            reports.append(report)
+
+            if progress is not None:
+                progress(report)
+
+        selected = select_model(reports, latency_budget_ms)
+        shutil.copyfile(os.path.join(directory, f"{selected.name}.npz"), output_path)
+
+    return selected, reports
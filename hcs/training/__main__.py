@@ -0,0 +1,56 @@
+import json
+import argparse
+
+from dataclasses import asdict
+
+from hcs.dataset import load_dataset
+from hcs.training import CANDIDATES, CandidateReport, train
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hands Control System - train and select a gesture model")
+    parser.add_argument("dataset", help="dataset path (.npz, .parquet or notebook .csv)")
+    parser.add_argument("output", help="compiled model path (.npz), loadable by HandGestureDetector")
+    parser.add_argument("--candidates", default=",".join(CANDIDATES),
+                        help=f"comma separated candidate models, from: {', '.join(CANDIDATES)}")
+    parser.add_argument("--latency-budget-ms", type=float, default=1.0,
+                        help="maximum p95 single-row inference latency in milliseconds")
+    parser.add_argument("--folds", type=int, default=5, help="number of cross-validation folds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the fold split and the models")
+    parser.add_argument("--json", help="write the candidate reports to a JSON file")
+    args = parser.parse_args()
+
+    candidates = [name.strip() for name in args.candidates.split(",") if name.strip()]
+    unknown = [name for name in candidates if name not in CANDIDATES]
+    if unknown:
+        parser.error(f"unknown candidates: {', '.join(unknown)}")
+
+    features, targets = load_dataset(args.dataset)
+    print(f"Loaded {len(features)} samples from {args.dataset}")
+    print(f"{'model':<10} {'accuracy':>15} {'p50 ms':>8} {'p95 ms':>8} {'batch ms/row':>13} {'size KiB':>9} "
+          f"{'memory KiB':>11}")
+
+    def progress(report: CandidateReport) -> None:
+        print(f"{report.name:<10} {report.cv_accuracy:>8.4f} ±{report.cv_accuracy_std:.4f} "
+              f"{report.single_latency_p50_ms:>8.3f} {report.single_latency_p95_ms:>8.3f} "
+              f"{report.batch_latency_per_row_ms:>13.4f} {report.artifact_bytes / 1024:>9.1f} "
+              f"{report.memory_bytes / 1024:>11.1f}"
+              f"{'' if report.exportable else '  (no probabilities, not exportable)'}")
+
+    selected, reports = train(features, targets, args.output, candidates=candidates,
+                              latency_budget_ms=args.latency_budget_ms, folds=args.folds, seed=args.seed,
+                              progress=progress)
+
+    if not selected.within_budget:
+        print(f"No candidate fits the {args.latency_budget_ms} ms budget, selected the fastest one")
+
+    print(f"Saved {selected.name} model to {args.output}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"selected": selected.name, "latency_budget_ms": args.latency_budget_ms,
+                       "candidates": [asdict(report) for report in reports]}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
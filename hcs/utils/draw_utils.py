@@ -1,8 +1,15 @@
 import cv2
 
-from typing import Any, Tuple, Optional
+from typing import Any, Tuple
 
-from hcs.models import Hand, GestureClassificationResult
+from hcs.models import Hand
+
+# Connections between hand landmarks, the same as `mediapipe.solutions.hands.HAND_CONNECTIONS`
+HAND_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12), (9, 13), (13, 14), (14, 15),
+    (15, 16), (13, 17), (17, 18), (18, 19), (19, 20), (0, 17)
+]
 
 
 def draw_bounding_box(img: Any, pt1: Tuple[int, int], pt2: Tuple[int, int]) -> Any:
@@ -22,6 +29,30 @@ def draw_bounding_box(img: Any, pt1: Tuple[int, int], pt2: Tuple[int, int]) -> A
     return img
 
 
+def draw_hand_landmarks(img: Any, landmarks: Any) -> Any:
+    """
+    Draw hand landmarks and connections between them in image, in the default MediaPipe drawing style.
+    Used when hands were found without drawing on the image.
+
+    Args:
+        img (Any): Image to draw the hand landmarks.
+        landmarks (Any): Hand landmarks in pixel format.
+
+    Returns:
+        Any: An image with hand landmarks.
+    """
+
+    points = [(int(landmark[0]), int(landmark[1])) for landmark in landmarks]
+
+    for start, end in HAND_CONNECTIONS:
+        cv2.line(img, points[start], points[end], (224, 224, 224), 2)
+
+    for point in points:
+        cv2.circle(img, point, 2, (0, 0, 255), 2)
+
+    return img
+
+
 def draw_border_box(img: Any, border_box: Tuple[int, int, int, int]) -> Any:
     """
     Draw hand border in image.
@@ -88,39 +119,3 @@ def draw_hand_info(img: Any, hand: Hand) -> Any:
                 2, cv2.LINE_AA)
 
     return img
-
-
-def draw_gesture_info(img: Any, gesture_clf: Optional[GestureClassificationResult],
-                      border_box: Tuple[int, int, int, int]) -> Any:
-    """
-    List the hand gesture predicted information in the picture in the higher left corner of the hand border box.
-    Information such as:
-        * gesture type name
-        * probability
-
-    Args:
-        img (Any): Image to list gesture information.
-        gesture_clf (Optional[GestureClassificationResult]): Result of gesture classification.
-        border_box (Tuple[int, int, int, int]): Dimensions and position of the border box
-
-    Returns:
-        Any: An image with or without listed gesture information.
-    """
-
-    x, y, w, h = border_box
-
-    if gesture_clf:
-        # Draw classified gesture type
-        cv2.putText(img, 'TYPE', (x + 10, y + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2, cv2.LINE_AA)  # 12px
-        cv2.putText(img, gesture_clf.gesture_type.name, (x + 70, y + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
-                    (240, 130, 0), 2, cv2.LINE_AA)  # 15px
-
-        # Draw gesture probability
-        cv2.putText(img, 'PROB', (x + 10, y + 52), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2, cv2.LINE_AA)
-        cv2.putText(img, str(round(gesture_clf.score, 2)), (x + 70, y + 55), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
-                    (240, 130, 0), 2, cv2.LINE_AA)
-    else:
-        cv2.putText(img, 'GESTURE UNCLASSIFIED', (x + 10, y + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2,
-                    cv2.LINE_AA)
-
-    return img
@@ -1,40 +1,83 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-from typing import List, AnyStr
+from typing import List, AnyStr, Tuple, Union
 from hcs.models import Hand
+from hcs.models.hand import BorderBox
 
 
-def prepare_hand_data(hand: Hand) -> List[List[float]]:
+def calculate_border_box(landmarks: np.ndarray, margin: int = 20) -> Tuple[BorderBox, Tuple[int, int]]:
     """
-    Function that calculates hand landmarks based on the frame area.
-    Scales Hand landmarks to ranges [0, 1].
+    Function that calculates the hand border box and its center from hand landmarks in pixel format.
 
     Args:
-        hand (Hand): Hand information.
+        landmarks (numpy.ndarray): (21, 3) hand landmarks in pixel format.
+        margin (int): Defaults to 20. Margin around the landmarks in pixels.
+
+    Returns:
+        Tuple[BorderBox, Tuple[int, int]]: Border box and center of the hand.
+    """
+
+    x_min, y_min = landmarks[:, :2].min(axis=0)
+    x_max, y_max = landmarks[:, :2].max(axis=0)
+    x_min, x_max = int(x_min) - margin, int(x_max) + margin
+    y_min, y_max = int(y_min) - margin, int(y_max) + margin
+
+    border_box = BorderBox(x_min, y_min, x_max - x_min, y_max - y_min)
+    center = border_box[0] + (border_box[2] // 2), border_box[1] + (border_box[3] // 2)
+
+    return border_box, center
+
+
+def normalize_landmarks(landmarks: np.ndarray, border_box: Union[Tuple[int, int, int, int], np.ndarray]) -> np.ndarray:
+    """
+    Function that calculates hand landmarks based on the border box area.
+    Scales x and y of hand landmarks to ranges [0, 1], z is left unchanged.
+    Works on a single hand with (21, 3) landmarks and (4,) border box, and on a stack of hands with (N, 21, 3)
+    landmarks and (N, 4) border boxes.
+
+    Args:
+        landmarks (numpy.ndarray): Hand landmarks in pixel format.
+        border_box (Union[Tuple[int, int, int, int], numpy.ndarray]): Border box or border boxes of hands.
 
     Returns:
-        (List[List[float]]): List of processed hand landmarks.
+        numpy.ndarray: Normalized hand landmarks with the same shape as landmarks.
     """
 
-    x_min, y_min, box_width, box_height = hand.border_box
-    landmarks = []
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    border_box = np.asarray(border_box, dtype=np.float32)
 
-    for landmark in hand.landmarks:
-        x = np.interp(landmark[0] - x_min, (0, box_width), (0, 1))
-        y = np.interp(landmark[1] - y_min, (0, box_height), (0, 1))
+    # (..., 4) border boxes broadcast against (..., 21, 2) coordinates
+    origin = border_box[..., np.newaxis, :2]
+    size = border_box[..., np.newaxis, 2:]
 
-        landmarks.append([x, y, landmark[2]])
+    normalized = np.empty_like(landmarks)
+    np.clip((landmarks[..., :2] - origin) / size, 0, 1, out=normalized[..., :2])
+    normalized[..., 2] = landmarks[..., 2]
 
-    return landmarks
+    return normalized
 
 
-def draw_hand_gesture(landmarks: List[List[float]], title: AnyStr) -> None:
+def prepare_hand_data(hand: Hand) -> np.ndarray:
+    """
+    Function that calculates hand landmarks based on the frame area.
+    Scales Hand landmarks to ranges [0, 1].
+
+    Args:
+        hand (Hand): Hand information.
+
+    Returns:
+        (numpy.ndarray): (21, 3) array of processed hand landmarks.
+    """
+
+    return normalize_landmarks(hand.landmarks, hand.border_box)
+
+
+def draw_hand_gesture(landmarks: Union[List[List[float]], np.ndarray], title: AnyStr) -> None:
     """
     A function that draws landmarks on a graph.
 
     Args:
-        landmarks (List[List[float]]): Hand landmarks.
+        landmarks (Union[List[List[float]], numpy.ndarray]): Hand landmarks.
         title (AnyStr): Plot title.
     """
     landmarks_connections = [
@@ -43,6 +86,9 @@ def draw_hand_gesture(landmarks: List[List[float]], title: AnyStr) -> None:
         (15, 16), (13, 17), (17, 18), (18, 19), (19, 20), (0, 17)
     ]
 
+    # Imported on use, matplotlib is not needed at runtime
+    import matplotlib.pyplot as plt
+
     x = list(map(lambda landmark: landmark[0], landmarks))
     y = list(map(lambda landmark: landmark[1], landmarks))
 
@@ -0,0 +1,280 @@
+import cv2
+import numpy as np
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from hcs.models import Hand, GestureClassificationResult
+
+import hcs.utils.draw_utils as du
+
+# HAND_CONNECTIONS as five paths, drawn with a single polylines call
+HAND_PATHS = [[4, 3, 2, 1, 0, 5, 6, 7, 8], [5, 9, 10, 11, 12], [9, 13, 14, 15, 16], [13, 17, 18, 19, 20], [17, 0]]
+
+# Text, origin, font, scale, color and thickness, the arguments of cv2.putText
+Text = Tuple[str, Tuple[int, int], int, float, Tuple[int, int, int], int]
+
+
+def opaque_color(color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """
+    Args:
+        color (Tuple[int, int, int]): BGR color.
+
+    Returns:
+        Tuple[int, int, int]: Visually the same color without zero channels, zero marks transparent sprite pixels.
+    """
+
+    return max(color[0], 1), max(color[1], 1), max(color[2], 1)
+
+
+class SpriteCache:
+    """
+    Least recently used cache of pre-rasterized sprites, e.g. text, keyed by content and style.
+
+    Attributes:
+        max_sprites (int): Maximum number of cached sprites.
+        hits (int): Number of sprites served from the cache.
+        misses (int): Number of rasterized sprites.
+        _sprites (OrderedDict): Sprites with their offset from the anchor point by key, least recently used first.
+    """
+
+    def __init__(self, max_sprites: int = 512):
+        """
+        Constructor.
+
+        Args:
+            max_sprites (int): Defaults to 512. Maximum number of cached sprites.
+        """
+
+        self.max_sprites: int = max_sprites
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._sprites: "OrderedDict[Hashable, Tuple[np.ndarray, int, int]]" = OrderedDict()
+
+    def get(self, key: Hashable,
+            rasterize: Callable[[], Tuple[np.ndarray, int, int]]) -> Tuple[np.ndarray, int, int]:
+        """
+        Args:
+            key (Hashable): Content and style of the sprite.
+            rasterize (Callable[[], Tuple[numpy.ndarray, int, int]]): Called on a miss, returns the sprite and the
+                offset of its top left corner from the anchor point.
+
+        Returns:
+            Tuple[numpy.ndarray, int, int]: Sprite, x and y offset of its top left corner from the anchor point.
+        """
+
+        sprite = self._sprites.get(key)
+
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = self._sprites[key] = rasterize()
+
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+
+        return sprite
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+
+def rasterize_texts(texts: Sequence[Text]) -> Tuple[np.ndarray, int, int]:
+    """
+    Rasterize texts into one sprite the way cv2.putText draws them with LINE_AA, keeping pixels of at least half
+    coverage.
+
+    Args:
+        texts (Sequence[Text]): Texts with their origin relative to the anchor point, font, scale, BGR color and
+            thickness, the arguments of cv2.putText.
+
+    Returns:
+        Tuple[numpy.ndarray, int, int]: Sprite, zero where transparent, and the offset of its top left corner from
+            the anchor point.
+    """
+
+    boxes = []
+    for text, (x, y), font, scale, color, thickness in texts:
+        (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+        pad = thickness + 1
+        boxes.append((x - pad, y - height - pad, x + width + pad, y + baseline + pad))
+
+    x0, y0 = min(box[0] for box in boxes), min(box[1] for box in boxes)
+    x1, y1 = max(box[2] for box in boxes), max(box[3] for box in boxes)
+
+    sprite = np.zeros((y1 - y0, x1 - x0, 3), np.uint8)
+    coverage = np.zeros(sprite.shape[:2], np.uint8)
+
+    for text, (x, y), font, scale, color, thickness in texts:
+        coverage.fill(0)
+        cv2.putText(coverage, text, (x - x0, y - y0), font, scale, 255, thickness, cv2.LINE_AA)
+        sprite[coverage >= 128] = opaque_color(color)
+
+    return sprite, x0, y0
+
+
+class OverlayRenderer:
+    """
+    Draws the preview overlay of draw_utils onto frames with fewer and cheaper calls.
+
+    Text blocks, e.g. the information of a hand, are pasted from pre-rasterized sprites cached by content and
+    style, with one masked copy of the sprite region instead of a cv2.putText call per text. The landmarks are drawn
+    with two polylines calls instead of 42 line and circle calls. Lines and rectangles are drawn directly, one call
+    costs less than composing a layer of them.
+
+    Sprite colors never have a zero channel (see opaque_color), so a sprite is its own per-channel copy mask. Texts
+    keep the pixels of at least half coverage of anti-aliased text, they are not blended.
+
+    Attributes:
+        sprites (SpriteCache): Cache of pre-rasterized text blocks.
+    """
+
+    def __init__(self, max_sprites: int = 512):
+        """
+        Constructor.
+
+        Args:
+            max_sprites (int): Defaults to 512. Maximum number of cached sprites.
+        """
+
+        self.sprites: SpriteCache = SpriteCache(max_sprites)
+
+    def draw_hand(self, img: Any, hand: Hand) -> Any:
+        """
+        Draw the landmarks, the border box and the information of a hand, like draw_utils.draw_hand_landmarks,
+        draw_utils.draw_border_box and draw_utils.draw_hand_info.
+
+        Args:
+            img (Any): Image to draw the hand.
+            hand (Hand): Hand.
+
+        Returns:
+            Any: An image with the hand.
+        """
+
+        self.draw_hand_landmarks(img, hand.landmarks)
+        du.draw_border_box(img, hand.border_box)
+
+        x, y, w, h = hand.border_box
+
+        return self.draw_texts(img, (
+            ("TYPE", (10, -10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2),
+            (hand.type.name, (70, -10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 130, 0), 2),
+            ("PROB", (10, -40), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2),
+            (str(round(hand.score, 2)), (70, -40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 130, 0), 2),
+        ), (x, y + h))
+
+    @staticmethod
+    def draw_hand_landmarks(img: Any, landmarks: Any) -> Any:
+        """
+        Draw hand landmarks and connections between them, like draw_utils.draw_hand_landmarks.
+
+        Args:
+            img (Any): Image to draw the hand landmarks.
+            landmarks (Any): Hand landmarks in pixel format.
+
+        Returns:
+            Any: An image with hand landmarks.
+        """
+
+        points = np.asarray(landmarks)[:, :2].astype(np.int32)
+
+        cv2.polylines(img, [points[path] for path in HAND_PATHS], False, (224, 224, 224), 2)
+
+        # A zero length line is a dot, all of them in one call
+        cv2.polylines(img, list(np.repeat(points[:, None], 2, axis=1)), False, (0, 0, 255), 5)
+
+        return img
+
+    def draw_gesture_info(self, img: Any, gesture_clf: Optional[GestureClassificationResult],
+                          border_box: Tuple[int, int, int, int]) -> Any:
+        """
+        List the classified gesture type and probability in the upper left corner of the hand border box.
+
+        Args:
+            img (Any): Image to list gesture information.
+            gesture_clf (Optional[GestureClassificationResult]): Result of gesture classification.
+            border_box (Tuple[int, int, int, int]): Dimensions and position of the border box.
+
+        Returns:
+            Any: An image with listed gesture information.
+        """
+
+        x, y, w, h = border_box
+
+        if gesture_clf:
+            return self.draw_texts(img, (
+                ("TYPE", (10, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2),
+                (gesture_clf.gesture_type.name, (70, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 130, 0), 2),
+                ("PROB", (10, 52), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2),
+                (str(round(gesture_clf.score, 2)), (70, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 130, 0), 2),
+            ), (x, y))
+
+        return self.draw_texts(img, (
+            ("GESTURE UNCLASSIFIED", (10, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (240, 130, 0), 2),
+        ), (x, y))
+
+    def draw_metrics(self, img: Any, snapshot: Dict, position: Tuple[int, int] = (20, 30)) -> Any:
+        """
+        List the processing metrics in the upper left corner of the frame: frame rate and p50/p95 time of every
+        stage.
+
+        Args:
+            img (Any): Image to list metrics.
+            snapshot (Dict): Metrics snapshot, see `hcs.metrics.Metrics.snapshot`.
+            position (Tuple[int, int]): Defaults to (20, 30). Position of the first line.
+
+        Returns:
+            Any: An image with listed metrics.
+        """
+
+        stages = snapshot["stages"]
+
+        frame_interval = stages.get("frame_interval")
+        fps = 1000 / frame_interval["p50_ms"] if frame_interval and frame_interval["p50_ms"] > 0 else 0.0
+        texts = [(f"fps: {fps:.0f}", (0, 0), cv2.FONT_HERSHEY_PLAIN, 1.5, (255, 0, 0), 2)]
+
+        for stage, summary in stages.items():
+            if stage == "frame_interval":
+                continue
+
+            texts.append((f"{stage}: {summary['p50_ms']:.1f} / {summary['p95_ms']:.1f} ms", (0, 20 * len(texts)),
+                          cv2.FONT_HERSHEY_PLAIN, 1, (255, 0, 0), 1))
+
+        # The panel changes twice per second at most, it is one sprite
+        return self.draw_texts(img, tuple(texts), position)
+
+    def draw_texts(self, img: Any, texts: Sequence[Text], anchor: Tuple[int, int]) -> Any:
+        """
+        Draw texts from the sprite cache, one sprite for all of them.
+
+        Args:
+            img (Any): Image to draw the texts.
+            texts (Sequence[Text]): Texts with their origin relative to the anchor point, font, scale, BGR color and
+                thickness, the arguments of cv2.putText.
+            anchor (Tuple[int, int]): Anchor point.
+
+        Returns:
+            Any: An image with the texts.
+        """
+
+        texts = tuple(texts)
+        image, offset_x, offset_y = self.sprites.get(texts, lambda: rasterize_texts(texts))
+
+        x0, y0 = anchor[0] + offset_x, anchor[1] + offset_y
+        height, width = img.shape[:2]
+
+        # Clipped to the image
+        left, top = max(0, -x0), max(0, -y0)
+        right, bottom = min(image.shape[1], width - x0), min(image.shape[0], height - y0)
+        if left >= right or top >= bottom:
+            return img
+
+        image = image[top:bottom, left:right]
+        cv2.copyTo(image, image, img[y0 + top:y0 + bottom, x0 + left:x0 + right])
+
+        return img
@@ -1,11 +1,90 @@
+import argparse
+
 from hcs import HandsControlSystem
+from hcs.camera_video_capture.capture_profile import AUTOTUNE, CAPTURE_PROFILES
+from hcs.metrics import Metrics
+from hcs.mouse_controller.pointer_filter import POINTER_FILTERS
 
 
 def main():
-    hcs = HandsControlSystem()
+    parser = argparse.ArgumentParser(description="Hands Control System")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run every processing stage on its own thread")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="run the landmark detection in this many processes reading frames from shared memory")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without drawing and preview window, stop with SIGINT/SIGTERM")
+    parser.add_argument("--preview-fps", type=float, default=0.0,
+                        help="refresh rate of the optional preview window in headless mode")
+    parser.add_argument("--capture-profile", choices=sorted(CAPTURE_PROFILES) + [AUTOTUNE], default=None,
+                        help="camera pixel format, frame rate and buffering, auto probes the camera once and caches "
+                             "the best mode")
+    parser.add_argument("--pointer-filter", choices=sorted(POINTER_FILTERS), default="exponential",
+                        help="pointer filter, kalman predicts the pointer forward by the pipeline latency")
+    parser.add_argument("--pointer-rate", type=float, default=120.0,
+                        help="pointer moves per second, independent of the camera frame rate, 0 moves once per frame")
+    parser.add_argument("--publish", default=None,
+                        help="publish hands and gestures to subscribers, UDP host:port or Unix domain socket path")
+    parser.add_argument("--record-session", default=None,
+                        help="record hands and gestures to memory-mapped files, e.g. session.hcsr")
+    parser.add_argument("--record-max-mb", type=float, default=1024.0,
+                        help="size after which the session recording continues in a new file")
+    parser.add_argument("--no-metrics", action="store_true", help="disable stage timings and counters")
+    parser.add_argument("--metrics-file", default=None,
+                        help="periodically export metrics to this file, Prometheus text format for .prom, JSON otherwise")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="metrics export interval in seconds")
+    args = parser.parse_args()
+
+    metrics = Metrics(enabled=not args.no_metrics)
+    exporter = None
+    if args.metrics_file and metrics.enabled:
+        from hcs.metrics.metrics_exporter import MetricsExporter
+
+        exporter = MetricsExporter(metrics, args.metrics_file, args.metrics_interval)
+
+    publisher = None
+    if args.publish:
+        from hcs.event_publisher import EventPublisher, parse_address
+
+        publisher = EventPublisher(parse_address(args.publish))
+        publisher.start()
+
+    recorder = None
+    if args.record_session:
+        from hcs.session_recorder import SessionRecorder
+
+        recorder = SessionRecorder(args.record_session, max_file_size=int(args.record_max_mb * (1 << 20)))
+
+    shared_memory_slots = 0
+    if args.processes:
+        from hcs.hand_detector.process_pool import DetectionProcessPool
+
+        shared_memory_slots = DetectionProcessPool.ring_slots(args.processes)
+
+    hcs = HandsControlSystem(headless=args.headless, preview_fps=args.preview_fps, metrics=metrics,
+                             shared_memory_slots=shared_memory_slots, pointer_filter=args.pointer_filter,
+                             pointer_rate=args.pointer_rate, publisher=publisher, recorder=recorder,
+                             capture_profile=args.capture_profile)
+    hcs.install_signal_handlers()
+
+    if exporter is not None:
+        exporter.start()
 
     # run
-    hcs.run()
+    try:
+        if args.processes:
+            hcs.run_multiprocess(args.processes)
+        elif args.pipelined:
+            hcs.run_pipelined()
+        else:
+            hcs.run()
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        if publisher is not None:
+            publisher.stop()
+        if recorder is not None:
+            recorder.close()
 
 
 if __name__ == '__main__':
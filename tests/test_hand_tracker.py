@@ -0,0 +1,42 @@
+import cv2
+import numpy as np
+
+from hcs.hand_tracker import LandmarkTracker
+from hcs.models import Hand, HandType
+
+
+def make_hand(landmarks: np.ndarray) -> Hand:
+    hand = Hand()
+    hand.landmarks = landmarks
+    hand.border_box, hand.center = (0, 0, 1, 1), (0, 0)
+    hand.score = 0.9
+    hand.type = HandType.RIGHT
+
+    return hand
+
+
+def test_untracked_landmarks_keep_previous_position():
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(rng.integers(0, 255, (240, 320), dtype=np.uint8), (5, 5), 0)
+    shifted = np.roll(texture, (2, 3), axis=(0, 1))
+
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, 0] = np.linspace(100, 220, 21)
+    landmarks[:, 1] = np.linspace(80, 160, 21)
+    landmarks[:, 2] = np.arange(21)
+
+    # Far outside the frame the optical flow fails
+    lost = [5, 12, 20]
+    landmarks[lost, :2] = -1000.0
+
+    tracker = LandmarkTracker()
+    tracker.reset(texture, [make_hand(landmarks)])
+    hands, confidence = tracker.track(shifted)
+
+    tracked = [index for index in range(21) if index not in lost]
+
+    assert confidence == len(tracked) / 21
+    np.testing.assert_array_equal(hands[0].landmarks[lost], landmarks[lost])
+    np.testing.assert_allclose(hands[0].landmarks[tracked, :2], landmarks[tracked, :2] + [3, 2], atol=0.5)
+    np.testing.assert_array_equal(hands[0].landmarks[:, 2], landmarks[:, 2])
+    assert abs(tracker.motion_speed - np.hypot(3, 2)) < 0.5
@@ -0,0 +1,22 @@
+import time
+
+from hcs.mouse_controller.pointer_filter import create_pointer_filter
+from hcs.mouse_controller.pointer_interpolator import PointerInterpolator
+
+
+def test_close_while_the_pointer_settles():
+    interpolator = PointerInterpolator(lambda x, y: None, create_pointer_filter("exponential"), rate=120)
+    interpolator.post(10, 10, time.perf_counter())
+    time.sleep(0.05)
+
+    # The glide ends on the next tick, close lands while the thread sleeps until it
+    interpolator.post(500, 500, time.perf_counter())
+    interpolator._interval = 1e-6
+    time.sleep(0.003)
+
+    # close() with a bounded join, a regression would block forever
+    interpolator._stop_event.set()
+    interpolator._posted.set()
+    interpolator._thread.join(1.0)
+
+    assert not interpolator._thread.is_alive()